@@ -1,35 +1,67 @@
 import os
-from flask import Flask, jsonify
+import click
+from flask import jsonify
 from dotenv import load_dotenv
 
+from .common.lazy import LazyFlask
 from .config import get_config
-from .extensions import db, migrate, jwt, cors
-from .modules import register_blueprints, load_models
+from .extensions import db, jwt, cors, compress, response_cache, password_hasher, dem, metrics, replicas, admission
+from .modules import register_blueprints, register_commands, load_models
+from .modules.users.cache import user_cache
+from .modules.events.tracking import live_tracker
 
 
-def create_app():
+def create_app(overrides: dict | None = None):
     load_dotenv()
-    app = Flask(__name__)
+    app = LazyFlask(__name__)
 
     app.config.from_object(get_config())
+    # testes: TESTING, banco proprio etc., antes das extensoes lerem a config
+    app.config.update(overrides or {})
 
     db.init_app(app)
-    migrate.init_app(app, db)
+    replicas.init_app(app)
+    if click.get_current_context(silent=True) is not None:
+        # so a CLI (`flask db ...`) precisa do Flask-Migrate, que importa o alembic inteiro
+        from flask_migrate import Migrate
+
+        Migrate(app, db)
     jwt.init_app(app)
     cors.init_app(app, resources={r"/*": {"origins": app.config["CORS_ORIGINS"]}})
-
-    # ensure models are imported for migrations
-    load_models()
-
-    register_blueprints(app)
+    # antes do compress: o after_request das metricas roda por ultimo e ve o tamanho final
+    metrics.init_app(app)
+    # depois das metricas: o 503 do descarte tambem entra em http_requests_total
+    admission.init_app(app)
+    if admission.enabled and admission.render not in metrics.collectors:
+        metrics.collectors.append(admission.render)
+    compress.init_app(app)
+    response_cache.init_app(app)
+    password_hasher.init_app(app)
+    dem.init_app(app)
+    user_cache.init_app(app)
+    live_tracker.init_app(app)
 
     @app.route("/health")
     def health():
+        if replicas.keys:
+            return jsonify({"status": "ok", "replicas": replicas.status()})
         return jsonify({"status": "ok"})
 
+    register_commands(app)
+    if app.config["LAZY_BLUEPRINTS"]:
+        # controllers, services e models so no primeiro request/url_for
+        app.defer(_load_modules)
+    else:
+        _load_modules(app)
+
     return app
 
 
+def _load_modules(app):
+    load_models()
+    register_blueprints(app)
+
+
 def main():
     app = create_app()
     app.run(host="0.0.0.0", port=int(os.getenv("PORT", 8000)))
@@ -3,10 +3,12 @@ from ..modules.incidents.services import IncidentService
 from ..modules.routes.services import RouteService
 from ..modules.sos.services import SOSService
 from ..modules.feed.services import FeedService
-from ..modules.feed.services import FeedService
 from ..modules.events.services import EventService
 from ..modules.support_points.services import SupportPointService
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from ..modules.users.cache import author_of, user_cache
+from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
+from ..extensions import response_cache
+from ..common.querybudget import query_budget
 
 bff_bp = Blueprint("bff", __name__)
 incident_service = IncidentService()
@@ -18,6 +20,8 @@ support_point_service = SupportPointService()
 
 
 @bff_bp.get("/map/summary")
+@response_cache.cached()
+@query_budget(8)
 def map_summary():
     incidents = incident_service.list_incidents()
     routes = route_service.list_routes()
@@ -25,6 +29,7 @@ def map_summary():
     events = event_service.list_events()
     shared = route_service.repo.list_shared_recent(limit=10)
     support_points = support_point_service.list_points()
+    authors = user_cache.get_many(sh.user_id for sh in shared)
     return jsonify(
         {
             "incidents": [
@@ -60,7 +65,14 @@ def map_summary():
                 for e in events[:5]
             ],
             "shared_routes": [
-                {"id": sh.id, "route_id": sh.route_id, "note": sh.note, "user_id": sh.user_id, "created_at": sh.created_at.isoformat()}
+                {
+                    "id": sh.id,
+                    "route_id": sh.route_id,
+                    "note": sh.note,
+                    "user_id": sh.user_id,
+                    "author": author_of(authors.get(sh.user_id)),
+                    "created_at": sh.created_at.isoformat(),
+                }
                 for sh in shared
             ],
             "sos": [
@@ -76,23 +88,38 @@ def map_summary():
 
 
 @bff_bp.get("/home")
+@response_cache.cached()
+@query_budget(10)
 def home_feed():
-    feed = feed_service.list_posts()
     routes = route_service.list_routes()
     events = event_service.list_events()
     shared = route_service.repo.list_shared_recent(limit=5)
     recent_saved = []
+    user_id = None
     try:
+        verify_jwt_in_request(optional=True)
         user_id = get_jwt_identity()
         if user_id:
-            recent_saved = route_service.list_saved(user_id)
+            recent_saved = route_service.list_saved(user_id, limit=5)
     except Exception:
         recent_saved = []
+    if user_id:
+        # timeline materializada: leitura por indice em feed_timelines
+        feed, _ = feed_service.timeline(user_id, limit=5)
+    else:
+        feed = feed_service.list_posts()
+    authors = user_cache.get_many([*(p.user_id for p in feed[:5]), *(s.user_id for s in shared)])
     return jsonify(
         {
             "hero": {"title": "Pedale seguro", "subtitle": "Alertas ao vivo e rotas confiaveis"},
             "feed": [
-                {"id": p.id, "content": p.content, "created_at": p.created_at.isoformat(), "user_id": p.user_id}
+                {
+                    "id": p.id,
+                    "content": p.content,
+                    "created_at": p.created_at.isoformat(),
+                    "user_id": p.user_id,
+                    "author": author_of(authors.get(p.user_id)),
+                }
                 for p in feed[:5]
             ],
             "routes": [
@@ -100,7 +127,13 @@ def home_feed():
                 for r in routes[:5]
             ],
             "shared_routes": [
-                {"id": s.id, "route_id": s.route_id, "note": s.note, "created_at": s.created_at.isoformat()}
+                {
+                    "id": s.id,
+                    "route_id": s.route_id,
+                    "note": s.note,
+                    "author": author_of(authors.get(s.user_id)),
+                    "created_at": s.created_at.isoformat(),
+                }
                 for s in shared
             ],
             "saved_routes": [
@@ -0,0 +1,229 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from typing import Dict, List, Optional
+
+from flask import g, jsonify, request
+
+from .metrics import LATENCY_BUCKETS, Histogram
+
+CRITICAL, HIGH, NORMAL, LOW = "critical", "high", "normal", "low"
+
+
+@dataclass(frozen=True)
+class PriorityClass:
+    rank: int  # menor = atendido primeiro
+    share: float  # fracao de ADMISSION_MAX_CONCURRENT que a classe pode ocupar
+    max_wait: float  # segundos na fila antes do 503
+    retry_after: int
+
+
+# as fatias sao cumulativas: LOW para em 50% dos slots, entao sempre sobra
+# espaco para NORMAL/HIGH, e os ultimos 10% so servem CRITICAL (SOS)
+CLASSES = {
+    CRITICAL: PriorityClass(0, 1.0, 10.0, 1),
+    HIGH: PriorityClass(1, 0.9, 2.0, 2),
+    NORMAL: PriorityClass(2, 0.75, 0.5, 3),
+    LOW: PriorityClass(3, 0.5, 0.05, 5),
+}
+
+# (metodo, endpoint) -> classe; vale a primeira regra que casar (fnmatch)
+PRIORITY_RULES = (
+    ("POST", "sos.create_sos", CRITICAL),
+    ("PATCH", "sos.update_sos", CRITICAL),
+    ("POST", "incidents.create_incident", CRITICAL),
+    ("*", "users.*", HIGH),
+    ("GET", "bff.*", LOW),
+    ("GET", "feed.*", LOW),
+    ("GET", "exports.*", LOW),
+    ("GET", "stats.*", LOW),
+)
+# o long-poll de posicoes fica fora: passa ate 30 s parado esperando o tracker
+# (sem banco) e, contado como slot, poucos espectadores esgotariam a classe LOW
+EXEMPT_ENDPOINTS = frozenset(("health", "metrics", "events.latest_positions"))
+
+
+def classify(method: str, endpoint: Optional[str]) -> str:
+    for rule_method, pattern, name in PRIORITY_RULES:
+        if rule_method in ("*", method) and endpoint and fnmatchcase(endpoint, pattern):
+            return name
+    return NORMAL if method in ("GET", "HEAD") else HIGH
+
+
+@dataclass(order=True)
+class _Waiter:
+    rank: int
+    seq: int
+    name: str = field(compare=False)
+    event: threading.Event = field(compare=False, default_factory=threading.Event)
+    granted: bool = field(compare=False, default=False)
+    cancelled: bool = field(compare=False, default=False)
+
+
+class PriorityLimiter:
+    """Limite de concorrencia com fila por prioridade (um por processo)."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._queue: List[_Waiter] = []
+        self._waiting: Dict[str, int] = defaultdict(int)
+        self._seq = itertools.count()
+
+    def limit(self, name: str) -> int:
+        return max(1, int(self.capacity * CLASSES[name].share))
+
+    def acquire(self, name: str, timeout: float) -> bool:
+        rank = CLASSES[name].rank
+        with self._lock:
+            ahead = any(self._waiting[other] for other, cls in CLASSES.items() if cls.rank <= rank)
+            if not ahead and self.in_flight < self.limit(name):
+                self.in_flight += 1
+                return True
+            if timeout <= 0:
+                return False
+            waiter = _Waiter(rank, next(self._seq), name)
+            heapq.heappush(self._queue, waiter)
+            self._waiting[name] += 1
+        waiter.event.wait(timeout)
+        with self._lock:
+            if waiter.granted:
+                return True
+            waiter.cancelled = True
+            self._waiting[name] -= 1
+            return False
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+            self._grant()
+
+    def _grant(self):
+        # acorda os da frente enquanto a classe do primeiro da fila tiver slot livre
+        while self._queue:
+            waiter = self._queue[0]
+            if waiter.cancelled:
+                heapq.heappop(self._queue)
+                continue
+            if self.in_flight >= self.limit(waiter.name):
+                return
+            heapq.heappop(self._queue)
+            self._waiting[waiter.name] -= 1
+            self.in_flight += 1
+            waiter.granted = True
+            waiter.event.set()
+
+
+class AdmissionControl:
+    """Controle de admissao por prioridade na frente de todas as views.
+
+    Cada request recebe uma classe (`PRIORITY_RULES`) e so entra se a classe
+    ainda tiver slot livre dentro de `ADMISSION_MAX_CONCURRENT`; senao espera
+    na fila por prioridade ate `max_wait` da classe e, estourado o prazo,
+    recebe 503 com `Retry-After`. Requests que ja chegam com mais fila no
+    proxy (`X-Request-Start`) do que a classe tolera sao descartados na hora,
+    exceto CRITICAL. Respostas em streaming devolvem o slot antes do corpo.
+    Tempo de fila, descartes e ocupacao vao para `/metrics`.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.limiter = PriorityLimiter(15)
+        self._lock = threading.Lock()
+        self.queue_time: Dict[str, Histogram] = {}
+        self.shed: Dict[str, int] = defaultdict(int)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("ADMISSION_ENABLED", True)
+        app.config.setdefault("ADMISSION_MAX_CONCURRENT", 15)
+        self.enabled = bool(app.config["ADMISSION_ENABLED"])
+        if not self.enabled:
+            return
+        self.limiter = PriorityLimiter(int(app.config["ADMISSION_MAX_CONCURRENT"]))
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+    def _before_request(self):
+        if request.method == "OPTIONS" or request.endpoint in EXEMPT_ENDPOINTS:
+            return None
+        name = classify(request.method, request.endpoint)
+        cls = CLASSES[name]
+        upstream = _upstream_queue_seconds()
+        if name != CRITICAL and upstream > cls.max_wait:
+            # o cliente provavelmente ja desistiu: nao gaste um slot com ele
+            return self._reject(name, upstream)
+        started = time.perf_counter()
+        admitted = self.limiter.acquire(name, cls.max_wait)
+        waited = upstream + time.perf_counter() - started
+        if not admitted:
+            return self._reject(name, waited)
+        g._admission_class = name
+        self._observe(name, waited)
+        return None
+
+    def _after_request(self, response):
+        # resposta em streaming (exports): o teardown so roda no fim do corpo, e o
+        # slot ficaria preso o download inteiro; a admissao ja valeu para comecar
+        if response.is_streamed and g.pop("_admission_class", None) is not None:
+            self.limiter.release()
+        return response
+
+    def _teardown_request(self, exc):
+        if g.pop("_admission_class", None) is not None:
+            self.limiter.release()
+
+    def _reject(self, name: str, waited: float):
+        with self._lock:
+            self.shed[name] += 1
+        self._observe(name, waited)
+        response = jsonify({"error": "server overloaded, retry later"})
+        response.status_code = 503
+        response.headers["Retry-After"] = str(CLASSES[name].retry_after)
+        return response
+
+    def _observe(self, name: str, waited: float):
+        with self._lock:
+            self.queue_time.setdefault(name, Histogram(LATENCY_BUCKETS)).observe(waited)
+
+    def render(self, lines: list):
+        """Series no formato Prometheus, anexadas ao `/metrics`."""
+        with self._lock:
+            lines.append("# HELP admission_queue_seconds Tempo de fila (proxy + admissao) por classe.")
+            lines.append("# TYPE admission_queue_seconds histogram")
+            for name, hist in sorted(self.queue_time.items()):
+                cumulative = 0
+                for bound, count in zip(hist.buckets, hist.counts):
+                    cumulative += count
+                    lines.append(f'admission_queue_seconds_bucket{{class="{name}",le="{bound:g}"}} {cumulative}')
+                lines.append(f'admission_queue_seconds_bucket{{class="{name}",le="+Inf"}} {hist.count}')
+                lines.append(f'admission_queue_seconds_sum{{class="{name}"}} {hist.sum:.6f}')
+                lines.append(f'admission_queue_seconds_count{{class="{name}"}} {hist.count}')
+            lines.append("# HELP admission_shed_total Requests recusados com 503 por classe.")
+            lines.append("# TYPE admission_shed_total counter")
+            for name, count in sorted(self.shed.items()):
+                lines.append(f'admission_shed_total{{class="{name}"}} {count}')
+        lines.append("# HELP admission_in_flight Requests admitidos em andamento.")
+        lines.append("# TYPE admission_in_flight gauge")
+        lines.append(f"admission_in_flight {self.limiter.in_flight}")
+
+
+def _upstream_queue_seconds() -> float:
+    """Fila antes do Flask, pelo `X-Request-Start` do proxy (`t=<epoch>` em s, ms ou us)."""
+    raw = request.headers.get("X-Request-Start", "")
+    try:
+        started = float(raw[2:] if raw.startswith("t=") else raw)
+    except ValueError:
+        return 0.0
+    if started > 1e14:
+        started /= 1e6
+    elif started > 1e11:
+        started /= 1e3
+    return max(0.0, time.time() - started)
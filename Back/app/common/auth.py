@@ -0,0 +1,21 @@
+from functools import wraps
+
+from flask import current_app, jsonify
+from flask_jwt_extended import get_jwt_identity, jwt_required
+
+
+def admin_required(fn):
+    """JWT obrigatorio e e-mail do usuario em `ADMIN_EMAILS`."""
+
+    @wraps(fn)
+    @jwt_required()
+    def wrapper(*args, **kwargs):
+        from ..modules.users.cache import user_cache
+
+        profile = user_cache.get(get_jwt_identity())
+        admins = {e.strip().lower() for e in (current_app.config.get("ADMIN_EMAILS") or "").split(",") if e.strip()}
+        if not profile or profile["email"].lower() not in admins:
+            return jsonify({"error": "admin only"}), 403
+        return fn(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Callable, Dict, Hashable, Optional
+
+from flask import current_app, request
+
+
+@dataclass
+class CachedBody:
+    body: bytes
+    mimetype: str
+    encoded: Dict[str, bytes] = field(default_factory=dict)  # encoding -> bytes comprimidos
+
+
+class TTLCache:
+    """LRU em memoria com expiracao por entrada (thread-safe)."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return default
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value, ttl: Optional[float] = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]):
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ResponseCache:
+    """Cache LRU em memoria (por processo) de corpos de resposta JSON.
+
+    Guarda junto do corpo as versoes ja comprimidas, para que respostas quentes
+    nao sejam recomprimidas a cada request.
+    """
+
+    def __init__(self, app=None):
+        self.default_ttl = 15
+        self._entries = TTLCache(maxsize=512)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("RESPONSE_CACHE_SIZE", 512)
+        app.config.setdefault("RESPONSE_CACHE_TTL", 15)
+        self._entries.maxsize = app.config["RESPONSE_CACHE_SIZE"]
+        self.default_ttl = app.config["RESPONSE_CACHE_TTL"]
+
+    def get(self, key: str) -> Optional[CachedBody]:
+        return self._entries.get(key)
+
+    def set(self, key: str, entry: CachedBody, ttl: Optional[float] = None):
+        self._entries.set(key, entry, ttl=self.default_ttl if ttl is None else ttl)
+
+    def invalidate(self, key: str):
+        self._entries.delete(key)
+
+    def invalidate_prefix(self, prefix: str):
+        self._entries.delete_where(lambda key: key.startswith(prefix))
+
+    def clear(self):
+        self._entries.clear()
+
+    def cached(self, key: Optional[Callable[..., str]] = None, ttl: Optional[int] = None):
+        """Decorator de view: cacheia respostas 200 (anonimas) por `key` ou pelo path+query."""
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if request.headers.get("Authorization"):
+                    return view(*args, **kwargs)
+                cache_key = key(*args, **kwargs) if key else request.full_path
+                entry = self.get(cache_key)
+                status = "HIT"
+                if entry is None:
+                    status = "MISS"
+                    response = current_app.make_response(view(*args, **kwargs))
+                    if response.status_code != 200 or response.is_streamed:
+                        return response
+                    entry = CachedBody(body=response.get_data(), mimetype=response.mimetype)
+                    self.set(cache_key, entry, ttl=ttl)
+                from ..extensions import compress
+
+                response = compress.encode_cached(entry.body, entry.encoded, entry.mimetype)
+                response.headers["X-Cache"] = status
+                return response
+
+            return wrapper
+
+        return decorator
@@ -0,0 +1,110 @@
+import gzip
+import zlib
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from flask import Response, request
+
+try:  # opcional: pip install brotli
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:  # opcional: pip install zstandard
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+
+class Compress:
+    """Negociacao de Content-Encoding (br/zstd/gzip) para respostas grandes."""
+
+    def __init__(self, app=None):
+        self.min_size = 1024
+        self.gzip_level = 6
+        self.brotli_quality = 5
+        self.zstd_level = 3
+        self.mimetypes = {"application/json", "application/geo+json", "application/x-ndjson", "text/plain"}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("COMPRESS_MIN_SIZE", 1024)
+        app.config.setdefault("COMPRESS_GZIP_LEVEL", 6)
+        app.config.setdefault("COMPRESS_BROTLI_QUALITY", 5)
+        app.config.setdefault("COMPRESS_ZSTD_LEVEL", 3)
+        self.min_size = app.config["COMPRESS_MIN_SIZE"]
+        self.gzip_level = app.config["COMPRESS_GZIP_LEVEL"]
+        self.brotli_quality = app.config["COMPRESS_BROTLI_QUALITY"]
+        self.zstd_level = app.config["COMPRESS_ZSTD_LEVEL"]
+        app.after_request(self._after_request)
+
+    @property
+    def encodings(self):
+        # ordem de preferencia do servidor em caso de empate de q-value
+        available = []
+        if brotli is not None:
+            available.append("br")
+        if zstandard is not None:
+            available.append("zstd")
+        available.append("gzip")
+        return available
+
+    def negotiate(self) -> Optional[str]:
+        return request.accept_encodings.best_match(self.encodings)
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        if encoding == "zstd":
+            return zstandard.ZstdCompressor(level=self.zstd_level).compress(body)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    def stream(self, chunks: Iterable[bytes]) -> Tuple[Iterator[bytes], Optional[str]]:
+        """Comprime um corpo em streaming (gzip, chunk a chunk) se o cliente aceitar."""
+        if not request.accept_encodings.best_match(["gzip"]):
+            return iter(chunks), None
+
+        def generate():
+            compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)  # 31 = container gzip
+            for chunk in chunks:
+                data = compressor.compress(chunk)
+                if data:
+                    yield data
+            yield compressor.flush()
+
+        return generate(), "gzip"
+
+    def encode_cached(self, body: bytes, encoded: Dict[str, bytes], mimetype: str) -> Response:
+        """Monta a resposta de um corpo em cache, guardando os bytes comprimidos em `encoded`."""
+        encoding = self.negotiate() if len(body) >= self.min_size else None
+        if not encoding:
+            response = Response(body, mimetype=mimetype)
+        else:
+            data = encoded.get(encoding)
+            if data is None:
+                data = self.compress(body, encoding)
+                encoded[encoding] = data
+            response = Response(data, mimetype=mimetype)
+            response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        return response
+
+    def _after_request(self, response: Response) -> Response:
+        if (
+            response.direct_passthrough
+            or response.is_streamed
+            or not 200 <= response.status_code < 300
+            or response.status_code in (204, 206)
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in self.mimetypes
+        ):
+            return response
+        response.vary.add("Accept-Encoding")
+        if response.content_length is not None and response.content_length < self.min_size:
+            return response
+        encoding = self.negotiate()
+        if not encoding:
+            return response
+        response.set_data(self.compress(response.get_data(), encoding))
+        response.headers["Content-Encoding"] = encoding
+        return response
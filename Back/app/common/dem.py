@@ -0,0 +1,128 @@
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+_VOID = -32768  # celula sem dado no SRTM
+_SIZES = {1201 * 1201 * 2: 1201, 3601 * 3601 * 2: 3601}  # SRTM3 (90 m) e SRTM1 (30 m)
+
+
+def tile_name(lat_floor: int, lng_floor: int) -> str:
+    """Nome SRTM do tile cujo canto inferior esquerdo e (lat_floor, lng_floor), ex.: S24W047."""
+    ns = "N" if lat_floor >= 0 else "S"
+    ew = "E" if lng_floor >= 0 else "W"
+    return f"{ns}{abs(lat_floor):02d}{ew}{abs(lng_floor):03d}.hgt"
+
+
+class DemTiles:
+    """Modelo digital de elevacao em tiles SRTM `.hgt` de 1x1 grau, lidos via memmap.
+
+    Cada tile e aberto sob demanda na primeira consulta que cai nele e fica
+    mapeado (somente leitura) pelo resto do processo. Como o mapeamento e do
+    arquivo, as paginas ficam no page cache do SO e sao compartilhadas entre
+    todos os workers; nada e copiado para a memoria de cada processo.
+    """
+
+    def __init__(self, app=None):
+        self.directory: Optional[str] = None
+        self._tiles: Dict[Tuple[int, int], Optional[np.memmap]] = {}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("DEM_DIR", None)
+        self.directory = app.config["DEM_DIR"]
+        self._tiles = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory) and os.path.isdir(self.directory)
+
+    def sample(self, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+        """Elevacao (m) por interpolacao bilinear; NaN onde nao ha tile ou dado."""
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        result = np.full(lats.shape, np.nan)
+        if not self.enabled or lats.size == 0:
+            return result
+        lat_floor = np.floor(lats).astype(np.int64)
+        lng_floor = np.floor(lngs).astype(np.int64)
+        keys = lat_floor * 1000 + lng_floor  # lng_floor em [-180, 180)
+        for key in np.unique(keys):
+            mask = keys == key
+            la, lo = int(lat_floor[mask][0]), int(lng_floor[mask][0])
+            grid = self._tile(la, lo)
+            if grid is not None:
+                result[mask] = _bilinear(grid, la, lo, lats[mask], lngs[mask])
+        return result
+
+    def _tile(self, lat_floor: int, lng_floor: int) -> Optional[np.memmap]:
+        key = (lat_floor, lng_floor)
+        if key in self._tiles:
+            return self._tiles[key]
+        with self._lock:
+            if key not in self._tiles:
+                self._tiles[key] = self._open(lat_floor, lng_floor)
+            return self._tiles[key]
+
+    def _open(self, lat_floor: int, lng_floor: int) -> Optional[np.memmap]:
+        path = os.path.join(self.directory, tile_name(lat_floor, lng_floor))
+        if not os.path.exists(path):
+            return None
+        size = _SIZES.get(os.path.getsize(path))
+        if size is None:
+            raise ValueError(f"unexpected SRTM tile size: {path}")
+        # big-endian int16, linhas de norte para sul
+        return np.memmap(path, dtype=">i2", mode="r", shape=(size, size))
+
+
+def _bilinear(grid: np.ndarray, lat_floor: int, lng_floor: int, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    last = grid.shape[0] - 1
+    rows = (lat_floor + 1 - lats) * last
+    cols = (lngs - lng_floor) * last
+    r0 = np.clip(np.floor(rows).astype(np.int64), 0, last - 1)
+    c0 = np.clip(np.floor(cols).astype(np.int64), 0, last - 1)
+    fr = rows - r0
+    fc = cols - c0
+    # fancy indexing so toca as paginas do memmap que contem os pontos
+    z00 = grid[r0, c0].astype(np.float64)
+    z01 = grid[r0, c0 + 1].astype(np.float64)
+    z10 = grid[r0 + 1, c0].astype(np.float64)
+    z11 = grid[r0 + 1, c0 + 1].astype(np.float64)
+    for z in (z00, z01, z10, z11):
+        z[z == _VOID] = np.nan
+    top = z00 * (1 - fc) + z01 * fc
+    bottom = z10 * (1 - fc) + z11 * fc
+    return top * (1 - fr) + bottom * fr
+
+
+def smoothed_gain_loss(elevations: np.ndarray, window: int = 5, threshold_m: float = 0.0) -> Tuple[float, float]:
+    """Ganho/perda acumulados apos media movel; diferencas abaixo de `threshold_m` sao ignoradas."""
+    values = _fill_gaps(elevations)
+    if values is None or len(values) < 2:
+        return 0.0, 0.0
+    smooth = moving_average(values, window)
+    diffs = np.diff(smooth)
+    diffs[np.abs(diffs) < threshold_m] = 0.0
+    return float(diffs[diffs > 0].sum()), float(-diffs[diffs < 0].sum())
+
+
+def moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    if window <= 1 or len(values) < window:
+        return values.astype(np.float64)
+    # replica as bordas para nao puxar as pontas para zero
+    pad = window // 2
+    padded = np.pad(values.astype(np.float64), (pad, window - 1 - pad), mode="edge")
+    return np.convolve(padded, np.ones(window) / window, mode="valid")
+
+
+def _fill_gaps(values: np.ndarray) -> Optional[np.ndarray]:
+    valid = ~np.isnan(values)
+    if not valid.any():
+        return None
+    if valid.all():
+        return values
+    idx = np.arange(len(values))
+    return np.interp(idx, idx[valid], values[valid])
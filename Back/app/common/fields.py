@@ -0,0 +1,42 @@
+from datetime import date, datetime
+from typing import Iterable, List, Optional
+
+from ..extensions import db
+
+
+def parse_fields(model, raw: Optional[str], always: Iterable[str] = ("id",)) -> Optional[List[str]]:
+    """Valida `?fields=a,b,c` contra as colunas do model.
+
+    Retorna None quando o parametro nao foi informado (objeto completo).
+    """
+    if not raw:
+        return None
+    requested = [name.strip() for name in raw.split(",") if name.strip()]
+    if not requested:
+        return None
+    columns = set(model.__table__.columns.keys())
+    unknown = [name for name in requested if name not in columns]
+    if unknown:
+        raise ValueError(f"unknown fields: {', '.join(unknown)}")
+    fields: List[str] = []
+    for name in [*always, *requested]:
+        if name not in fields:
+            fields.append(name)
+    return fields
+
+
+def select_fields(model, fields: Optional[List[str]]):
+    """Query ORM completa ou SELECT apenas das colunas pedidas."""
+    if not fields:
+        return model.query
+    return db.session.query(*[getattr(model, name) for name in fields])
+
+
+def pick(obj, fields: List[str]) -> dict:
+    data = {}
+    for name in fields:
+        value = getattr(obj, name)
+        if isinstance(value, (datetime, date)):
+            value = value.isoformat()
+        data[name] = value
+    return data
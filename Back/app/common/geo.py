@@ -0,0 +1,162 @@
+import math
+from typing import List, Optional, Tuple
+
+EARTH_RADIUS_M = 6_371_000.0
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {c: i for i, c in enumerate(_BASE32)}
+
+# menor dimensao (m) de uma celula geohash por precisao, no equador
+_CELL_MIN_SIZE_M = [
+    (9, 4.77),
+    (8, 19.1),
+    (7, 152.9),
+    (6, 610.0),
+    (5, 4_890.0),
+    (4, 19_500.0),
+    (3, 156_000.0),
+    (2, 625_000.0),
+    (1, 5_000_000.0),
+]
+
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def geohash_encode(lat: float, lng: float, precision: int = 9) -> str:
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    chars = []
+    bits, bit_count, even = 0, 0, True
+    while len(chars) < precision:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            if lng >= mid:
+                bits = (bits << 1) | 1
+                lng_lo = mid
+            else:
+                bits <<= 1
+                lng_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                bits = (bits << 1) | 1
+                lat_lo = mid
+            else:
+                bits <<= 1
+                lat_hi = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+
+def geohash_bounds(code: str) -> Tuple[float, float, float, float]:
+    """(lat_min, lat_max, lng_min, lng_max) da celula."""
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    even = True
+    for char in code:
+        value = _DECODE[char]
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            if even:
+                mid = (lng_lo + lng_hi) / 2
+                if bit:
+                    lng_lo = mid
+                else:
+                    lng_hi = mid
+            else:
+                mid = (lat_lo + lat_hi) / 2
+                if bit:
+                    lat_lo = mid
+                else:
+                    lat_hi = mid
+            even = not even
+    return lat_lo, lat_hi, lng_lo, lng_hi
+
+
+def precision_for_radius(radius_m: float) -> int:
+    for precision, size in _CELL_MIN_SIZE_M:
+        if size >= radius_m:
+            return precision
+    return 1
+
+
+def covering_cells(lat: float, lng: float, radius_m: float) -> List[str]:
+    """Celula do ponto + 8 vizinhas, numa precisao em que a celula >= raio (cobre o circulo)."""
+    # longitude encolhe com cos(lat): compensa para a celula continuar cobrindo o raio
+    precision = precision_for_radius(radius_m / max(math.cos(math.radians(lat)), 0.1))
+    center = geohash_encode(lat, lng, precision)
+    lat_lo, lat_hi, lng_lo, lng_hi = geohash_bounds(center)
+    dlat, dlng = lat_hi - lat_lo, lng_hi - lng_lo
+    clat, clng = (lat_lo + lat_hi) / 2, (lng_lo + lng_hi) / 2
+    cells = []
+    for i in (-1, 0, 1):
+        for j in (-1, 0, 1):
+            nlat = clat + i * dlat
+            if not -90 < nlat < 90:
+                continue
+            nlng = (clng + j * dlng + 180) % 360 - 180
+            code = geohash_encode(nlat, nlng, precision)
+            if code not in cells:
+                cells.append(code)
+    return cells
+
+
+def bbox_cells(
+    min_lat: float, min_lng: float, max_lat: float, max_lng: float, max_precision: int = 7, max_cells: int = 64
+) -> List[str]:
+    """Celulas que cobrem o retangulo, na maior precisao (<= max_precision) que caiba em `max_cells`."""
+    for precision in range(max_precision, 0, -1):
+        bits = 5 * precision
+        dlat = 180.0 / (1 << (bits // 2))
+        dlng = 360.0 / (1 << ((bits + 1) // 2))
+        rows = range(math.floor((min_lat + 90) / dlat), math.floor((max_lat + 90) / dlat) + 1)
+        cols = range(math.floor((min_lng + 180) / dlng), math.floor((max_lng + 180) / dlng) + 1)
+        if len(rows) * len(cols) > max_cells and precision > 1:
+            continue
+        cells = []
+        for row in rows:
+            lat = min(-90 + (row + 0.5) * dlat, 90 - dlat / 2)
+            for col in cols:
+                code = geohash_encode(lat, (-180 + (col + 0.5) * dlng + 180) % 360 - 180, precision)
+                if code not in cells:
+                    cells.append(code)
+        return cells
+    return []
+
+
+def parse_lat_lng(lat, lng) -> Tuple[float, float]:
+    """Valida um par vindo do cliente: numeros finitos, lat em [-90, 90] e lng em [-180, 180]."""
+    try:
+        lat, lng = float(lat), float(lng)
+    except (TypeError, ValueError):
+        raise ValueError("latitude and longitude must be numbers") from None
+    # nan falha nas comparacoes, inf fica fora do intervalo
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        raise ValueError("latitude/longitude out of range")
+    return lat, lng
+
+
+def parse_bbox(raw: Optional[str]) -> Optional[Tuple[float, float, float, float]]:
+    """`?bbox=min_lng,min_lat,max_lng,max_lat` (ordem GeoJSON) -> (min_lat, min_lng, max_lat, max_lng)."""
+    if not raw:
+        return None
+    try:
+        min_lng, min_lat, max_lng, max_lat = (float(v) for v in raw.split(","))
+    except ValueError:
+        raise ValueError("bbox must be min_lng,min_lat,max_lng,max_lat") from None
+    # float() aceita "nan" e "inf": sem isso o erro so aparecia dentro do bbox_cells (500)
+    min_lat, min_lng = parse_lat_lng(min_lat, min_lng)
+    max_lat, max_lng = parse_lat_lng(max_lat, max_lng)
+    if min_lat > max_lat or min_lng > max_lng:
+        raise ValueError("bbox must be min_lng,min_lat,max_lng,max_lat")
+    return min_lat, min_lng, max_lat, max_lng
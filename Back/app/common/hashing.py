@@ -0,0 +1,185 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+try:  # opcional: pip install argon2-cffi
+    import argon2
+except ImportError:  # pragma: no cover
+    argon2 = None
+
+
+class HashingBusyError(RuntimeError):
+    """Fila de hashing cheia; o cliente deve tentar de novo depois."""
+
+
+class PasswordHasher:
+    """Hash de senha (pbkdf2/scrypt/argon2) executado num pool de threads dedicado.
+
+    hashlib e argon2-cffi liberam o GIL, entao o pool limita quantos nucleos o
+    login/registro pode ocupar sem bloquear os demais endpoints.
+    """
+
+    def __init__(self, app=None):
+        self.algorithm = "scrypt"
+        self.pbkdf2_iterations = 600_000
+        self.scrypt_n, self.scrypt_r, self.scrypt_p = 2**15, 8, 1
+        self.argon2_time_cost, self.argon2_memory_cost, self.argon2_parallelism = 3, 65536, 4
+        self.workers = 2
+        self.queue_max = 64
+        self.timeout = 10.0
+        self._argon2 = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[threading.BoundedSemaphore] = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._latencies = deque(maxlen=512)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        cfg = app.config
+        cfg.setdefault("PASSWORD_HASH_ALGORITHM", "scrypt")
+        cfg.setdefault("PASSWORD_HASH_PBKDF2_ITERATIONS", 600_000)
+        cfg.setdefault("PASSWORD_HASH_SCRYPT_N", 2**15)
+        cfg.setdefault("PASSWORD_HASH_SCRYPT_R", 8)
+        cfg.setdefault("PASSWORD_HASH_SCRYPT_P", 1)
+        cfg.setdefault("PASSWORD_HASH_ARGON2_TIME_COST", 3)
+        cfg.setdefault("PASSWORD_HASH_ARGON2_MEMORY_COST", 65536)
+        cfg.setdefault("PASSWORD_HASH_ARGON2_PARALLELISM", 4)
+        cfg.setdefault("PASSWORD_HASH_WORKERS", 2)
+        cfg.setdefault("PASSWORD_HASH_QUEUE_MAX", 64)
+        cfg.setdefault("PASSWORD_HASH_TIMEOUT", 10.0)
+
+        self.algorithm = cfg["PASSWORD_HASH_ALGORITHM"]
+        if self.algorithm not in ("pbkdf2", "scrypt", "argon2"):
+            raise ValueError(f"unsupported PASSWORD_HASH_ALGORITHM '{self.algorithm}'")
+        if self.algorithm == "argon2" and argon2 is None:
+            raise RuntimeError("PASSWORD_HASH_ALGORITHM=argon2 requires the argon2-cffi package")
+        self.pbkdf2_iterations = int(cfg["PASSWORD_HASH_PBKDF2_ITERATIONS"])
+        self.scrypt_n = int(cfg["PASSWORD_HASH_SCRYPT_N"])
+        self.scrypt_r = int(cfg["PASSWORD_HASH_SCRYPT_R"])
+        self.scrypt_p = int(cfg["PASSWORD_HASH_SCRYPT_P"])
+        self.argon2_time_cost = int(cfg["PASSWORD_HASH_ARGON2_TIME_COST"])
+        self.argon2_memory_cost = int(cfg["PASSWORD_HASH_ARGON2_MEMORY_COST"])
+        self.argon2_parallelism = int(cfg["PASSWORD_HASH_ARGON2_PARALLELISM"])
+        self.workers = int(cfg["PASSWORD_HASH_WORKERS"])
+        self.queue_max = int(cfg["PASSWORD_HASH_QUEUE_MAX"])
+        self.timeout = float(cfg["PASSWORD_HASH_TIMEOUT"])
+
+        if argon2 is not None:
+            self._argon2 = argon2.PasswordHasher(
+                time_cost=self.argon2_time_cost,
+                memory_cost=self.argon2_memory_cost,
+                parallelism=self.argon2_parallelism,
+            )
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_max)
+
+    @property
+    def method(self) -> str:
+        if self.algorithm == "pbkdf2":
+            return f"pbkdf2:sha256:{self.pbkdf2_iterations}"
+        return f"scrypt:{self.scrypt_n}:{self.scrypt_r}:{self.scrypt_p}"
+
+    def hash(self, password: str) -> str:
+        return self._submit(self._hash, password)
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        return self._submit(self._verify, password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        if password_hash.startswith("$argon2"):
+            if self.algorithm != "argon2" or self._argon2 is None:
+                return True
+            return self._argon2.check_needs_rehash(password_hash)
+        if self.algorithm == "argon2":
+            return True
+        return password_hash.split("$", 1)[0] != self.method
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            return {
+                "algorithm": self.algorithm,
+                "workers": self.workers,
+                "queue_max": self.queue_max,
+                "queue_depth": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "latency_ms": {
+                    "p50": _percentile(latencies, 0.50) * 1000,
+                    "p95": _percentile(latencies, 0.95) * 1000,
+                    "max": (latencies[-1] if latencies else 0.0) * 1000,
+                },
+            }
+
+    def _hash(self, password: str) -> str:
+        if self.algorithm == "argon2":
+            return self._argon2.hash(password)
+        return generate_password_hash(password, method=self.method)
+
+    def _verify(self, password_hash: str, password: str) -> bool:
+        if password_hash.startswith("$argon2"):
+            if self._argon2 is None:
+                raise RuntimeError("argon2 hash found but argon2-cffi is not installed")
+            try:
+                return self._argon2.verify(password_hash, password)
+            except argon2.exceptions.VerificationError:
+                return False
+            except argon2.exceptions.InvalidHashError:
+                return False
+        return check_password_hash(password_hash, password)
+
+    def _submit(self, fn, *args):
+        if self._executor is None:
+            # fora de uma app (scripts/shell): executa inline
+            return fn(*args)
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HashingBusyError("password hashing queue is full")
+        with self._lock:
+            self._queued += 1
+        try:
+            future = self._executor.submit(self._run, fn, *args)
+        except Exception:
+            with self._lock:
+                self._queued -= 1
+            self._slots.release()
+            raise
+        # o slot so volta quando o hash termina, mesmo se o request desistir antes
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise HashingBusyError("password hashing timed out") from None
+
+    def _run(self, fn, *args):
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._latencies.append(elapsed)
+
+
+def _percentile(values, q: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(q * len(values)))]
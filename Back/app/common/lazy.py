@@ -0,0 +1,72 @@
+import threading
+from importlib import import_module
+from typing import Callable, Dict, Optional, Tuple
+
+from flask import Flask
+from flask.cli import AppGroup
+
+
+def import_string(path: str, package: Optional[str] = None):
+    """`"pacote.modulo:atributo"` -> objeto (caminhos relativos a `package`)."""
+    module, _, attr = path.partition(":")
+    return getattr(import_module(module, package), attr)
+
+
+class LazyFlask(Flask):
+    """Flask que adia parte do setup (blueprints) ate o primeiro uso do `url_map`.
+
+    O primeiro request, `url_for`, `flask routes` ou o test client disparam o
+    `defer()` pendente uma vez, sob lock; comandos de CLI que nao servem HTTP
+    (`flask db upgrade`, workers) nunca importam os controllers.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._deferred: Optional[Callable[["LazyFlask"], None]] = None
+        self._deferred_lock = threading.RLock()
+        self._deferred_running = False
+        super().__init__(*args, **kwargs)
+        self.cli = LazyGroup(self.name)
+
+    def defer(self, setup: Callable[["LazyFlask"], None]):
+        self._deferred = setup
+
+    def load_deferred(self):
+        with self._deferred_lock:
+            # reentrante: o proprio setup mexe no url_map
+            if self._deferred is None or self._deferred_running:
+                return
+            self._deferred_running = True
+            try:
+                self._deferred(self)
+                self._deferred = None
+            finally:
+                self._deferred_running = False
+
+    @property
+    def url_map(self):
+        if self._deferred is not None:
+            self.load_deferred()
+        return self._url_map
+
+    @url_map.setter
+    def url_map(self, value):
+        self._url_map = value
+
+
+class LazyGroup(AppGroup):
+    """AppGroup que aceita subcomandos por caminho de import, carregados so quando usados."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands: Dict[str, Tuple[str, Optional[str]]] = {}
+
+    def add_lazy_command(self, name: str, import_path: str, package: Optional[str] = None):
+        self.lazy_commands[name] = (import_path, package)
+
+    def list_commands(self, ctx):
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            self.add_command(import_string(*self.lazy_commands[cmd_name]), cmd_name)
+        return super().get_command(ctx, cmd_name)
@@ -0,0 +1,250 @@
+import cProfile
+import contextvars
+import hmac
+import os
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from flask import Response, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# contadores de SQL do request corrente (engine events rodam na thread do request)
+_current_sql: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar("metrics_sql", default=None)
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # ultimo = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metrics:
+    """Latencia, status, tamanho de payload e SQL por rota, expostos em `/metrics` (formato Prometheus).
+
+    Os valores sao por processo: com varios workers, cada um expoe os seus (use
+    um worker por alvo no scrape ou agregue no Prometheus). O endpoint so existe
+    com `METRICS_TOKEN` definido e exige `Authorization: Bearer <token>`.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.response_size: Dict[Tuple[str, str], Histogram] = {}
+        self.sql_queries: Dict[Tuple[str, str], Histogram] = {}
+        self.sql_seconds: Dict[Tuple[str, str], float] = defaultdict(float)
+        self.status: Dict[Tuple[str, str, int], int] = defaultdict(int)
+        self.collectors: List[Callable[[list], None]] = []  # series extras (ex.: admissao)
+        self.profiler = RequestProfiler()
+        self.token: Optional[str] = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("METRICS_ENABLED", True)
+        app.config.setdefault("METRICS_TOKEN", None)
+        self.token = app.config["METRICS_TOKEN"]
+        self.profiler.init_app(app)
+        if not app.config["METRICS_ENABLED"]:
+            return
+        _listen_sql()
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        if self.token:
+            app.add_url_rule("/metrics", "metrics", self.render_view)
+
+    def _before_request(self):
+        g._metrics_started = time.perf_counter()
+        g._metrics_sql_token = _current_sql.set([0, 0.0])
+        self.profiler.start()
+
+    def _after_request(self, response: Response) -> Response:
+        started = g.pop("_metrics_started", None)
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        stats = _current_sql.get() or [0, 0.0]
+        key = (request.url_rule.rule if request.url_rule else "<unmatched>", request.method)
+        size = None if response.is_streamed else response.calculate_content_length()
+        with self._lock:
+            self.latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(elapsed)
+            self.sql_queries.setdefault(key, Histogram(QUERY_COUNT_BUCKETS)).observe(stats[0])
+            self.sql_seconds[key] += stats[1]
+            self.status[(*key, response.status_code)] += 1
+            if size is not None:
+                self.response_size.setdefault(key, Histogram(SIZE_BUCKETS)).observe(size)
+        profile_id = self.profiler.stop(key[0], elapsed)
+        if profile_id:
+            response.headers["X-Profile-Id"] = profile_id
+        return response
+
+    def _teardown_request(self, exc):
+        token = g.pop("_metrics_sql_token", None)
+        if token is not None:
+            _current_sql.reset(token)
+        self.profiler.discard()
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            _render_histograms(lines, "http_request_duration_seconds", "Latencia por rota.", self.latency)
+            _render_histograms(lines, "http_response_size_bytes", "Tamanho do corpo da resposta.", self.response_size)
+            _render_histograms(lines, "db_queries_per_request", "Statements SQL por request.", self.sql_queries)
+            lines.append("# HELP db_query_seconds_total Tempo em SQL por rota.")
+            lines.append("# TYPE db_query_seconds_total counter")
+            for (rule, method), seconds in sorted(self.sql_seconds.items()):
+                lines.append(f'db_query_seconds_total{{{_labels(rule, method)}}} {seconds:.6f}')
+            lines.append("# HELP http_requests_total Requests por rota e status.")
+            lines.append("# TYPE http_requests_total counter")
+            for (rule, method, status), count in sorted(self.status.items()):
+                lines.append(f'http_requests_total{{{_labels(rule, method)},status="{status}"}} {count}')
+        for collect in self.collectors:
+            collect(lines)
+        return "\n".join(lines) + "\n"
+
+    def render_view(self):
+        header = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(header.encode(), f"Bearer {self.token}".encode()):
+            return Response("unauthorized\n", status=401, headers={"WWW-Authenticate": "Bearer"})
+        return Response(self.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+    def reset(self):
+        with self._lock:
+            self.latency.clear()
+            self.response_size.clear()
+            self.sql_queries.clear()
+            self.sql_seconds.clear()
+            self.status.clear()
+
+
+class RequestProfiler:
+    """cProfile opt-in de um request: por amostragem (`PROFILE_SAMPLE_RATE`) ou pelo header `X-Profile`.
+
+    O .prof vai para `PROFILE_DIR` (abra com `snakeviz` ou gere um flamegraph
+    com `flameprof`). Na amostragem so fica o perfil de requests mais lentos que
+    `PROFILE_SLOW_MS`; um profiler por vez por processo.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.sample_rate = 0.0
+        self.slow_ms = 0.0
+        self.token: Optional[str] = None
+        self.directory = "profiles"
+        self._busy = threading.Lock()
+
+    def init_app(self, app):
+        app.config.setdefault("PROFILE_ENABLED", False)
+        app.config.setdefault("PROFILE_SAMPLE_RATE", 0.0)
+        app.config.setdefault("PROFILE_SLOW_MS", 500)
+        app.config.setdefault("PROFILE_TOKEN", None)
+        app.config.setdefault("PROFILE_DIR", os.path.join(app.instance_path, "profiles"))
+        self.enabled = bool(app.config["PROFILE_ENABLED"])
+        self.sample_rate = float(app.config["PROFILE_SAMPLE_RATE"])
+        self.slow_ms = float(app.config["PROFILE_SLOW_MS"])
+        self.token = app.config["PROFILE_TOKEN"]
+        self.directory = app.config["PROFILE_DIR"]
+
+    def start(self):
+        if not self.enabled:
+            return
+        # sem PROFILE_TOKEN o header e ignorado: so a amostragem liga o profiler
+        header = request.headers.get("X-Profile")
+        forced = bool(self.token) and header is not None and hmac.compare_digest(header.encode(), self.token.encode())
+        if not forced and not (self.sample_rate and random.random() < self.sample_rate):
+            return
+        if not self._busy.acquire(blocking=False):
+            return
+        profile = cProfile.Profile()
+        g._profile = (profile, forced)
+        profile.enable()
+
+    def stop(self, rule: str, elapsed: float) -> Optional[str]:
+        current = g.pop("_profile", None)
+        if current is None:
+            return None
+        profile, forced = current
+        try:
+            profile.disable()
+            if not forced and elapsed * 1000 < self.slow_ms:
+                return None
+            os.makedirs(self.directory, exist_ok=True)
+            slug = rule.strip("/").replace("/", "_").replace("<", "").replace(">", "").replace(":", "-") or "root"
+            name = f"{time.strftime('%Y%m%d-%H%M%S')}-{slug}-{int(elapsed * 1000)}ms.prof"
+            profile.dump_stats(os.path.join(self.directory, name))
+            return name
+        finally:
+            self._busy.release()
+
+    def discard(self):
+        # request abortado antes do after_request: solta o profiler
+        current = g.pop("_profile", None)
+        if current is not None:
+            current[0].disable()
+            self._busy.release()
+
+
+_listening = False
+
+
+def _listen_sql():
+    global _listening
+    if _listening:
+        return
+    _listening = True
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("_metrics_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["_metrics_started"].pop()
+    stats = _current_sql.get()
+    if stats is not None:
+        stats[0] += 1
+        stats[1] += time.perf_counter() - started
+
+
+def _handle_error(context):
+    started = context.connection.info.get("_metrics_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def _labels(rule: str, method: str) -> str:
+    rule = rule.replace("\\", "\\\\").replace('"', '\\"')
+    return f'route="{rule}",method="{method}"'
+
+
+def _render_histograms(lines: list, name: str, help_text: str, series: Dict[Tuple[str, str], Histogram]):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for (rule, method), hist in sorted(series.items()):
+        labels = _labels(rule, method)
+        cumulative = 0
+        for bound, count in zip(hist.buckets, hist.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {hist.count}')
+        lines.append(f"{name}_sum{{{labels}}} {hist.sum:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {hist.count}")
@@ -0,0 +1,146 @@
+import contextvars
+import logging
+from collections import Counter, defaultdict
+from contextlib import ContextDecorator
+from typing import List, Optional, Tuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# contadores ativos no contexto atual (podem ser aninhados)
+_active: contextvars.ContextVar[tuple] = contextvars.ContextVar("query_counters", default=())
+_listening = False
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryCounter:
+    """Conta os statements SQL executados dentro do bloco.
+
+        with QueryCounter() as counter:
+            service.list_saved(user_id)
+        assert counter.count <= 2, counter.report()
+    """
+
+    def __init__(self):
+        self.statements: List[Tuple[str, str]] = []
+        self._token = None
+
+    def __enter__(self) -> "QueryCounter":
+        _listen()
+        self.statements = []
+        self._token = _active.set(_active.get() + (self,))
+        return self
+
+    def __exit__(self, *exc):
+        _active.reset(self._token)
+        return False
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, threshold: int = 3) -> List[Tuple[str, int]]:
+        """Statements identicos executados `threshold`+ vezes com parametros diferentes (suspeita de N+1)."""
+        params = defaultdict(set)
+        for statement, parameters in self.statements:
+            params[statement].add(parameters)
+        counts = Counter(statement for statement, _ in self.statements)
+        return [
+            (statement, n)
+            for statement, n in counts.most_common()
+            if n >= threshold and len(params[statement]) > 1
+        ]
+
+    def report(self, threshold: int = 3) -> str:
+        lines = [f"{self.count} statements"]
+        for statement, n in self.repeated(threshold):
+            lines.append(f"  {n}x {_one_line(statement)}")
+        return "\n".join(lines)
+
+
+class query_budget(ContextDecorator):
+    """Orcamento de queries para um bloco ou view (decorator ou context manager).
+
+        @bp.get("/routes/saved")
+        @query_budget(2)
+        def list_saved(): ...
+
+    Estourar o orcamento, ou repetir o mesmo statement `repeated_threshold`+
+    vezes com parametros diferentes, gera `QueryBudgetExceeded` quando
+    `QUERY_BUDGET_MODE=raise` (padrao com TESTING) ou um warning no log com
+    `log`; `off` desliga a verificacao.
+    """
+
+    def __init__(self, max_queries: int, name: Optional[str] = None, repeated_threshold: Optional[int] = 3):
+        self.max_queries = max_queries
+        self.name = name
+        self.repeated_threshold = repeated_threshold
+        self.counter: Optional[QueryCounter] = None
+
+    def __call__(self, func):
+        if self.name is None:
+            self.name = func.__qualname__
+        return super().__call__(func)
+
+    def _recreate_cm(self):
+        # uma instancia por chamada: o decorator e compartilhado entre threads
+        return query_budget(self.max_queries, self.name, self.repeated_threshold)
+
+    def __enter__(self) -> QueryCounter:
+        self.counter = QueryCounter().__enter__()
+        return self.counter
+
+    def __exit__(self, exc_type, exc, tb):
+        self.counter.__exit__(exc_type, exc, tb)
+        if exc_type is not None:
+            return False
+        mode = _mode()
+        if mode == "off":
+            return False
+        problems = []
+        if self.counter.count > self.max_queries:
+            problems.append(f"{self.counter.count} queries > budget {self.max_queries}")
+        if self.repeated_threshold:
+            for statement, n in self.counter.repeated(self.repeated_threshold):
+                problems.append(f"possible N+1: {n}x {_one_line(statement)}")
+        if not problems:
+            return False
+        message = f"{self.name or 'block'}: " + "; ".join(problems)
+        if mode == "raise":
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+        return False
+
+
+def _mode() -> str:
+    if not has_app_context():
+        return "raise"
+    config = current_app.config
+    return config.get("QUERY_BUDGET_MODE") or ("raise" if config.get("TESTING") else "log")
+
+
+def _one_line(statement: str, limit: int = 160) -> str:
+    text = " ".join(statement.split())
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def _listen():
+    global _listening
+    if _listening:
+        return
+    _listening = True
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    counters = _active.get()
+    if counters:
+        params = repr(parameters)
+        for counter in counters:
+            counter.statements.append((statement, params))
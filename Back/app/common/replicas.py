@@ -0,0 +1,219 @@
+import contextvars
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from functools import wraps
+from typing import Dict, List, Optional
+
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
+
+from .cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+PIN_COOKIE = "db_pin"
+
+# "replica" quando a leitura pode ir para uma replica (GET ou @replica_read)
+_reads: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("db_reads", default=None)
+
+_PG_LAG_SQL = (
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+def replica_read(fn):
+    """Marca um metodo somente-leitura: pode ler de uma replica mesmo fora de um GET.
+
+    Continua no primario se a sessao ja escreveu, se o usuario esta fixado no
+    primario (read-your-writes) ou se nenhuma replica esta dentro do lag aceito.
+    """
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        token = _reads.set("replica")
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _reads.reset(token)
+
+    return wrapper
+
+
+@dataclass
+class _ReplicaState:
+    checked_at: float
+    healthy: bool
+    lag: Optional[float] = None
+
+
+class ReplicaRouter:
+    """Leituras em replicas (`DATABASE_REPLICA_URLS`) com fallback para o primario.
+
+    GET/HEAD (com `DB_REPLICA_GETS`) e funcoes `@replica_read` leem de uma
+    replica escolhida uma vez por request. Flush, DML e SQL textual sempre vao
+    para o primario e, depois da primeira escrita, a sessao fica no primario.
+    Cada replica e sondada a cada `DB_REPLICA_CHECK_SECONDS`; fora do ar ou com
+    lag acima de `DB_REPLICA_MAX_LAG_SECONDS` ela sai do rodizio. Depois de uma
+    escrita bem-sucedida o cliente fica `DB_REPLICA_PIN_SECONDS` lendo do
+    primario (cookie `db_pin` e, por processo, pelo usuario do JWT).
+    """
+
+    def __init__(self, app=None):
+        self.keys: List[str] = []
+        self.max_lag = 5.0
+        self.check_seconds = 5.0
+        self.pin_seconds = 10.0
+        self.lag_sql: Optional[str] = None
+        self._state: Dict[str, _ReplicaState] = {}
+        self._probe_lock = threading.Lock()
+        self._next = itertools.count()
+        self._pins = TTLCache(maxsize=10000, ttl=self.pin_seconds)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("DB_REPLICA_GETS", True)
+        app.config.setdefault("DB_REPLICA_MAX_LAG_SECONDS", 5.0)
+        app.config.setdefault("DB_REPLICA_CHECK_SECONDS", 5.0)
+        app.config.setdefault("DB_REPLICA_PIN_SECONDS", 10.0)
+        app.config.setdefault("DB_REPLICA_LAG_SQL", None)
+        self.keys = sorted(key for key in app.config.get("SQLALCHEMY_BINDS") or {} if key.startswith("replica_"))
+        if not self.keys:
+            return
+        self.max_lag = float(app.config["DB_REPLICA_MAX_LAG_SECONDS"])
+        self.check_seconds = float(app.config["DB_REPLICA_CHECK_SECONDS"])
+        self.pin_seconds = float(app.config["DB_REPLICA_PIN_SECONDS"])
+        self.lag_sql = app.config["DB_REPLICA_LAG_SQL"]
+        self._pins = TTLCache(maxsize=10000, ttl=self.pin_seconds)
+        app.extensions["replicas"] = self
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+    # -- request -------------------------------------------------------------
+
+    def _before_request(self):
+        if request.method in SAFE_METHODS and current_app.config["DB_REPLICA_GETS"]:
+            g._db_reads_token = _reads.set("replica")
+
+    def _after_request(self, response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            until = time.time() + self.pin_seconds
+            response.set_cookie(
+                PIN_COOKIE, str(int(until) + 1), max_age=int(self.pin_seconds) + 1, httponly=True, samesite="Lax"
+            )
+            user = _jwt_user()
+            if user is not None:
+                self._pins.set(user, True)
+        route = g.get("_db_replica")
+        response.headers["X-DB-Route"] = route or "primary"
+        return response
+
+    def _teardown_request(self, exc):
+        token = g.pop("_db_reads_token", None)
+        if token is not None:
+            _reads.reset(token)
+
+    def _pinned(self) -> bool:
+        if not has_request_context():
+            return False
+        if "_db_pinned" not in g:
+            now = time.time()
+            cookie = request.cookies.get(PIN_COOKIE, "")
+            user = _jwt_user()
+            g._db_pinned = (cookie.isdigit() and int(cookie) > now) or (user is not None and self._pins.get(user, False))
+        return g._db_pinned
+
+    # -- roteamento ----------------------------------------------------------
+
+    def engine_for(self, session: Session, clause):
+        if session._flushing or _is_write(clause):
+            session.info["db_wrote"] = True
+            return None
+        if _reads.get() != "replica" or session.info.get("db_wrote") or self._pinned():
+            return None
+        key = self._choose()
+        return session._db.engines[key] if key is not None else None
+
+    def _choose(self) -> Optional[str]:
+        if has_request_context() and "_db_replica" in g:
+            # uma replica por request: leituras consistentes entre si
+            key = g._db_replica
+            return key if key and self._healthy(key) else None
+        healthy = [key for key in self.keys if self._healthy(key)]
+        key = healthy[next(self._next) % len(healthy)] if healthy else None
+        if has_request_context():
+            g._db_replica = key
+        return key
+
+    def _healthy(self, key: str) -> bool:
+        state = self._state.get(key)
+        if state is not None and time.monotonic() - state.checked_at < self.check_seconds:
+            return state.healthy
+        if not self._probe_lock.acquire(blocking=False):
+            # outra thread esta sondando: usa o ultimo estado conhecido
+            return state.healthy if state is not None else False
+        try:
+            self._state[key] = state = self._probe(key)
+        finally:
+            self._probe_lock.release()
+        return state.healthy
+
+    def _probe(self, key: str) -> _ReplicaState:
+        engine = current_app.extensions["sqlalchemy"].engines[key]
+        try:
+            with engine.connect() as conn:
+                sql = self.lag_sql or (_PG_LAG_SQL if conn.dialect.name == "postgresql" else "SELECT 0")
+                lag = float(conn.execute(text(sql)).scalar() or 0)
+        except Exception as err:  # noqa: BLE001 - replica fora do ar vira fallback, nao erro
+            logger.warning("replica %s unavailable: %s", key, err)
+            return _ReplicaState(time.monotonic(), False)
+        if lag > self.max_lag:
+            logger.warning("replica %s lagging %.1fs (max %.1fs)", key, lag, self.max_lag)
+        return _ReplicaState(time.monotonic(), lag <= self.max_lag, lag)
+
+    def status(self) -> List[dict]:
+        result = []
+        for key in self.keys:
+            healthy = self._healthy(key)
+            state = self._state.get(key)
+            result.append({"replica": key, "healthy": healthy, "lag_seconds": state.lag if state else None})
+        return result
+
+
+class RoutingSession(Session):
+    """Sessao do Flask-SQLAlchemy que consulta o `ReplicaRouter` antes de escolher o engine."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            router = current_app.extensions.get("replicas")
+            if router is not None:
+                engine = router.engine_for(self, clause)
+                if engine is not None:
+                    return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _is_write(clause) -> bool:
+    if clause is None:
+        return True  # session.connection() e afins: sem como saber, primario
+    if isinstance(clause, TextClause):
+        return not clause.text.lstrip().lower().startswith(("select", "with"))
+    return bool(getattr(clause, "is_dml", False) or getattr(clause, "_for_update_arg", None) is not None)
+
+
+def _jwt_user():
+    try:
+        from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except Exception:  # noqa: BLE001 - token invalido: sem fixacao por usuario
+        return None
@@ -0,0 +1,10 @@
+from sqlalchemy.dialects import postgresql, sqlite
+
+from ..extensions import db
+
+
+def dialect_insert(table):
+    """`insert()` do dialeto atual, com suporte a ON CONFLICT (Postgres e SQLite)."""
+    if db.engine.dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
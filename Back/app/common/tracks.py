@@ -0,0 +1,139 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .geo import EARTH_RADIUS_M
+
+_BASE32 = np.array(list("0123456789bcdefghjkmnpqrstuvwxyz"))
+
+
+def coords_array(geometry) -> Optional[np.ndarray]:
+    """`Route.geometry` ([[lng, lat], ...] ou LineString GeoJSON) -> array (n, 2) de [lng, lat].
+
+    Geometria em outro formato (lista de dicts, linhas de tamanhos diferentes)
+    devolve None: a rota e salva como veio, sem os campos derivados da geometria.
+    """
+    if geometry is None:
+        return None
+    if isinstance(geometry, dict):
+        geometry = geometry.get("coordinates")
+    if not geometry:
+        return None
+    try:
+        arr = np.asarray(geometry, dtype=np.float64)
+    except (TypeError, ValueError):
+        return None
+    if arr.ndim != 2 or arr.shape[1] < 2 or len(arr) < 2:
+        return None
+    arr = arr[:, :2]
+    if not np.isfinite(arr).all():
+        return None
+    return arr
+
+
+def segment_lengths_m(lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Haversine vetorizado entre pontos consecutivos."""
+    phi = np.radians(lats)
+    lmb = np.radians(lngs)
+    dphi = np.diff(phi)
+    dlmb = np.diff(lmb)
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi[:-1]) * np.cos(phi[1:]) * np.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def resample(lats: np.ndarray, lngs: np.ndarray, spacing_m: float):
+    """Pontos a cada `spacing_m` ao longo da linha; devolve (lats, lngs, distancia_acumulada_m)."""
+    cumulative = np.concatenate(([0.0], np.cumsum(segment_lengths_m(lats, lngs))))
+    total = cumulative[-1]
+    if total == 0:
+        return lats[:1], lngs[:1], cumulative[:1]
+    steps = np.arange(0.0, total, spacing_m)
+    stations = np.append(steps, total) if steps[-1] < total else steps
+    return np.interp(stations, cumulative, lats), np.interp(stations, cumulative, lngs), stations
+
+
+def densify(lats: np.ndarray, lngs: np.ndarray, max_spacing_m: float):
+    """Mantem todos os pontos e interpola nos segmentos maiores que `max_spacing_m` (nao corta curvas)."""
+    lengths = segment_lengths_m(lats, lngs)
+    parts = np.maximum(np.ceil(lengths / max_spacing_m), 1).astype(np.int64)
+    if (parts == 1).all():
+        return lats, lngs
+    starts = np.repeat(np.arange(len(lengths)), parts)
+    # fracao de cada ponto novo dentro do seu segmento: 0, 1/k, ..., (k-1)/k
+    offsets = np.arange(len(starts)) - np.repeat(np.cumsum(parts) - parts, parts)
+    frac = offsets / np.repeat(parts, parts)
+    new_lats = lats[starts] + (lats[starts + 1] - lats[starts]) * frac
+    new_lngs = lngs[starts] + (lngs[starts + 1] - lngs[starts]) * frac
+    return np.append(new_lats, lats[-1]), np.append(new_lngs, lngs[-1])
+
+
+def distance_to_segments_m(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Distancia do ponto a cada segmento (i, i+1) da linha (projecao equiretangular local); tamanho n-1."""
+    scale = np.radians(1.0) * EARTH_RADIUS_M
+    x = (lngs - lng) * np.cos(np.radians(lat)) * scale
+    y = (lats - lat) * scale
+    x0, y0, dx, dy = x[:-1], y[:-1], np.diff(x), np.diff(y)
+    norm = dx * dx + dy * dy
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = np.where(norm > 0, np.clip(-(x0 * dx + y0 * dy) / norm, 0.0, 1.0), 0.0)
+    return np.hypot(x0 + t * dx, y0 + t * dy)
+
+
+def bbox(lats: np.ndarray, lngs: np.ndarray) -> Tuple[float, float, float, float]:
+    """(min_lat, min_lng, max_lat, max_lng)."""
+    return float(lats.min()), float(lngs.min()), float(lats.max()), float(lngs.max())
+
+
+def simplify(lats: np.ndarray, lngs: np.ndarray, tolerance_m: float) -> np.ndarray:
+    """Douglas-Peucker numa projecao equiretangular local; devolve os indices mantidos."""
+    n = len(lats)
+    if n <= 2 or tolerance_m <= 0:
+        return np.arange(n)
+    lat0 = np.radians(lats.mean())
+    x = np.radians(lngs) * np.cos(lat0) * EARTH_RADIUS_M
+    y = np.radians(lats) * EARTH_RADIUS_M
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        xs, ys = x[start + 1:end], y[start + 1:end]
+        dx, dy = x[end] - x[start], y[end] - y[start]
+        norm = np.hypot(dx, dy)
+        if norm == 0:
+            dist = np.hypot(xs - x[start], ys - y[start])
+        else:
+            dist = np.abs(dy * (xs - x[start]) - dx * (ys - y[start])) / norm
+        idx = int(np.argmax(dist))
+        if dist[idx] > tolerance_m:
+            split = start + 1 + idx
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return np.flatnonzero(keep)
+
+
+def geohash_codes(lats: np.ndarray, lngs: np.ndarray, precision: int) -> np.ndarray:
+    """Geohash vetorizado como inteiro (5 bits por caractere); mesmo resultado de `geo.geohash_encode`."""
+    bits = 5 * precision
+    lng_bits, lat_bits = (bits + 1) // 2, bits // 2
+    lat_idx = np.clip(((lats + 90.0) / 180.0 * (1 << lat_bits)).astype(np.int64), 0, (1 << lat_bits) - 1)
+    lng_idx = np.clip(((lngs + 180.0) / 360.0 * (1 << lng_bits)).astype(np.int64), 0, (1 << lng_bits) - 1)
+    codes = np.zeros(len(lats), dtype=np.int64)
+    # intercala os bits comecando pela longitude, do mais significativo para o menos
+    lng_shift, lat_shift = lng_bits, lat_bits
+    for i in range(bits):
+        if i % 2 == 0:
+            lng_shift -= 1
+            codes = (codes << 1) | ((lng_idx >> lng_shift) & 1)
+        else:
+            lat_shift -= 1
+            codes = (codes << 1) | ((lat_idx >> lat_shift) & 1)
+    return codes
+
+
+def geohash_strings(codes: np.ndarray, precision: int) -> list:
+    chars = [_BASE32[(codes >> (5 * (precision - 1 - i))) & 31] for i in range(precision)]
+    return ["".join(row) for row in np.stack(chars, axis=1)] if len(codes) else []
@@ -14,14 +14,90 @@ def _build_db_uri() -> str:
     return f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{name}"
 
 
+def _replica_binds() -> dict:
+    # DATABASE_REPLICA_URLS=url1,url2 -> binds "replica_0", "replica_1" (ver common/replicas.py)
+    urls = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+    timeout = int(os.getenv("DB_REPLICA_CONNECT_TIMEOUT", 2))
+    binds = {}
+    for i, url in enumerate(urls):
+        options = {"url": url}
+        if url.startswith("postgresql"):
+            # a sonda de lag roda na thread do request: replica que nao responde nao pode segura-lo
+            options["connect_args"] = {"connect_timeout": timeout}
+        binds[f"replica_{i}"] = options
+    return binds
+
+
 class BaseConfig:
     SQLALCHEMY_DATABASE_URI = _build_db_uri()
+    SQLALCHEMY_BINDS = _replica_binds()
+    DB_REPLICA_GETS = os.getenv("DB_REPLICA_GETS", "1") == "1"
+    DB_REPLICA_MAX_LAG_SECONDS = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", 5))
+    DB_REPLICA_CHECK_SECONDS = float(os.getenv("DB_REPLICA_CHECK_SECONDS", 5))
+    DB_REPLICA_PIN_SECONDS = float(os.getenv("DB_REPLICA_PIN_SECONDS", 10))
+    DB_REPLICA_LAG_SQL = os.getenv("DB_REPLICA_LAG_SQL")  # padrao: pg_last_xact_replay_timestamp no Postgres
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SECRET_KEY = os.getenv("SECRET_KEY", "change-me")
     JWT_SECRET_KEY = SECRET_KEY
     CORS_ORIGINS = os.getenv("CORS_ORIGINS", "*")
     ACCESS_TOKEN_EXPIRES = int(os.getenv("ACCESS_TOKEN_EXPIRES", 3600))
     REFRESH_TOKEN_EXPIRES = int(os.getenv("REFRESH_TOKEN_EXPIRES", 86400))
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", 1024))
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", 15))
+    RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", 512))
+    PASSWORD_HASH_ALGORITHM = os.getenv("PASSWORD_HASH_ALGORITHM", "scrypt")  # pbkdf2, scrypt, argon2
+    PASSWORD_HASH_PBKDF2_ITERATIONS = int(os.getenv("PASSWORD_HASH_PBKDF2_ITERATIONS", 600000))
+    PASSWORD_HASH_SCRYPT_N = int(os.getenv("PASSWORD_HASH_SCRYPT_N", 32768))
+    PASSWORD_HASH_ARGON2_TIME_COST = int(os.getenv("PASSWORD_HASH_ARGON2_TIME_COST", 3))
+    PASSWORD_HASH_ARGON2_MEMORY_COST = int(os.getenv("PASSWORD_HASH_ARGON2_MEMORY_COST", 65536))
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_QUEUE_MAX = int(os.getenv("PASSWORD_HASH_QUEUE_MAX", 64))
+    USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", 10000))
+    USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", 30))
+    USER_CACHE_REDIS_URL = os.getenv("USER_CACHE_REDIS_URL")  # opcional, cache compartilhado entre workers
+    OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", 1.0))
+    OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", 100))
+    OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", 8))
+    FEED_FANOUT_THRESHOLD = int(os.getenv("FEED_FANOUT_THRESHOLD", 5000))  # acima disso, merge na leitura
+    FEED_FOLLOW_BACKFILL = int(os.getenv("FEED_FOLLOW_BACKFILL", 50))
+    FEED_NEARBY_HALF_LIFE_HOURS = float(os.getenv("FEED_NEARBY_HALF_LIFE_HOURS", 6))
+    TRACKING_BUFFER_SIZE = int(os.getenv("TRACKING_BUFFER_SIZE", 120))  # pings em memoria por participante
+    TRACKING_PERSIST_INTERVAL = float(os.getenv("TRACKING_PERSIST_INTERVAL", 15))  # segundos entre amostras gravadas
+    TRACKING_FLUSH_INTERVAL = float(os.getenv("TRACKING_FLUSH_INTERVAL", 5))
+    TRACKING_IDLE_TTL = float(os.getenv("TRACKING_IDLE_TTL", 3600))  # evento sem ping sai da memoria
+    ROUTE_IMPORT_MAX_POINTS = int(os.getenv("ROUTE_IMPORT_MAX_POINTS", 500000))
+    ROUTE_IMPORT_SIMPLIFY_M = float(os.getenv("ROUTE_IMPORT_SIMPLIFY_M", 5))  # tolerancia do Douglas-Peucker
+    ROUTE_SIMILARITY_PRECISION = int(os.getenv("ROUTE_SIMILARITY_PRECISION", 7))  # celulas geohash dos shingles
+    ROUTE_SIMILARITY_SPACING_M = float(os.getenv("ROUTE_SIMILARITY_SPACING_M", 50))
+    ROUTE_DUPLICATE_THRESHOLD = float(os.getenv("ROUTE_DUPLICATE_THRESHOLD", 0.8))  # Jaccard estimado
+    ROUTE_SEGMENT_LENGTH_M = float(os.getenv("ROUTE_SEGMENT_LENGTH_M", 250))  # trechos do indice espacial
+    DEM_DIR = os.getenv("DEM_DIR")  # tiles SRTM .hgt; sem ele elevation_gain fica vazio
+    ELEVATION_SPACING_M = float(os.getenv("ELEVATION_SPACING_M", 30))
+    ELEVATION_SMOOTHING_WINDOW = int(os.getenv("ELEVATION_SMOOTHING_WINDOW", 5))
+    TRAFFIC_CELL_PRECISION = int(os.getenv("TRAFFIC_CELL_PRECISION", 7))  # geohash 7 ~ 150 m
+    TRAFFIC_SAMPLE_SPACING_M = float(os.getenv("TRAFFIC_SAMPLE_SPACING_M", 50))
+    TRAFFIC_FREE_FLOW_SPEED = float(os.getenv("TRAFFIC_FREE_FLOW_SPEED", 5.5))  # m/s (~20 km/h)
+    TRAFFIC_UTC_OFFSET_HOURS = int(os.getenv("TRAFFIC_UTC_OFFSET_HOURS", -3))  # buckets na hora local
+    TRAFFIC_ROLLUP_LAG_SECONDS = int(os.getenv("TRAFFIC_ROLLUP_LAG_SECONDS", 120))  # maior que a transacao mais longa
+    PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", 3))
+    PARTITION_RETENTION_MONTHS = int(os.getenv("PARTITION_RETENTION_MONTHS", 24))  # 0 = manter tudo
+    PARTITION_RETENTION_ACTION = os.getenv("PARTITION_RETENTION_ACTION", "archive")  # archive ou drop
+    COMPACT_INCIDENTS_AFTER_DAYS = int(os.getenv("COMPACT_INCIDENTS_AFTER_DAYS", 180))
+    COMPACT_SOS_AFTER_DAYS = int(os.getenv("COMPACT_SOS_AFTER_DAYS", 30))  # so alertas resolvidos
+    COMPACTION_ARCHIVE_DIR = os.getenv("COMPACTION_ARCHIVE_DIR")  # sem ele as linhas brutas sao apagadas
+    STATS_CELL_PRECISION = int(os.getenv("STATS_CELL_PRECISION", 6))  # geohash 6 ~ 1.2 x 0.6 km
+    ADMIN_EMAILS = os.getenv("ADMIN_EMAILS", "")  # separados por virgula
+    ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "1") == "1"
+    ADMISSION_MAX_CONCURRENT = int(os.getenv("ADMISSION_MAX_CONCURRENT", 15))  # <= pool do SQLAlchemy (5 + 10 overflow)
+    LAZY_BLUEPRINTS = os.getenv("LAZY_BLUEPRINTS", "1") == "1"  # 0: registra tudo no create_app
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")  # sem ele /metrics nao e exposto
+    PROFILE_ENABLED = os.getenv("PROFILE_ENABLED", "0") == "1"
+    PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", 0))  # ex.: 0.01 = 1% dos requests
+    PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", 500))
+    PROFILE_TOKEN = os.getenv("PROFILE_TOKEN")  # X-Profile precisa trazer esse valor; sem ele o header e ignorado
+    QUERY_BUDGET_MODE = os.getenv("QUERY_BUDGET_MODE")  # raise, log ou off; padrao: raise com TESTING, senao log
+    MAX_CONTENT_LENGTH = int(os.getenv("MAX_CONTENT_LENGTH", 50 * 1024 * 1024))
 
 
 class DevConfig(BaseConfig):
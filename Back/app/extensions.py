@@ -1,9 +1,21 @@
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
+from .common.admission import AdmissionControl
+from .common.cache import ResponseCache
+from .common.compression import Compress
+from .common.dem import DemTiles
+from .common.hashing import PasswordHasher
+from .common.metrics import Metrics
+from .common.replicas import ReplicaRouter, RoutingSession
 
-db = SQLAlchemy()
-migrate = Migrate()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 jwt = JWTManager()
 cors = CORS()
+compress = Compress()
+response_cache = ResponseCache()
+password_hasher = PasswordHasher()
+dem = DemTiles()
+metrics = Metrics()
+replicas = ReplicaRouter()
+admission = AdmissionControl()
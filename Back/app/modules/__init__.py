@@ -1,22 +1,36 @@
-from .users.controllers import users_bp
-from .incidents.controllers import incidents_bp
-from .routes.controllers import routes_bp
-from .sos.controllers import sos_bp
-from .feed.controllers import feed_bp
-from .events.controllers import events_bp
-from .support_points.controllers import support_points_bp
-from ..bff.controllers import bff_bp
+from ..common.lazy import import_string
+
+# (controller, url_prefix): importados so quando os blueprints sao registrados
+BLUEPRINTS = (
+    (".users.controllers:users_bp", "/api/v1/auth"),
+    (".incidents.controllers:incidents_bp", "/api/v1"),
+    (".routes.controllers:routes_bp", "/api/v1"),
+    (".sos.controllers:sos_bp", "/api/v1"),
+    (".feed.controllers:feed_bp", "/api/v1"),
+    (".events.controllers:events_bp", "/api/v1"),
+    (".support_points.controllers:support_points_bp", "/api/v1"),
+    (".leaderboard.controllers:leaderboard_bp", "/api/v1"),
+    (".exports.controllers:exports_bp", "/api/v1"),
+    (".stats.controllers:stats_bp", "/api/v1"),
+    ("..bff.controllers:bff_bp", "/bff/v1"),
+)
+
+# `flask <nome>`: o modulo do comando so e importado quando ele e usado
+COMMANDS = {
+    "outbox": ".outbox.cli:outbox_cli",
+    "feed": ".feed.cli:feed_cli",
+    "route": ".routes.cli:route_cli",  # "routes" e o comando embutido do Flask
+    "traffic": ".traffic.cli:traffic_cli",
+    "export": ".exports.cli:export_cli",
+    "support-points": ".support_points.cli:support_points_cli",
+    "partitions": ".partitions.cli:partitions_cli",
+    "stats": ".stats.cli:stats_cli",
+}
 
 
 def register_blueprints(app):
-    app.register_blueprint(users_bp, url_prefix="/api/v1/auth")
-    app.register_blueprint(incidents_bp, url_prefix="/api/v1")
-    app.register_blueprint(routes_bp, url_prefix="/api/v1")
-    app.register_blueprint(sos_bp, url_prefix="/api/v1")
-    app.register_blueprint(feed_bp, url_prefix="/api/v1")
-    app.register_blueprint(events_bp, url_prefix="/api/v1")
-    app.register_blueprint(support_points_bp, url_prefix="/api/v1")
-    app.register_blueprint(bff_bp, url_prefix="/bff/v1")
+    for path, url_prefix in BLUEPRINTS:
+        app.register_blueprint(import_string(path, __name__), url_prefix=url_prefix)
 
 
 def load_models():
@@ -28,5 +42,26 @@ def load_models():
     from .feed import models as _feed_models  # noqa: F401
     from .events import models as _events_models  # noqa: F401
     from .support_points import models as _support_points_models  # noqa: F401
+    from .outbox import models as _outbox_models  # noqa: F401
+    from .leaderboard import models as _leaderboard_models  # noqa: F401
+    from .traffic import models as _traffic_models  # noqa: F401
+    from .stats import models as _stats_models  # noqa: F401
+
+    return [
+        _users_models,
+        _incidents_models,
+        _routes_models,
+        _sos_models,
+        _feed_models,
+        _events_models,
+        _support_points_models,
+        _outbox_models,
+        _leaderboard_models,
+        _traffic_models,
+        _stats_models,
+    ]
+
 
-    return [_users_models, _incidents_models, _routes_models, _sos_models, _feed_models, _events_models, _support_points_models]
+def register_commands(app):
+    for name, path in COMMANDS.items():
+        app.cli.add_lazy_command(name, path, __name__)
@@ -1,6 +1,11 @@
+import math
+
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from ...common.fields import parse_fields, pick
+from .models import RouteEvent
 from .services import EventService
+from .tracking import live_tracker
 
 events_bp = Blueprint("events", __name__)
 service = EventService()
@@ -8,8 +13,12 @@ service = EventService()
 
 @events_bp.get("/route-events")
 def list_events():
-    events = service.list_events()
-    return jsonify([_serialize_event(e) for e in events])
+    try:
+        fields = parse_fields(RouteEvent, request.args.get("fields"))
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    events = service.list_events(fields=fields)
+    return jsonify([_serialize_event(e, fields) for e in events])
 
 
 @events_bp.post("/route-events")
@@ -37,7 +46,58 @@ def update_event_status(event_id: int):
     return jsonify(_serialize_event(event))
 
 
-def _serialize_event(event):
+@events_bp.post("/route-events/<int:event_id>/participants")
+@jwt_required()
+def join_event(event_id: int):
+    try:
+        created = service.join(event_id, get_jwt_identity())
+    except LookupError as err:
+        return jsonify({"error": str(err)}), 404
+    return jsonify({"participating": True}), 201 if created else 200
+
+
+@events_bp.delete("/route-events/<int:event_id>/participants")
+@jwt_required()
+def leave_event(event_id: int):
+    service.leave(event_id, get_jwt_identity())
+    return jsonify({"participating": False})
+
+
+@events_bp.post("/route-events/<int:event_id>/positions")
+@jwt_required()
+def ingest_positions(event_id: int):
+    payload = request.get_json(silent=True) or {}
+    try:
+        accepted = service.ingest_positions(event_id, get_jwt_identity(), payload.get("pings"))
+    except LookupError as err:
+        return jsonify({"error": str(err)}), 404
+    except PermissionError as err:
+        return jsonify({"error": str(err)}), 403
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    return jsonify({"accepted": accepted}), 202
+
+
+@events_bp.get("/route-events/<int:event_id>/positions/latest")
+def latest_positions(event_id: int):
+    # long-poll: com ?since=<version>, espera ate `wait` segundos por atualizacao
+    since = request.args.get("since", type=int)
+    wait = request.args.get("wait", 25, type=float)
+    if not math.isfinite(wait):  # nan/inf: wait_for(timeout=nan) nunca retorna
+        wait = 25
+    wait = min(max(wait, 0), 30)
+    return jsonify(service.wait_latest(event_id, since=since, timeout=wait))
+
+
+@events_bp.get("/route-events/<int:event_id>/positions/<int:user_id>/trail")
+def participant_trail(event_id: int, user_id: int):
+    limit = request.args.get("limit", 120, type=int)
+    return jsonify(live_tracker.trail(event_id, user_id, limit=limit))
+
+
+def _serialize_event(event, fields=None):
+    if fields:
+        return pick(event, fields)
     return {
         "id": event.id,
         "name": event.name,
@@ -17,3 +17,28 @@ class RouteEvent(db.Model):
     status = db.Column(db.String(50), default="scheduled")
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
+
+
+class EventParticipant(db.Model):
+    # quem pode enviar posicoes ao vivo do evento; o criador entra ao criar
+    __tablename__ = "event_participants"
+
+    event_id = db.Column(db.Integer, db.ForeignKey("route_events.id"), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True, index=True)
+    joined_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class EventPosition(db.Model):
+    # amostras down-sampled das posicoes ao vivo (ver tracking.LiveTracker)
+    __tablename__ = "event_positions"
+    __table_args__ = (db.Index("ix_event_positions_event_user_recorded", "event_id", "user_id", "recorded_at"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.Integer, db.ForeignKey("route_events.id"), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    latitude = db.Column(db.Float, nullable=False)
+    longitude = db.Column(db.Float, nullable=False)
+    speed = db.Column(db.Float, nullable=True)  # m/s, quando o app envia
+    recorded_at = db.Column(db.DateTime, nullable=False)
+    # hora da gravacao no servidor (recorded_at e o relogio do celular); usada pelo rollup de trafego
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, server_default=db.text("CURRENT_TIMESTAMP"))
@@ -1,17 +1,34 @@
-from typing import List
+from typing import List, Optional
 from ...extensions import db
-from .models import RouteEvent
+from ...common.fields import select_fields
+from ...common.sql import dialect_insert
+from .models import EventParticipant, RouteEvent
 
 
 class EventRepository:
-    def list_recent(self, limit: int = 20) -> List[RouteEvent]:
-        return RouteEvent.query.order_by(RouteEvent.start_date.desc()).limit(limit).all()
+    def list_recent(self, limit: int = 20, fields: Optional[List[str]] = None) -> List[RouteEvent]:
+        return select_fields(RouteEvent, fields).order_by(RouteEvent.start_date.desc()).limit(limit).all()
 
     def create(self, **kwargs) -> RouteEvent:
         event = RouteEvent(**kwargs)
         db.session.add(event)
+        if event.user_id is not None:
+            db.session.flush()
+            self.add_participant(event.id, event.user_id)
         db.session.commit()
         return event
 
     def get_by_id(self, event_id: int) -> RouteEvent | None:
         return RouteEvent.query.get(event_id)
+
+    def add_participant(self, event_id: int, user_id: int) -> bool:
+        stmt = dialect_insert(EventParticipant).values(event_id=event_id, user_id=user_id).on_conflict_do_nothing()
+        return db.session.execute(stmt).rowcount > 0
+
+    def remove_participant(self, event_id: int, user_id: int) -> bool:
+        return EventParticipant.query.filter_by(event_id=event_id, user_id=user_id).delete() > 0
+
+    def is_participant(self, event_id: int, user_id: int) -> bool:
+        return db.session.query(
+            EventParticipant.query.filter_by(event_id=event_id, user_id=user_id).exists()
+        ).scalar()
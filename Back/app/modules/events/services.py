@@ -1,15 +1,22 @@
 from typing import List, Optional
 from datetime import datetime
+from ...common.cache import TTLCache
+from ...extensions import db
 from .repositories import EventRepository
 from .models import RouteEvent
+from .tracking import live_tracker
+
+CLOSED_STATUSES = ("finished", "cancelled")
+_event_status = TTLCache(maxsize=1024, ttl=30)
+_participants = TTLCache(maxsize=10_000, ttl=30)  # (event_id, user_id) -> bool
 
 
 class EventService:
     def __init__(self, repo: EventRepository | None = None):
         self.repo = repo or EventRepository()
 
-    def list_events(self) -> List[RouteEvent]:
-        return self.repo.list_recent()
+    def list_events(self, fields: Optional[List[str]] = None) -> List[RouteEvent]:
+        return self.repo.list_recent(fields=fields)
 
     def create_event(self, payload: dict, user_id: Optional[int]) -> RouteEvent:
         required = ("name", "start_date", "start_lat", "start_lng", "end_lat", "end_lng")
@@ -37,11 +44,56 @@ class EventService:
         if not event:
             raise LookupError("event not found")
         event.status = status
-        from ...extensions import db
-
         db.session.commit()
+        _event_status.delete(event_id)
+        if status in CLOSED_STATUSES:
+            live_tracker.close(event_id)
         return event
 
+    def join(self, event_id: int, user_id: int) -> bool:
+        if not self.repo.get_by_id(event_id):
+            raise LookupError("event not found")
+        created = self.repo.add_participant(event_id, user_id)
+        db.session.commit()
+        _participants.delete((event_id, user_id))
+        return created
+
+    def leave(self, event_id: int, user_id: int) -> bool:
+        deleted = self.repo.remove_participant(event_id, user_id)
+        db.session.commit()
+        _participants.delete((event_id, user_id))
+        return deleted
+
+    def is_participant(self, event_id: int, user_id: int) -> bool:
+        key = (event_id, user_id)
+        member = _participants.get(key)
+        if member is None:
+            member = self.repo.is_participant(event_id, user_id)
+            _participants.set(key, member)
+        return member
+
+    def is_trackable(self, event_id: int) -> bool:
+        # status em cache para nao consultar o banco a cada lote de pings
+        status = _event_status.get(event_id)
+        if status is None:
+            event = self.repo.get_by_id(event_id)
+            status = event.status if event else "missing"
+            _event_status.set(event_id, status)
+        return status not in ("missing", *CLOSED_STATUSES)
+
+    def ingest_positions(self, event_id: int, user_id: int, pings: list) -> int:
+        if not isinstance(pings, list) or not pings:
+            raise ValueError("pings must be a non-empty list")
+        if not self.is_trackable(event_id):
+            raise LookupError("event not found or already finished")
+        if not self.is_participant(event_id, user_id):
+            raise PermissionError("only event participants can send positions")
+        return live_tracker.ingest(event_id, user_id, pings)
+
+    def wait_latest(self, event_id: int, since: Optional[int], timeout: float) -> dict:
+        # so eventos rastreaveis ganham estado no tracker
+        return live_tracker.wait_latest(event_id, since=since, timeout=timeout, create=self.is_trackable(event_id))
+
     def _parse_date(self, value: str | None) -> datetime:
         if not value:
             return datetime.utcnow()
@@ -0,0 +1,271 @@
+import atexit
+import logging
+import math
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from ...extensions import db
+
+logger = logging.getLogger(__name__)
+
+MAX_PING_AGE_S = 86400  # pings mais velhos que um dia sao recusados
+MAX_PING_SKEW_S = 60  # tolerancia para relogio adiantado no celular
+
+
+class _EventState:
+    def __init__(self, buffer_size: int):
+        self.buffer_size = buffer_size
+        self.tracks: Dict[int, deque] = {}  # user_id -> ring buffer de (ts, lat, lng, speed)
+        self.latest: Dict[int, tuple] = {}  # user_id -> ping mais recente (pings podem chegar fora de ordem)
+        self.last_persisted: Dict[int, float] = {}
+        self.version = 0
+        self.changed = threading.Condition()
+        self.last_activity = time.monotonic()
+
+
+class LiveTracker:
+    """Posicoes ao vivo dos participantes de um evento, em memoria por processo.
+
+    Cada ping vai para um ring buffer por participante; so uma amostra a cada
+    `TRACKING_PERSIST_INTERVAL` segundos e gravada no banco, em lote, por uma
+    thread de flush. Como o estado e local ao processo, o trafego de um evento
+    deve cair sempre no mesmo worker (roteamento por event_id) quando houver
+    mais de um. Eventos sem ping ha `TRACKING_IDLE_TTL` segundos saem da
+    memoria na thread de flush (evento que nunca foi encerrado nao fica la).
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.buffer_size = 120
+        self.persist_interval = 15.0
+        self.flush_interval = 5.0
+        self.max_batch = 500
+        self.idle_ttl = 3600.0
+        self._events: Dict[int, _EventState] = {}
+        self._events_lock = threading.Lock()
+        self._pending: List[dict] = []
+        self._pending_lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self.accepted = 0
+        self.rejected = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("TRACKING_BUFFER_SIZE", 120)
+        app.config.setdefault("TRACKING_PERSIST_INTERVAL", 15)
+        app.config.setdefault("TRACKING_FLUSH_INTERVAL", 5)
+        app.config.setdefault("TRACKING_MAX_BATCH", 500)
+        app.config.setdefault("TRACKING_IDLE_TTL", 3600)
+        self.app = app
+        self.buffer_size = int(app.config["TRACKING_BUFFER_SIZE"])
+        self.persist_interval = float(app.config["TRACKING_PERSIST_INTERVAL"])
+        self.flush_interval = float(app.config["TRACKING_FLUSH_INTERVAL"])
+        self.max_batch = int(app.config["TRACKING_MAX_BATCH"])
+        self.idle_ttl = float(app.config["TRACKING_IDLE_TTL"])
+
+    def ingest(self, event_id: int, user_id: int, pings: List[dict]) -> int:
+        if len(pings) > self.max_batch:
+            raise ValueError(f"at most {self.max_batch} pings per request")
+        now = time.time()
+        # valida o lote inteiro antes de mexer no estado: ts invalido vira 400
+        parsed_pings = [_parse_ping(ping, now) for ping in pings]
+        self._ensure_flusher()
+        state = self._state(event_id)
+        accepted = 0
+        to_persist = []
+        with state.changed:
+            track = state.tracks.get(user_id)
+            if track is None:
+                track = state.tracks[user_id] = deque(maxlen=state.buffer_size)
+            last_persisted = state.last_persisted.get(user_id, 0.0)
+            for parsed in parsed_pings:
+                if parsed is None:
+                    continue
+                track.append(parsed)
+                accepted += 1
+                current = state.latest.get(user_id)
+                if current is None or parsed[0] >= current[0]:
+                    state.latest[user_id] = parsed
+                # down-sampling: no maximo uma linha no banco por intervalo
+                if parsed[0] - last_persisted >= self.persist_interval:
+                    last_persisted = parsed[0]
+                    to_persist.append(parsed)
+            state.last_persisted[user_id] = last_persisted
+            state.last_activity = time.monotonic()
+            if accepted:
+                state.version += 1
+                state.changed.notify_all()
+        if to_persist:
+            rows = [
+                {
+                    "event_id": event_id,
+                    "user_id": user_id,
+                    "latitude": lat,
+                    "longitude": lng,
+                    "speed": speed,
+                    "recorded_at": datetime.utcfromtimestamp(ts),
+                }
+                for ts, lat, lng, speed in to_persist
+            ]
+            with self._pending_lock:
+                self._pending.extend(rows)
+        self.accepted += accepted
+        self.rejected += len(pings) - accepted
+        return accepted
+
+    def latest(self, event_id: int) -> dict:
+        state = self._events.get(event_id)
+        if state is None:
+            return {"version": 0, "participants": []}
+        with state.changed:
+            return {"version": state.version, "participants": self._snapshot(state)}
+
+    def wait_latest(self, event_id: int, since: Optional[int], timeout: float, create: bool = False) -> dict:
+        """Long-poll: bloqueia ate haver versao nova (ou timeout) e devolve o snapshot.
+
+        So cria o estado do evento com `create` (evento rastreavel); senao um id
+        qualquer vindo de GET anonimo nao ocupa memoria.
+        """
+        state = self._state(event_id) if create else self._events.get(event_id)
+        if state is None:
+            return {"version": 0, "participants": []}
+        with state.changed:
+            if since is not None and state.version <= since:
+                state.changed.wait_for(lambda: state.version > since, timeout=timeout)
+            return {"version": state.version, "participants": self._snapshot(state)}
+
+    def trail(self, event_id: int, user_id: int, limit: int = 120) -> List[dict]:
+        state = self._events.get(event_id)
+        if state is None:
+            return []
+        limit = max(1, limit)  # [-0:] devolveria o buffer inteiro
+        with state.changed:
+            points = list(state.tracks.get(user_id, ()))[-limit:]
+        return [
+            {"lat": lat, "lng": lng, "speed": speed, "ts": datetime.utcfromtimestamp(ts).isoformat()}
+            for ts, lat, lng, speed in sorted(points)
+        ]
+
+    def close(self, event_id: int):
+        with self._events_lock:
+            state = self._events.pop(event_id, None)
+        if state is not None:
+            self._wake(state)
+        self.flush()
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        now = time.monotonic() if now is None else now
+        with self._events_lock:
+            idle = [event_id for event_id, state in self._events.items() if now - state.last_activity >= self.idle_ttl]
+            evicted = [self._events.pop(event_id) for event_id in idle]
+        for state in evicted:
+            self._wake(state)
+        return len(evicted)
+
+    def flush(self) -> int:
+        with self._pending_lock:
+            rows, self._pending = self._pending, []
+        if not rows or self.app is None:
+            return 0
+        from .models import EventPosition
+
+        with self.app.app_context():
+            try:
+                db.session.execute(db.insert(EventPosition), rows)  # executemany
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                logger.exception("failed to persist %s tracking rows", len(rows))
+                return 0
+        return len(rows)
+
+    def stats(self) -> dict:
+        with self._pending_lock:
+            pending = len(self._pending)
+        return {
+            "events": len(self._events),
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "pending_rows": pending,
+        }
+
+    def _wake(self, state: _EventState):
+        # estado saiu da memoria: acorda os long-polls pendentes com o ultimo snapshot
+        with state.changed:
+            state.version += 1
+            state.changed.notify_all()
+
+    def _state(self, event_id: int) -> _EventState:
+        state = self._events.get(event_id)
+        if state is None:
+            with self._events_lock:
+                state = self._events.setdefault(event_id, _EventState(self.buffer_size))
+        return state
+
+    def _snapshot(self, state: _EventState) -> List[dict]:
+        result = []
+        for user_id, (ts, lat, lng, speed) in state.latest.items():
+            result.append(
+                {
+                    "user_id": user_id,
+                    "lat": lat,
+                    "lng": lng,
+                    "speed": speed,
+                    "ts": datetime.utcfromtimestamp(ts).isoformat(),
+                }
+            )
+        return result
+
+    def _ensure_flusher(self):
+        if self._flusher is not None:
+            return
+        with self._pending_lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(target=self._flush_loop, name="tracking-flush", daemon=True)
+            self._flusher.start()
+            atexit.register(self.flush)
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+            self.evict_idle()
+
+
+def _parse_ping(ping: dict, now: float):
+    if not isinstance(ping, dict):
+        return None
+    try:
+        lat = float(ping["lat"])
+        lng = float(ping["lng"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return None
+    ts = ping.get("ts")
+    try:
+        ts = float(ts) if ts is not None else now
+    except (TypeError, ValueError):
+        raise ValueError("ts must be an epoch timestamp") from None
+    if not math.isfinite(ts):
+        raise ValueError("ts must be an epoch timestamp")
+    if ts > 1e12:  # epoch em milissegundos
+        ts /= 1000.0
+    if not now - MAX_PING_AGE_S <= ts <= now + MAX_PING_SKEW_S:
+        raise ValueError("ts out of range (last 24h)")
+    speed = ping.get("speed")
+    try:
+        speed = float(speed) if speed is not None else None
+    except (TypeError, ValueError):
+        speed = None
+    if speed is not None and not math.isfinite(speed):
+        speed = None
+    return ts, lat, lng, speed
+
+
+live_tracker = LiveTracker()
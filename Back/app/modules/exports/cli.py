@@ -0,0 +1,29 @@
+import sys
+
+import click
+from flask.cli import with_appcontext
+from .services import DATASETS, FORMATS, ExportService, parse_since
+
+
+@click.command("export", help="Exporta uma tabela em NDJSON/GeoJSON (streaming).")
+@with_appcontext
+@click.argument("dataset", type=click.Choice(sorted(DATASETS)))
+@click.option("--format", "fmt", type=click.Choice(FORMATS), default="ndjson", show_default=True)
+@click.option("--since", default=None, help="Somente linhas criadas apos esta data (ISO 8601).")
+@click.option("--output", "-o", type=click.Path(dir_okay=False, writable=True), default=None, help="Padrao: stdout.")
+def export_cli(dataset: str, fmt: str, since: str, output: str):
+    try:
+        since_dt = parse_since(since)
+    except ValueError as err:
+        raise click.BadParameter(str(err), param_hint="--since")
+    out = open(output, "wb") if output else sys.stdout.buffer
+    written = 0
+    try:
+        for chunk in ExportService().stream(dataset, fmt, since_dt):
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if output:
+            out.close()
+    if output:
+        click.echo(f"wrote {written} bytes to {output}", err=True)
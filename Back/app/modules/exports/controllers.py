@@ -0,0 +1,31 @@
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from ...common.auth import admin_required
+from ...extensions import compress
+from .services import ExportService, parse_since
+
+exports_bp = Blueprint("exports", __name__)
+service = ExportService()
+
+_MIMETYPES = {"ndjson": "application/x-ndjson", "geojson": "application/geo+json"}
+
+
+@exports_bp.get("/exports/<dataset>")
+@admin_required
+def export_dataset(dataset: str):
+    fmt = request.args.get("format", "ndjson")
+    try:
+        service.validate(dataset, fmt)
+        since = parse_since(request.args.get("since"))
+    except LookupError as err:
+        return jsonify({"error": str(err)}), 404
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    body, encoding = compress.stream(service.stream(dataset, fmt, since))
+    # stream_with_context mantem a sessao/app context vivos enquanto o corpo e gerado
+    response = Response(stream_with_context(body), mimetype=_MIMETYPES[fmt])
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    ext = "geojson" if fmt == "geojson" else "ndjson"
+    response.headers["Content-Disposition"] = f'attachment; filename="{dataset}.{ext}"'
+    return response
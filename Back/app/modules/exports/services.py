@@ -0,0 +1,110 @@
+import json
+from datetime import datetime
+from typing import Iterator, Optional
+
+from ...common.replicas import replica_read
+from ...common.tracks import coords_array
+from ...extensions import db
+from ..incidents.models import Incident
+from ..routes.models import Route
+from ..sos.models import SOSAlert
+from ..support_points.models import SupportPoint
+
+# dataset -> (model, linhas por fetch do cursor)
+DATASETS = {
+    "incidents": (Incident, 5000),
+    "sos_alerts": (SOSAlert, 5000),
+    "support_points": (SupportPoint, 5000),
+    "routes": (Route, 200),  # geometria grande: lotes menores
+}
+FORMATS = ("ndjson", "geojson")
+CHUNK_SIZE = 64 * 1024
+
+
+def parse_since(raw: Optional[str]) -> Optional[datetime]:
+    if not raw:
+        return None
+    try:
+        return datetime.fromisoformat(raw.replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        raise ValueError("since must be an ISO 8601 datetime") from None
+
+
+class ExportService:
+    def validate(self, dataset: str, fmt: str):
+        if dataset not in DATASETS:
+            raise LookupError(f"unknown dataset: {dataset}")
+        if fmt not in FORMATS:
+            raise ValueError("format must be ndjson or geojson")
+
+    def rows(self, dataset: str, since: Optional[datetime] = None) -> Iterator[dict]:
+        """Linhas em ordem de id via cursor do lado do servidor (memoria constante)."""
+        model, batch = DATASETS[dataset]
+        table = model.__table__
+        stmt = db.select(table).order_by(table.c.id.asc())
+        if since is not None:
+            stmt = stmt.where(table.c.created_at > since)
+        # yield_per liga stream_results: o driver busca `batch` linhas por vez
+        result = self._execute(stmt.execution_options(yield_per=batch))
+        try:
+            for row in result.mappings():
+                yield dict(row)
+        finally:
+            result.close()
+
+    @replica_read
+    def _execute(self, stmt):
+        # tambem na CLI (`flask export`): um dump inteiro nao precisa do primario
+        return db.session.execute(stmt)
+
+    def stream(self, dataset: str, fmt: str, since: Optional[datetime] = None) -> Iterator[bytes]:
+        """Corpo do export em blocos de ~CHUNK_SIZE bytes."""
+        self.validate(dataset, fmt)
+        rows = self.rows(dataset, since)
+        if fmt == "ndjson":
+            lines = (_dumps(row) + "\n" for row in rows)
+            yield from _chunked(lines)
+            return
+        features = (_dumps(_feature(dataset, row)) for row in rows)
+        yield b'{"type":"FeatureCollection","features":['
+        yield from _chunked(_joined(features))
+        yield b"]}\n"
+
+
+def _feature(dataset: str, row: dict) -> dict:
+    if dataset == "routes":
+        coords = coords_array(row.pop("geometry"))
+        geometry = {"type": "LineString", "coordinates": coords.tolist()} if coords is not None else None
+    else:
+        geometry = {"type": "Point", "coordinates": [row.pop("longitude"), row.pop("latitude")]}
+    return {"type": "Feature", "id": row["id"], "geometry": geometry, "properties": row}
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, default=_default, separators=(",", ":"), ensure_ascii=False)
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"not serializable: {type(value).__name__}")
+
+
+def _joined(items: Iterator[str]) -> Iterator[str]:
+    first = True
+    for item in items:
+        yield item if first else "," + item
+        first = False
+
+
+def _chunked(parts: Iterator[str]) -> Iterator[bytes]:
+    buffer = []
+    size = 0
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= CHUNK_SIZE:
+            yield "".join(buffer).encode()
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode()
@@ -0,0 +1,11 @@
+import click
+from flask.cli import AppGroup
+from .services import FeedService
+
+feed_cli = AppGroup("feed", help="Manutencao das timelines do feed.")
+
+
+@feed_cli.command("trim-timelines")
+@click.option("--keep", default=1000, show_default=True, help="Entradas mantidas por timeline.")
+def trim_timelines(keep: int):
+    click.echo(f"removed {FeedService().trim_timelines(keep)} timeline entries")
@@ -1,5 +1,8 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from ...common.fields import parse_fields, pick
+from .models import FeedPost
+from ..users.cache import author_of, user_cache
 from .services import FeedService
 
 feed_bp = Blueprint("feed", __name__)
@@ -8,8 +11,15 @@ service = FeedService()
 
 @feed_bp.get("/feed")
 def list_feed():
-    posts = service.list_posts()
-    return jsonify([_serialize_post(p) for p in posts])
+    try:
+        fields = parse_fields(FeedPost, request.args.get("fields"))
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    posts = service.list_posts(fields=fields)
+    if fields:
+        return jsonify([_serialize_post(p, fields) for p in posts])
+    authors = user_cache.get_many(p.user_id for p in posts)
+    return jsonify([{**_serialize_post(p), "author": author_of(authors.get(p.user_id))} for p in posts])
 
 
 @feed_bp.post("/feed")
@@ -23,10 +33,70 @@ def create_feed():
     return jsonify(_serialize_post(post)), 201
 
 
-def _serialize_post(post):
+@feed_bp.get("/feed/timeline")
+@jwt_required()
+def timeline():
+    cursor = request.args.get("cursor", type=int)
+    limit = request.args.get("limit", 20, type=int)
+    posts, next_cursor = service.timeline(get_jwt_identity(), cursor=cursor, limit=limit)
+    authors = user_cache.get_many(p.user_id for p in posts)
+    return jsonify(
+        {
+            "items": [{**_serialize_post(p), "author": author_of(authors.get(p.user_id))} for p in posts],
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+@feed_bp.get("/feed/nearby")
+def nearby():
+    lat = request.args.get("lat", type=float)
+    lng = request.args.get("lng", type=float)
+    if lat is None or lng is None:
+        return jsonify({"error": "lat and lng are required"}), 400
+    radius = request.args.get("radius", 5000, type=float)
+    cursor = request.args.get("cursor", type=int)
+    limit = request.args.get("limit", 20, type=int)
+    hits, next_cursor = service.nearby(lat, lng, radius, cursor=cursor, limit=limit)
+    authors = user_cache.get_many(p.user_id for p, _ in hits)
+    return jsonify(
+        {
+            "items": [
+                {**_serialize_post(p), "distance_m": round(d, 1), "author": author_of(authors.get(p.user_id))}
+                for p, d in hits
+            ],
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+@feed_bp.post("/follows/<int:user_id>")
+@jwt_required()
+def follow(user_id: int):
+    if not user_cache.get(user_id):
+        return jsonify({"error": "user not found"}), 404
+    try:
+        created = service.follow(get_jwt_identity(), user_id)
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    return jsonify({"following": True}), 201 if created else 200
+
+
+@feed_bp.delete("/follows/<int:user_id>")
+@jwt_required()
+def unfollow(user_id: int):
+    service.unfollow(get_jwt_identity(), user_id)
+    return jsonify({"following": False})
+
+
+def _serialize_post(post, fields=None):
+    if fields:
+        return pick(post, fields)
     return {
         "id": post.id,
         "content": post.content,
         "created_at": post.created_at.isoformat(),
         "user_id": post.user_id,
+        "latitude": post.latitude,
+        "longitude": post.longitude,
     }
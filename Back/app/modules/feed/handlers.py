@@ -0,0 +1,13 @@
+from ..outbox.handlers import handles
+from .services import FeedService
+
+
+@handles("route.shared")
+def post_shared_route(payload: dict):
+    FeedService().create_post({"content": f"Rota compartilhada: {payload['route_name']}"}, user_id=payload.get("user_id"))
+
+
+@handles("feed.fanout")
+def fan_out_post(payload: dict):
+    # sem commit proprio: as linhas da timeline entram no commit que marca a mensagem como processada
+    FeedService().fan_out(payload["post_id"], payload["author_id"])
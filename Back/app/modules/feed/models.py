@@ -4,8 +4,31 @@ from ...extensions import db
 
 class FeedPost(db.Model):
     __tablename__ = "feed_posts"
+    __table_args__ = (
+        db.Index("ix_feed_posts_user_id_id", "user_id", "id"),
+        db.Index("ix_feed_posts_geohash", "geohash", postgresql_ops={"geohash": "varchar_pattern_ops"}),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     content = db.Column(db.Text, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
+    latitude = db.Column(db.Float, nullable=True)
+    longitude = db.Column(db.Float, nullable=True)
+    geohash = db.Column(db.String(12), nullable=True)  # precisao 9 (~5 m), consultado por prefixo
+
+
+class Follow(db.Model):
+    __tablename__ = "follows"
+
+    follower_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    followee_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class TimelineEntry(db.Model):
+    # timeline materializada: so (dono, post) — a leitura e um range scan em (user_id, post_id)
+    __tablename__ = "feed_timelines"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    post_id = db.Column(db.Integer, db.ForeignKey("feed_posts.id"), primary_key=True)
@@ -1,14 +1,120 @@
-from typing import List
+from typing import List, Optional
 from ...extensions import db
-from .models import FeedPost
+from ...common.fields import select_fields
+from ...common.sql import dialect_insert
+from ..users.models import User
+from .models import FeedPost, Follow, TimelineEntry
 
 
 class FeedRepository:
-    def list_recent(self, limit: int = 20) -> List[FeedPost]:
-        return FeedPost.query.order_by(FeedPost.created_at.desc()).limit(limit).all()
+    def list_recent(self, limit: int = 20, fields: Optional[List[str]] = None) -> List[FeedPost]:
+        return select_fields(FeedPost, fields).order_by(FeedPost.created_at.desc()).limit(limit).all()
 
-    def create(self, **kwargs) -> FeedPost:
+    def add(self, **kwargs) -> FeedPost:
         post = FeedPost(**kwargs)
         db.session.add(post)
-        db.session.commit()
+        db.session.flush()
         return post
+
+    def nearby_candidates(self, cells: List[str], before: Optional[int], limit: int) -> List[FeedPost]:
+        # prefixo de geohash usa o indice ix_feed_posts_geohash (varchar_pattern_ops no Postgres)
+        query = FeedPost.query.filter(db.or_(*[FeedPost.geohash.like(f"{cell}%") for cell in cells]))
+        if before is not None:
+            query = query.filter(FeedPost.id < before)
+        return query.order_by(FeedPost.id.desc()).limit(limit).all()
+
+    def get_many(self, post_ids: List[int]) -> List[FeedPost]:
+        if not post_ids:
+            return []
+        return FeedPost.query.filter(FeedPost.id.in_(post_ids)).all()
+
+    def follow(self, follower_id: int, followee_id: int) -> bool:
+        stmt = dialect_insert(Follow).values(follower_id=follower_id, followee_id=followee_id).on_conflict_do_nothing()
+        created = db.session.execute(stmt).rowcount > 0
+        if created:
+            db.session.execute(
+                db.update(User)
+                .where(User.id == followee_id)
+                .values(followers_count=db.func.coalesce(User.followers_count, 0) + 1)
+            )
+        return created
+
+    def unfollow(self, follower_id: int, followee_id: int) -> bool:
+        deleted = Follow.query.filter_by(follower_id=follower_id, followee_id=followee_id).delete()
+        if deleted:
+            db.session.execute(
+                db.update(User)
+                .where(User.id == followee_id)
+                .values(followers_count=db.func.coalesce(User.followers_count, 1) - 1)
+            )
+        return deleted > 0
+
+    def followers_count(self, user_id: int) -> int:
+        return db.session.query(db.func.coalesce(User.followers_count, 0)).filter(User.id == user_id).scalar() or 0
+
+    def fan_out(self, post_id: int, author_id: int) -> int:
+        # INSERT ... SELECT: uma linha por seguidor num unico statement, mais o proprio autor
+        followers = db.select(Follow.follower_id, db.literal(post_id)).where(Follow.followee_id == author_id)
+        stmt = dialect_insert(TimelineEntry).from_select(["user_id", "post_id"], followers).on_conflict_do_nothing()
+        inserted = db.session.execute(stmt).rowcount
+        self.fan_out_own(post_id, author_id)
+        return inserted
+
+    def fan_out_own(self, post_id: int, author_id: int) -> None:
+        own = dialect_insert(TimelineEntry).values(user_id=author_id, post_id=post_id).on_conflict_do_nothing()
+        db.session.execute(own)
+
+    def backfill(self, user_id: int, author_id: int, limit: int) -> None:
+        recent = (
+            db.select(db.literal(user_id), FeedPost.id)
+            .where(FeedPost.user_id == author_id)
+            .order_by(FeedPost.id.desc())
+            .limit(limit)
+        )
+        stmt = dialect_insert(TimelineEntry).from_select(["user_id", "post_id"], recent).on_conflict_do_nothing()
+        db.session.execute(stmt)
+
+    def remove_author_from_timeline(self, user_id: int, author_id: int) -> None:
+        author_posts = db.select(FeedPost.id).where(FeedPost.user_id == author_id)
+        TimelineEntry.query.filter(
+            TimelineEntry.user_id == user_id, TimelineEntry.post_id.in_(author_posts)
+        ).delete(synchronize_session=False)
+
+    def timeline_ids(self, user_id: int, before: Optional[int], limit: int) -> List[int]:
+        query = db.session.query(TimelineEntry.post_id).filter(TimelineEntry.user_id == user_id)
+        if before is not None:
+            query = query.filter(TimelineEntry.post_id < before)
+        return [row[0] for row in query.order_by(TimelineEntry.post_id.desc()).limit(limit).all()]
+
+    def followed_heavy_authors(self, user_id: int, threshold: int) -> List[int]:
+        rows = (
+            db.session.query(Follow.followee_id)
+            .join(User, User.id == Follow.followee_id)
+            .filter(Follow.follower_id == user_id, User.followers_count >= threshold)
+            .all()
+        )
+        return [row[0] for row in rows]
+
+    def post_ids_by_authors(self, author_ids: List[int], before: Optional[int], limit: int) -> List[int]:
+        if not author_ids:
+            return []
+        query = db.session.query(FeedPost.id).filter(FeedPost.user_id.in_(author_ids))
+        if before is not None:
+            query = query.filter(FeedPost.id < before)
+        return [row[0] for row in query.order_by(FeedPost.id.desc()).limit(limit).all()]
+
+    def trim_timelines(self, keep: int) -> int:
+        # remove entradas alem das `keep` mais recentes de cada timeline
+        ranked = db.select(
+            TimelineEntry.user_id,
+            TimelineEntry.post_id,
+            db.func.row_number()
+            .over(partition_by=TimelineEntry.user_id, order_by=TimelineEntry.post_id.desc())
+            .label("pos"),
+        ).subquery()
+        stale = db.select(ranked.c.user_id, ranked.c.post_id).where(ranked.c.pos > keep)
+        deleted = TimelineEntry.query.filter(
+            db.tuple_(TimelineEntry.user_id, TimelineEntry.post_id).in_(stale)
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        return deleted
@@ -1,17 +1,123 @@
+import math
+from datetime import datetime
 from typing import List, Optional
+from flask import current_app
+from ...common.geo import covering_cells, geohash_encode, haversine_m, parse_lat_lng
+from ...extensions import db
 from .repositories import FeedRepository
 from .models import FeedPost
+from ..outbox.services import OutboxService
 
 
 class FeedService:
     def __init__(self, repo: FeedRepository | None = None):
         self.repo = repo or FeedRepository()
+        self.outbox = OutboxService()
 
-    def list_posts(self) -> List[FeedPost]:
-        return self.repo.list_recent()
+    def list_posts(self, fields: Optional[List[str]] = None) -> List[FeedPost]:
+        return self.repo.list_recent(fields=fields)
 
     def create_post(self, payload: dict, user_id: Optional[int]) -> FeedPost:
         content = payload.get("content")
         if not content:
             raise ValueError("content is required")
-        return self.repo.create(content=content, user_id=user_id)
+        lat, lng = payload.get("latitude"), payload.get("longitude")
+        if (lat is None) != (lng is None):
+            raise ValueError("latitude and longitude must be sent together")
+        if lat is not None:
+            lat, lng = parse_lat_lng(lat, lng)
+        post = self.repo.add(
+            content=content,
+            user_id=user_id,
+            latitude=lat,
+            longitude=lng,
+            geohash=geohash_encode(lat, lng) if lat is not None else None,
+        )
+        if user_id:
+            # fan-out para as timelines dos seguidores sai pelo outbox, no mesmo commit do post
+            self.outbox.enqueue("feed.fanout", {"post_id": post.id, "author_id": user_id})
+        db.session.commit()
+        return post
+
+    def follow(self, follower_id: int, followee_id: int) -> bool:
+        if follower_id == followee_id:
+            raise ValueError("cannot follow yourself")
+        created = self.repo.follow(follower_id, followee_id)
+        if created:
+            self.repo.backfill(follower_id, followee_id, limit=self._backfill_size())
+        db.session.commit()
+        return created
+
+    def unfollow(self, follower_id: int, followee_id: int) -> bool:
+        deleted = self.repo.unfollow(follower_id, followee_id)
+        if deleted:
+            self.repo.remove_author_from_timeline(follower_id, followee_id)
+        db.session.commit()
+        return deleted
+
+    def fan_out(self, post_id: int, author_id: int) -> int:
+        if self.repo.followers_count(author_id) >= self._fanout_threshold():
+            # autor com muitos seguidores: nao materializa, entra no merge da leitura
+            self.repo.fan_out_own(post_id, author_id)
+            return 0
+        return self.repo.fan_out(post_id, author_id)
+
+    def timeline(self, user_id: int, cursor: Optional[int] = None, limit: int = 20) -> tuple[List[FeedPost], Optional[int]]:
+        limit = max(1, min(limit, 50))
+        ids = self.repo.timeline_ids(user_id, before=cursor, limit=limit)
+        heavy = self.repo.followed_heavy_authors(user_id, self._fanout_threshold())
+        if heavy:
+            merged = set(ids) | set(self.repo.post_ids_by_authors(heavy, before=cursor, limit=limit))
+            ids = sorted(merged, reverse=True)[:limit]
+        posts = {p.id: p for p in self.repo.get_many(ids)}
+        ordered = [posts[i] for i in ids if i in posts]
+        next_cursor = ids[-1] if len(ids) == limit else None
+        return ordered, next_cursor
+
+    def nearby(
+        self, lat: float, lng: float, radius_m: float, cursor: Optional[int] = None, limit: int = 20
+    ) -> tuple[List[tuple[FeedPost, float]], Optional[int]]:
+        """Posts dentro do raio, paginados por id (cursor) e ordenados na pagina por recencia + distancia."""
+        limit = max(1, min(limit, 50))
+        radius_m = max(100.0, min(radius_m, 50_000.0))
+        cells = covering_cells(lat, lng, radius_m)
+        hits: List[tuple[FeedPost, float]] = []
+        batch_size = limit * 3
+        before = cursor
+        exhausted = False
+        for _ in range(5):
+            batch = self.repo.nearby_candidates(cells, before=before, limit=batch_size)
+            for post in batch:
+                before = post.id
+                # celulas cobrem um quadrado; o raio exato e conferido aqui
+                distance = haversine_m(lat, lng, post.latitude, post.longitude)
+                if distance <= radius_m:
+                    hits.append((post, distance))
+                    if len(hits) == limit:
+                        break
+            if len(hits) == limit:
+                break
+            if len(batch) < batch_size:
+                exhausted = True
+                break
+        now = datetime.utcnow()
+        half_life = current_app.config.get("FEED_NEARBY_HALF_LIFE_HOURS", 6)
+
+        def _score(item):
+            post, distance = item
+            age_hours = max((now - post.created_at).total_seconds(), 0) / 3600
+            recency = math.pow(0.5, age_hours / half_life)
+            proximity = 1 - distance / radius_m
+            return 0.6 * recency + 0.4 * proximity
+
+        hits.sort(key=_score, reverse=True)
+        return hits, None if exhausted else before
+
+    def trim_timelines(self, keep: int) -> int:
+        return self.repo.trim_timelines(keep)
+
+    def _fanout_threshold(self) -> int:
+        return current_app.config.get("FEED_FANOUT_THRESHOLD", 5000)
+
+    def _backfill_size(self) -> int:
+        return current_app.config.get("FEED_FOLLOW_BACKFILL", 50)
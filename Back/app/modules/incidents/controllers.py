@@ -1,5 +1,8 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from ...common.fields import parse_fields, pick
+from .models import Incident
+from ..users.cache import author_of, user_cache
 from .services import IncidentService
 
 incidents_bp = Blueprint("incidents", __name__)
@@ -8,8 +11,15 @@ service = IncidentService()
 
 @incidents_bp.get("/incidents")
 def list_incidents():
-    incidents = service.list_incidents()
-    return jsonify([_serialize_incident(i) for i in incidents])
+    try:
+        fields = parse_fields(Incident, request.args.get("fields"))
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    incidents = service.list_incidents(fields=fields)
+    if fields:
+        return jsonify([_serialize_incident(i, fields) for i in incidents])
+    authors = user_cache.get_many(i.user_id for i in incidents)
+    return jsonify([{**_serialize_incident(i), "author": author_of(authors.get(i.user_id))} for i in incidents])
 
 
 @incidents_bp.post("/incidents")
@@ -37,7 +47,9 @@ def seed_data():
     return jsonify({"message": "seeded", "count": len(sample)})
 
 
-def _serialize_incident(incident):
+def _serialize_incident(incident, fields=None):
+    if fields:
+        return pick(incident, fields)
     return {
         "id": incident.id,
         "title": incident.title,
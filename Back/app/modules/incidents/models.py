@@ -12,5 +12,6 @@ class Incident(db.Model):
     longitude = db.Column(db.Float, nullable=False)
     severity = db.Column(db.String(50), default="info")
     type = db.Column(db.String(50), nullable=True) # buraco, roubo, infraestrutura, etc
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # chave de particao mensal no Postgres (PK la e (id, created_at)); ver modules/partitions
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
@@ -1,11 +1,12 @@
-from typing import List
+from typing import List, Optional
 from ...extensions import db
+from ...common.fields import select_fields
 from .models import Incident
 
 
 class IncidentRepository:
-    def list_recent(self, limit: int = 100) -> List[Incident]:
-        return Incident.query.order_by(Incident.created_at.desc()).limit(limit).all()
+    def list_recent(self, limit: int = 100, fields: Optional[List[str]] = None) -> List[Incident]:
+        return select_fields(Incident, fields).order_by(Incident.created_at.desc()).limit(limit).all()
 
     def create(self, **kwargs) -> Incident:
         incident = Incident(**kwargs)
@@ -7,8 +7,8 @@ class IncidentService:
     def __init__(self, repo: IncidentRepository | None = None):
         self.repo = repo or IncidentRepository()
 
-    def list_incidents(self) -> List[Incident]:
-        return self.repo.list_recent()
+    def list_incidents(self, fields: Optional[List[str]] = None) -> List[Incident]:
+        return self.repo.list_recent(fields=fields)
 
     def create_incident(self, payload: dict, user_id: Optional[int] = None) -> Incident:
         required = ("title", "latitude", "longitude")
@@ -0,0 +1,59 @@
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from .services import LeaderboardService, event_board, weekly_board
+
+leaderboard_bp = Blueprint("leaderboard", __name__)
+service = LeaderboardService()
+
+
+@leaderboard_bp.get("/leaderboard")
+def leaderboard():
+    try:
+        board = _board_from_args()
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    limit = request.args.get("limit", 20, type=int)
+    return jsonify({"board": board, "entries": service.top(board, limit=limit)})
+
+
+@leaderboard_bp.get("/leaderboard/me")
+@jwt_required()
+def my_rank():
+    user_id = get_jwt_identity()
+    boards = ["global", weekly_board()]
+    event_id = request.args.get("event_id", type=int)
+    if event_id is not None:
+        boards.append(event_board(event_id))
+    return jsonify([service.rank_of(board, user_id) for board in boards])
+
+
+@leaderboard_bp.get("/points/history")
+@jwt_required()
+def points_history():
+    entries = service.history(get_jwt_identity())
+    return jsonify(
+        [
+            {
+                "id": e.id,
+                "amount": e.amount,
+                "reason": e.reason,
+                "event_id": e.event_id,
+                "created_at": e.created_at.isoformat(),
+            }
+            for e in entries
+        ]
+    )
+
+
+def _board_from_args() -> str:
+    scope = request.args.get("scope", "global")
+    if scope == "global":
+        return "global"
+    if scope == "weekly":
+        return weekly_board()
+    if scope == "event":
+        event_id = request.args.get("event_id", type=int)
+        if event_id is None:
+            raise ValueError("event_id is required for scope=event")
+        return event_board(event_id)
+    raise ValueError("scope must be global, weekly or event")
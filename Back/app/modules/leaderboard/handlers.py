@@ -0,0 +1,14 @@
+from ..outbox.handlers import handles
+from .services import LeaderboardService
+
+
+@handles("points.award")
+def award_points(payload: dict):
+    # commit=False: o ledger entra no mesmo commit que marca a mensagem como processada
+    LeaderboardService().award(
+        payload["user_id"],
+        payload["amount"],
+        payload["reason"],
+        event_id=payload.get("event_id"),
+        commit=False,
+    )
@@ -0,0 +1,23 @@
+from datetime import datetime
+from ...extensions import db
+
+
+class PointsLedgerEntry(db.Model):
+    __tablename__ = "points_ledger"
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
+    amount = db.Column(db.Integer, nullable=False)
+    reason = db.Column(db.String(100), nullable=False)  # route.shared, incident.reported, ajuste manual...
+    event_id = db.Column(db.Integer, db.ForeignKey("route_events.id"), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class LeaderboardScore(db.Model):
+    __tablename__ = "leaderboard_scores"
+    __table_args__ = (db.Index("ix_leaderboard_scores_board_score", "board", "score"),)
+
+    board = db.Column(db.String(50), primary_key=True)  # global, weekly:2026-W42, event:12
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    score = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
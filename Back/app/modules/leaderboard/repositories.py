@@ -0,0 +1,67 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+from ...extensions import db
+from ...common.sql import dialect_insert
+from ..users.models import User
+from .models import LeaderboardScore, PointsLedgerEntry
+
+
+class LeaderboardRepository:
+    def append_entry(self, user_id: int, amount: int, reason: str, event_id: Optional[int] = None) -> PointsLedgerEntry:
+        entry = PointsLedgerEntry(user_id=user_id, amount=amount, reason=reason, event_id=event_id)
+        db.session.add(entry)
+        return entry
+
+    def increment_user_points(self, user_id: int, amount: int) -> Optional[int]:
+        # UPDATE users SET points = points + n: atomico, sem read-modify-write no Python
+        result = db.session.execute(
+            db.update(User)
+            .where(User.id == user_id)
+            .values(points=db.func.coalesce(User.points, 0) + amount)
+            .returning(User.points)
+        )
+        row = result.first()
+        return row[0] if row else None
+
+    def increment_score(self, board: str, user_id: int, amount: int) -> int:
+        now = datetime.utcnow()
+        stmt = dialect_insert(LeaderboardScore).values(board=board, user_id=user_id, score=amount, updated_at=now)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[LeaderboardScore.board, LeaderboardScore.user_id],
+            set_={"score": LeaderboardScore.score + amount, "updated_at": now},
+        ).returning(LeaderboardScore.score)
+        return db.session.execute(stmt).scalar_one()
+
+    def top(self, board: str, limit: int) -> List[Tuple[int, int]]:
+        rows = (
+            db.session.query(LeaderboardScore.user_id, LeaderboardScore.score)
+            .filter(LeaderboardScore.board == board)
+            .order_by(LeaderboardScore.score.desc(), LeaderboardScore.user_id.asc())
+            .limit(limit)
+            .all()
+        )
+        return [(user_id, score) for user_id, score in rows]
+
+    def get_score(self, board: str, user_id: int) -> Optional[int]:
+        return (
+            db.session.query(LeaderboardScore.score)
+            .filter(LeaderboardScore.board == board, LeaderboardScore.user_id == user_id)
+            .scalar()
+        )
+
+    def count_above(self, board: str, score: int) -> int:
+        # range scan no indice (board, score), nao ordena a tabela
+        return (
+            db.session.query(db.func.count())
+            .select_from(LeaderboardScore)
+            .filter(LeaderboardScore.board == board, LeaderboardScore.score > score)
+            .scalar()
+        )
+
+    def list_entries(self, user_id: int, limit: int = 50) -> List[PointsLedgerEntry]:
+        return (
+            PointsLedgerEntry.query.filter_by(user_id=user_id)
+            .order_by(PointsLedgerEntry.created_at.desc())
+            .limit(limit)
+            .all()
+        )
@@ -0,0 +1,98 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+from ...common.cache import TTLCache
+from ...extensions import db
+from ..users.cache import user_cache
+from .repositories import LeaderboardRepository
+from .models import PointsLedgerEntry
+
+
+def weekly_board(when: Optional[datetime] = None) -> str:
+    year, week, _ = (when or datetime.utcnow()).isocalendar()
+    return f"weekly:{year}-W{week:02d}"
+
+
+def event_board(event_id: int) -> str:
+    return f"event:{event_id}"
+
+
+class LeaderboardService:
+    """Ledger de pontos + placares pre-computados (global, semanal, por evento).
+
+    Cada award grava uma linha no ledger, faz `points = points + n` em `users` e
+    incrementa o placar de cada board em `leaderboard_scores` na mesma transacao.
+    O top-K de cada board fica num cache em memoria por processo, relido da
+    tabela quando o TTL expira: os awards rodam no worker do outbox, entao o
+    cache dos processos web nao e atualizado por eles.
+    """
+
+    top_k = 100
+
+    def __init__(self, repo: LeaderboardRepository | None = None):
+        self.repo = repo or LeaderboardRepository()
+
+    def award(
+        self,
+        user_id: int,
+        amount: int,
+        reason: str,
+        event_id: Optional[int] = None,
+        commit: bool = True,
+    ) -> PointsLedgerEntry:
+        if not amount:
+            raise ValueError("amount must be non-zero")
+        if self.repo.increment_user_points(user_id, amount) is None:
+            raise LookupError("user not found")
+        entry = self.repo.append_entry(user_id, amount, reason, event_id=event_id)
+        boards = ["global", weekly_board()]
+        if event_id is not None:
+            boards.append(event_board(event_id))
+        for board in boards:
+            self.repo.increment_score(board, user_id, amount)
+        if commit:
+            db.session.commit()
+        user_cache.invalidate(user_id)
+        return entry
+
+    def top(self, board: str, limit: int = 20) -> List[dict]:
+        limit = max(1, min(limit, self.top_k))
+        ranked = _top_cache.get(board)
+        if ranked is None:
+            ranked = self.repo.top(board, self.top_k)
+            _top_cache.set(board, ranked)
+        ranked = ranked[:limit]
+        profiles = user_cache.get_many(user_id for user_id, _ in ranked)
+        result = []
+        for user_id, score in ranked:
+            profile = profiles.get(user_id) or {}
+            result.append(
+                {
+                    "rank": _rank_in(ranked, score),
+                    "user_id": user_id,
+                    "full_name": profile.get("full_name"),
+                    "avatar_url": profile.get("avatar_url"),
+                    "score": score,
+                }
+            )
+        return result
+
+    def rank_of(self, board: str, user_id: int) -> dict:
+        cached = _top_cache.get(board)
+        if cached is not None:
+            for cached_user_id, score in cached:
+                if cached_user_id == user_id:
+                    return {"board": board, "rank": _rank_in(cached, score), "score": score}
+        score = self.repo.get_score(board, user_id) or 0
+        return {"board": board, "rank": self.repo.count_above(board, score) + 1, "score": score}
+
+    def history(self, user_id: int, limit: int = 50) -> List[PointsLedgerEntry]:
+        return self.repo.list_entries(user_id, limit=limit)
+
+
+def _rank_in(ranked: List[Tuple[int, int]], score: int) -> int:
+    # empates dividem a posicao (rank = 1 + quantos tem pontuacao maior)
+    return 1 + sum(1 for _, other in ranked if other > score)
+
+
+# top-K por board; fica ate 30 s atrasado em relacao a leaderboard_scores
+_top_cache = TTLCache(maxsize=256, ttl=30)
@@ -0,0 +1,30 @@
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from .services import OutboxService
+
+outbox_cli = AppGroup("outbox", help="Transactional outbox (side effects de escrita).")
+
+
+@outbox_cli.command("worker")
+@click.option("--once", is_flag=True, help="Drena a fila e sai.")
+def worker(once: bool):
+    cfg = current_app.config
+    OutboxService().run_worker(
+        poll_interval=cfg["OUTBOX_POLL_INTERVAL"],
+        batch_size=cfg["OUTBOX_BATCH_SIZE"],
+        max_attempts=cfg["OUTBOX_MAX_ATTEMPTS"],
+        once=once,
+    )
+
+
+@outbox_cli.command("purge")
+@click.option("--days", default=7, show_default=True, help="Remove mensagens processadas ha mais de N dias.")
+def purge(days: int):
+    click.echo(f"purged {OutboxService().purge(days)} messages")
+
+
+@outbox_cli.command("stats")
+def stats():
+    for status, count in sorted(OutboxService().stats().items()):
+        click.echo(f"{status}: {count}")
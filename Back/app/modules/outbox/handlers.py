@@ -0,0 +1,19 @@
+from typing import Callable, Dict
+
+HANDLERS: Dict[str, Callable[[dict], None]] = {}
+
+
+def handles(topic: str):
+    def decorator(fn):
+        HANDLERS[topic] = fn
+        return fn
+
+    return decorator
+
+
+def load_handlers():
+    # importa os modulos que registram handlers via @handles
+    from ..feed import handlers as _feed_handlers  # noqa: F401
+    from ..leaderboard import handlers as _leaderboard_handlers  # noqa: F401
+
+    return HANDLERS
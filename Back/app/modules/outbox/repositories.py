@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+from typing import List
+from sqlalchemy import and_, or_
+from ...extensions import db
+from .models import OutboxMessage
+
+
+class OutboxRepository:
+    def add(self, topic: str, payload: dict) -> OutboxMessage:
+        # sem commit: a mensagem entra na mesma transacao da entidade principal
+        message = OutboxMessage(topic=topic, payload=payload)
+        db.session.add(message)
+        return message
+
+    def claim_batch(self, batch_size: int, lock_timeout: int) -> List[OutboxMessage]:
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=lock_timeout)
+        messages = (
+            OutboxMessage.query.filter(
+                or_(
+                    and_(OutboxMessage.status == "pending", OutboxMessage.available_at <= now),
+                    and_(OutboxMessage.status == "processing", OutboxMessage.locked_at < stale),
+                )
+            )
+            .order_by(OutboxMessage.id.asc())
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        for message in messages:
+            message.status = "processing"
+            message.locked_at = now
+        db.session.commit()
+        return messages
+
+    def mark_done(self, message: OutboxMessage):
+        message.status = "done"
+        message.processed_at = datetime.utcnow()
+        message.locked_at = None
+        db.session.commit()
+
+    def mark_failed(self, message: OutboxMessage, error: str, max_attempts: int):
+        message.attempts += 1
+        message.last_error = error[:2000]
+        message.locked_at = None
+        if message.attempts >= max_attempts:
+            message.status = "failed"
+        else:
+            message.status = "pending"
+            message.available_at = datetime.utcnow() + timedelta(seconds=min(2 ** message.attempts, 300))
+        db.session.commit()
+
+    def purge_done(self, older_than: timedelta) -> int:
+        cutoff = datetime.utcnow() - older_than
+        deleted = OutboxMessage.query.filter(
+            OutboxMessage.status == "done", OutboxMessage.processed_at < cutoff
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        return deleted
+
+    def count_by_status(self) -> dict:
+        rows = db.session.query(OutboxMessage.status, db.func.count(OutboxMessage.id)).group_by(OutboxMessage.status).all()
+        return {status: count for status, count in rows}
@@ -0,0 +1,50 @@
+import logging
+import time
+from datetime import timedelta
+from .handlers import load_handlers
+from .repositories import OutboxRepository
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxService:
+    def __init__(self, repo: OutboxRepository | None = None):
+        self.repo = repo or OutboxRepository()
+
+    def enqueue(self, topic: str, payload: dict) -> OutboxMessage:
+        return self.repo.add(topic, payload)
+
+    def drain(self, batch_size: int = 100, max_attempts: int = 8, lock_timeout: int = 300) -> int:
+        handlers = load_handlers()
+        messages = self.repo.claim_batch(batch_size, lock_timeout)
+        for message in messages:
+            handler = handlers.get(message.topic)
+            if handler is None:
+                self.repo.mark_failed(message, f"no handler for topic '{message.topic}'", max_attempts=1)
+                continue
+            try:
+                handler(message.payload)
+            except Exception as err:  # noqa: BLE001
+                from ...extensions import db
+
+                db.session.rollback()
+                logger.exception("outbox message %s (%s) failed", message.id, message.topic)
+                self.repo.mark_failed(message, repr(err), max_attempts)
+            else:
+                self.repo.mark_done(message)
+        return len(messages)
+
+    def run_worker(self, poll_interval: float = 1.0, batch_size: int = 100, max_attempts: int = 8, once: bool = False):
+        while True:
+            processed = self.drain(batch_size=batch_size, max_attempts=max_attempts)
+            if once and processed < batch_size:
+                return
+            if processed == 0:
+                time.sleep(poll_interval)
+
+    def purge(self, days: int = 7) -> int:
+        return self.repo.purge_done(timedelta(days=days))
+
+    def stats(self) -> dict:
+        return self.repo.count_by_status()
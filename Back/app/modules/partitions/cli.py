@@ -0,0 +1,33 @@
+import click
+from flask.cli import AppGroup
+from .services import PartitionService
+
+partitions_cli = AppGroup("partitions", help="Particoes mensais de incidents/sos_alerts (Postgres).")
+
+
+@partitions_cli.command("maintain")
+@click.option("--months-ahead", type=int, default=None, help="Padrao: PARTITION_MONTHS_AHEAD.")
+@click.option("--dry-run", is_flag=True, help="So mostra o que seria criado/aposentado.")
+def maintain(months_ahead, dry_run: bool):
+    try:
+        report = PartitionService().maintain(months_ahead=months_ahead, dry_run=dry_run)
+    except ValueError as err:
+        raise click.ClickException(str(err))
+    for table, result in report.items():
+        if "skipped" in result:
+            click.echo(f"{table}: skipped, {result['skipped']}")
+            continue
+        click.echo(f"{table}: created {', '.join(result['created']) or '-'}")
+        click.echo(f"{table}: {result['action']} {', '.join(result['retired']) or '-'}")
+
+
+@partitions_cli.command("status")
+def status():
+    try:
+        tables = PartitionService().status()
+    except ValueError as err:
+        raise click.ClickException(str(err))
+    for table, partitions in tables.items():
+        click.echo(f"{table}:" if partitions else f"{table}: not partitioned")
+        for partition in partitions:
+            click.echo(f"  {partition['name']:<28} ~{partition['rows']} rows")
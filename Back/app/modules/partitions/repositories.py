@@ -0,0 +1,60 @@
+from datetime import date
+from typing import List, Optional, Tuple
+
+from ...extensions import db
+
+
+class PartitionRepository:
+    """Catalogo e DDL das particoes (somente Postgres). Nomes de tabela vem do codigo, nunca do request."""
+
+    def dialect(self) -> str:
+        return db.session.get_bind().dialect.name
+
+    def is_partitioned(self, table: str) -> bool:
+        return bool(
+            db.session.execute(
+                db.text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"), {"table": table}
+            ).scalar()
+        )
+
+    def list_partitions(self, table: str) -> List[Tuple[str, int]]:
+        rows = db.session.execute(
+            db.text(
+                "SELECT c.relname, c.reltuples::bigint FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = to_regclass(:table) ORDER BY c.relname"
+            ),
+            {"table": table},
+        )
+        return [(name, max(int(estimate), 0)) for name, estimate in rows]
+
+    def create_partition(self, table: str, name: str, start: date, end: date, default: Optional[str]) -> None:
+        bounds = {"start": start, "end": end}
+        # DDL nao aceita bind parameters: limites como literais (datas geradas aqui)
+        values = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        moved = 0
+        if default:
+            moved = db.session.execute(
+                db.text(f"SELECT count(*) FROM {default} WHERE created_at >= :start AND created_at < :end"), bounds
+            ).scalar()
+        if not moved:
+            db.session.execute(db.text(f"CREATE TABLE {name} PARTITION OF {table} {values}"))
+            return
+        # linhas do mes cairam na particao default (maintain atrasado): move antes de anexar
+        db.session.execute(db.text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+        db.session.execute(
+            db.text(f"INSERT INTO {name} SELECT * FROM {default} WHERE created_at >= :start AND created_at < :end"),
+            bounds,
+        )
+        db.session.execute(db.text(f"DELETE FROM {default} WHERE created_at >= :start AND created_at < :end"), bounds)
+        db.session.execute(db.text(f"ALTER TABLE {table} ATTACH PARTITION {name} {values}"))
+
+    def detach_partition(self, table: str, name: str) -> None:
+        db.session.execute(db.text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+
+    def archive_table(self, name: str, schema: str) -> None:
+        db.session.execute(db.text(f"CREATE SCHEMA IF NOT EXISTS {schema}"))
+        db.session.execute(db.text(f"ALTER TABLE {name} SET SCHEMA {schema}"))
+
+    def drop_table(self, name: str) -> None:
+        db.session.execute(db.text(f"DROP TABLE {name}"))
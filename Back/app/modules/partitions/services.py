@@ -0,0 +1,105 @@
+import re
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from flask import current_app
+
+from ...extensions import db
+from .repositories import PartitionRepository
+
+# tabelas particionadas por mes em created_at (ver migration b4f7e2a9c8d1)
+PARTITIONED_TABLES = ("incidents", "sos_alerts")
+ARCHIVE_SCHEMA = "archive"
+_MONTHLY = re.compile(r"^(?P<table>\w+)_p(?P<year>\d{4})_(?P<month>\d{2})$")
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month.year:04d}_{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    match = _MONTHLY.match(name)
+    if not match:
+        return None
+    return date(int(match["year"]), int(match["month"]), 1)
+
+
+class PartitionService:
+    """Particoes mensais de `incidents`/`sos_alerts` no Postgres: cria as dos proximos meses e aposenta as antigas.
+
+    Rode `flask partitions maintain` diariamente (cron). Particoes alem de
+    `PARTITION_RETENTION_MONTHS` sao desanexadas e movidas para o schema
+    `archive` (ou apagadas com `PARTITION_RETENTION_ACTION=drop`); a tabela
+    viva so fica com os meses recentes.
+    """
+
+    def __init__(self, repo: PartitionRepository | None = None):
+        self.repo = repo or PartitionRepository()
+
+    def _check(self):
+        if self.repo.dialect() != "postgresql":
+            raise ValueError("table partitioning requires PostgreSQL")
+
+    def status(self) -> Dict[str, List[dict]]:
+        self._check()
+        result = {}
+        for table in PARTITIONED_TABLES:
+            if not self.repo.is_partitioned(table):
+                result[table] = []
+                continue
+            result[table] = [{"name": name, "rows": rows} for name, rows in self.repo.list_partitions(table)]
+        return result
+
+    def maintain(
+        self, months_ahead: Optional[int] = None, today: Optional[date] = None, dry_run: bool = False
+    ) -> Dict[str, dict]:
+        self._check()
+        config = current_app.config
+        months_ahead = config["PARTITION_MONTHS_AHEAD"] if months_ahead is None else months_ahead
+        retention = config["PARTITION_RETENTION_MONTHS"]
+        action = config["PARTITION_RETENTION_ACTION"]
+        if action not in ("archive", "drop"):
+            raise ValueError("PARTITION_RETENTION_ACTION must be archive or drop")
+        current = month_start(today or datetime.utcnow().date())
+        report = {}
+        for table in PARTITIONED_TABLES:
+            if not self.repo.is_partitioned(table):
+                report[table] = {"skipped": "table is not partitioned (run flask db upgrade)"}
+                continue
+            existing = {name for name, _ in self.repo.list_partitions(table)}
+            default = f"{table}_default" if f"{table}_default" in existing else None
+            created, retired = [], []
+            for offset in range(months_ahead + 1):
+                month = add_months(current, offset)
+                name = partition_name(table, month)
+                if name not in existing:
+                    if not dry_run:
+                        self.repo.create_partition(table, name, month, add_months(month, 1), default)
+                    created.append(name)
+            if retention > 0:
+                cutoff = add_months(current, -retention)
+                for name in sorted(existing):
+                    month = partition_month(name)
+                    if month is None or month >= cutoff:
+                        continue
+                    if not dry_run:
+                        self.repo.detach_partition(table, name)
+                        if action == "drop":
+                            self.repo.drop_table(name)
+                        else:
+                            self.repo.archive_table(name, ARCHIVE_SCHEMA)
+                    retired.append(name)
+            # um commit por tabela: DDL e transacional no Postgres
+            if not dry_run:
+                db.session.commit()
+            report[table] = {"created": created, "retired": retired, "action": action}
+        return report
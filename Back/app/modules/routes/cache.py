@@ -0,0 +1,11 @@
+from ...extensions import response_cache
+
+
+def route_cache_key(route_id: int) -> str:
+    return f"route:{route_id}"
+
+
+def invalidate_route(route_id: int):
+    # GET /routes/<id> fica ate 300 s no response_cache: toda escrita na rota
+    # (colunas ou waypoints) derruba a entrada, depois do commit
+    response_cache.invalidate(route_cache_key(route_id))
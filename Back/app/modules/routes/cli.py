@@ -0,0 +1,32 @@
+import click
+from flask.cli import AppGroup
+from ...extensions import dem
+from .services import RouteService
+
+route_cli = AppGroup("route", help="Manutencao de rotas.")
+
+
+@route_cli.command("backfill-elevation")
+@click.option("--all", "recompute_all", is_flag=True, help="Recalcula tambem rotas que ja tem elevacao.")
+@click.option("--batch-size", default=200, show_default=True)
+def backfill_elevation(recompute_all: bool, batch_size: int):
+    if not dem.enabled:
+        raise click.ClickException("DEM_DIR is not configured or does not exist")
+    updated = RouteService().backfill_elevation(only_missing=not recompute_all, batch_size=batch_size)
+    click.echo(f"updated elevation of {updated} routes")
+
+
+@route_cli.command("backfill-signatures")
+@click.option("--all", "recompute_all", is_flag=True, help="Recalcula tambem rotas que ja tem assinatura.")
+@click.option("--batch-size", default=500, show_default=True)
+def backfill_signatures(recompute_all: bool, batch_size: int):
+    updated = RouteService().backfill_signatures(only_missing=not recompute_all, batch_size=batch_size)
+    click.echo(f"signed {updated} routes")
+
+
+@route_cli.command("backfill-segments")
+@click.option("--all", "recompute_all", is_flag=True, help="Reindexa tambem rotas que ja tem trechos.")
+@click.option("--batch-size", default=500, show_default=True)
+def backfill_segments(recompute_all: bool, batch_size: int):
+    updated = RouteService().backfill_segments(only_missing=not recompute_all, batch_size=batch_size)
+    click.echo(f"indexed segments of {updated} routes")
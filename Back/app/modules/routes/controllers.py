@@ -1,5 +1,14 @@
+import io
+
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from ...common.fields import parse_fields, pick
+from ...common.geo import parse_bbox
+from ...common.querybudget import query_budget
+from ...extensions import response_cache
+from .cache import route_cache_key
+from .importers import detect_format
+from .models import Route
 from .services import RouteService
 
 routes_bp = Blueprint("routes", __name__)
@@ -8,8 +17,32 @@ service = RouteService()
 
 @routes_bp.get("/routes")
 def list_routes():
-    routes = service.list_routes()
-    return jsonify([_serialize_route(r) for r in routes])
+    try:
+        fields = parse_fields(Route, request.args.get("fields"))
+        bbox = parse_bbox(request.args.get("bbox"))
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    routes = service.list_routes(fields=fields, bbox=bbox)
+    return jsonify([_serialize_route(r, fields) for r in routes])
+
+
+@routes_bp.get("/routes/near")
+def routes_near():
+    lat = request.args.get("lat", type=float)
+    lng = request.args.get("lng", type=float)
+    if lat is None or lng is None:
+        return jsonify({"error": "lat and lng are required"}), 400
+    try:
+        fields = parse_fields(Route, request.args.get("fields"))
+        near = service.routes_near(
+            lat,
+            lng,
+            radius_m=request.args.get("radius", 300, type=float),
+            limit=request.args.get("limit", 20, type=int),
+        )
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    return jsonify([{**_serialize_route(r, fields), "distance_m": round(distance, 1)} for r, distance in near])
 
 
 @routes_bp.get("/routes/rank")
@@ -17,12 +50,17 @@ def rank_routes():
     avoid_inc = request.args.get("avoid_incidents", "0") == "1"
     low_traffic = request.args.get("low_traffic", "0") == "1"
     low_elevation = request.args.get("low_elevation", "0") == "1"
-    ranked = service.rank_routes(avoid_incidents=avoid_inc)
-    # low_traffic/low_elevation ficam como placeholders enquanto nao ha dados
+    try:
+        fields = parse_fields(Route, request.args.get("fields"))
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    ranked = service.rank_routes(
+        avoid_incidents=avoid_inc, low_traffic=low_traffic, low_elevation=low_elevation, fields=fields
+    )
     return jsonify(
         [
           {
-            **_serialize_route(r),
+            **_serialize_route(r, fields),
             "score": idx,
             "prefs": {"avoid_incidents": avoid_inc, "low_traffic": low_traffic, "low_elevation": low_elevation},
           }
@@ -34,8 +72,12 @@ def rank_routes():
 @routes_bp.get("/routes/search")
 def search_routes():
     q = request.args.get("q", "", type=str)
-    results = service.search_routes(q)
-    return jsonify([_serialize_route(r) for r in results])
+    try:
+        fields = parse_fields(Route, request.args.get("fields"))
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    results = service.search_routes(q, fields=fields)
+    return jsonify([_serialize_route(r, fields) for r in results])
 
 
 @routes_bp.post("/routes")
@@ -46,10 +88,36 @@ def create_route():
         route = service.create_route(payload, user_id=None)
     except ValueError as err:
         return jsonify({"error": str(err)}), 400
-    return jsonify(_serialize_route(route)), 201
+    return jsonify({**_serialize_route(route), "duplicates": _serialize_duplicates(route)}), 201
+
+
+@routes_bp.post("/routes/import")
+@jwt_required(optional=True)
+def import_route():
+    # multipart (campo "file") ou o arquivo cru no corpo; lido em streaming
+    upload = request.files.get("file")
+    if upload is not None:
+        stream, filename = upload.stream, upload.filename
+    else:
+        stream, filename = io.BufferedReader(request.stream), request.args.get("filename")
+    try:
+        fmt = request.args.get("format") or request.form.get("format")
+        if not fmt:
+            if hasattr(stream, "peek"):
+                head = stream.peek(64)[:64]
+            else:
+                head = stream.read(64)
+                stream.seek(0)
+            fmt = detect_format(filename, head)
+        name = request.args.get("name") or request.form.get("name")
+        route = service.import_track(stream, fmt.lower(), name=name, user_id=get_jwt_identity())
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    return jsonify({**_serialize_route(route), "duplicates": _serialize_duplicates(route)}), 201
 
 
 @routes_bp.get("/routes/<int:route_id>")
+@response_cache.cached(key=route_cache_key, ttl=300)
 def get_route(route_id: int):
     route = service.repo.get_by_id(route_id)
     if not route:
@@ -57,6 +125,29 @@ def get_route(route_id: int):
     return jsonify(_serialize_route(route))
 
 
+@routes_bp.get("/routes/<int:route_id>/elevation")
+def elevation_profile(route_id: int):
+    try:
+        profile = service.elevation_profile(route_id)
+    except LookupError as err:
+        return jsonify({"error": str(err)}), 404
+    return jsonify(profile)
+
+
+@routes_bp.get("/routes/<int:route_id>/similar")
+def similar_routes(route_id: int):
+    limit = min(request.args.get("limit", 10, type=int), 50)
+    min_similarity = request.args.get("min_similarity", 0.5, type=float)
+    try:
+        fields = parse_fields(Route, request.args.get("fields"))
+        similar = service.similar_routes(route_id, limit=limit, min_similarity=min_similarity)
+    except LookupError as err:
+        return jsonify({"error": str(err)}), 404
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    return jsonify([{**_serialize_route(r, fields), "similarity": score} for r, score in similar])
+
+
 @routes_bp.post("/routes/<int:route_id>/incidents")
 @jwt_required(optional=True)
 def add_incident(route_id: int):
@@ -98,6 +189,7 @@ def save_route(route_id: int):
 
 
 @routes_bp.get("/routes/saved")
+@query_budget(2)
 def list_saved():
     # For development: use a default user_id=1
     # TODO: Restore JWT authentication in production
@@ -122,13 +214,30 @@ def set_waypoints(route_id: int):
     # TODO: Restore JWT authentication in production
     payload = request.get_json() or {}
     waypoints = payload.get("waypoints") or []
+    mode = request.args.get("mode") or payload.get("mode") or "replace"
     try:
-        objs = service.set_waypoints(route_id, waypoints)
+        objs, changes = service.set_waypoints(route_id, waypoints, mode=mode)
     except LookupError as err:
         return jsonify({"error": str(err)}), 404
     except ValueError as err:
         return jsonify({"error": str(err)}), 400
-    return jsonify([_serialize_waypoint(wp) for wp in objs])
+    response = jsonify([_serialize_waypoint(wp) for wp in objs])
+    if changes is not None:
+        response.headers["X-Waypoint-Changes"] = ",".join(f"{key}={value}" for key, value in changes.items())
+    return response
+
+
+@routes_bp.patch("/routes/<int:route_id>/waypoints/<int:waypoint_id>")
+@jwt_required()
+def move_waypoint(route_id: int, waypoint_id: int):
+    payload = request.get_json() or {}
+    try:
+        waypoint = service.move_waypoint(route_id, waypoint_id, payload)
+    except LookupError as err:
+        return jsonify({"error": str(err)}), 404
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    return jsonify(_serialize_waypoint(waypoint))
 
 
 @routes_bp.get("/routes/<int:route_id>/waypoints")
@@ -140,7 +249,9 @@ def list_waypoints(route_id: int):
     return jsonify([_serialize_waypoint(wp) for wp in objs])
 
 
-def _serialize_route(route):
+def _serialize_route(route, fields=None):
+    if fields:
+        return pick(route, fields)
     return {
         "id": route.id,
         "name": route.name,
@@ -157,9 +268,17 @@ def _serialize_route(route):
         "created_at": route.created_at.isoformat(),
         "traffic_score": route.traffic_score,
         "elevation_gain": route.elevation_gain,
+        "elevation_loss": route.elevation_loss,
+        "bbox": [route.bbox_min_lng, route.bbox_min_lat, route.bbox_max_lng, route.bbox_max_lat]
+        if route.bbox_min_lat is not None
+        else None,
     }
 
 
+def _serialize_duplicates(route):
+    return [{"route_id": route_id, "similarity": score} for route_id, score in getattr(route, "duplicates", [])]
+
+
 def _serialize_waypoint(wp):
     return {
         "id": wp.id,
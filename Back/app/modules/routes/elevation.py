@@ -0,0 +1,27 @@
+from typing import Optional, Tuple
+
+import numpy as np
+from flask import current_app
+
+from ...common import tracks
+from ...common.dem import smoothed_gain_loss
+from ...extensions import dem
+
+
+def sample_profile(coords: Optional[np.ndarray]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """(distancia_acumulada_m, elevacao_m) ao longo da geometria [lng, lat], ou None sem cobertura."""
+    if coords is None or not dem.enabled:
+        return None
+    lats, lngs, stations = tracks.resample(coords[:, 1], coords[:, 0], current_app.config["ELEVATION_SPACING_M"])
+    elevations = dem.sample(lats, lngs)
+    if np.isnan(elevations).all():
+        return None
+    return stations, elevations
+
+
+def elevation_columns(coords: Optional[np.ndarray]) -> dict:
+    profile = sample_profile(coords)
+    if profile is None:
+        return {}
+    gain, loss = smoothed_gain_loss(profile[1], window=current_app.config["ELEVATION_SMOOTHING_WINDOW"])
+    return {"elevation_gain": round(gain, 1), "elevation_loss": round(loss, 1)}
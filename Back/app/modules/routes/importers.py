@@ -0,0 +1,209 @@
+import json
+from array import array
+from datetime import datetime
+from typing import IO, Iterator, Optional, Tuple
+from xml.etree.ElementTree import ParseError, iterparse
+
+try:  # opcional: GeoJSON em streaming (pip install ijson)
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None
+
+try:  # opcional: arquivos .fit (pip install fitparse)
+    import fitparse
+except ImportError:  # pragma: no cover
+    fitparse = None
+
+NAN = float("nan")
+_SEMICIRCLE = 180.0 / 2**31
+
+# (lat, lng, ele, epoch_seconds); ele/tempo = NaN quando ausentes
+TrackPoint = Tuple[float, float, float, float]
+
+
+class Track:
+    """Pontos de um trilho em arrays compactos (8 bytes por valor), sem objetos por ponto."""
+
+    def __init__(self, max_points: int):
+        self.max_points = max_points
+        self.name: Optional[str] = None
+        self.lats = array("d")
+        self.lngs = array("d")
+        self.eles = array("d")
+        self.times = array("d")
+
+    def append(self, point: TrackPoint):
+        if len(self.lats) >= self.max_points:
+            raise ValueError(f"track has more than {self.max_points} points")
+        lat, lng, ele, ts = point
+        # comparacao falha com NaN, entao isso tambem recusa nao-finitos
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            raise ValueError(f"track point out of range: lat={lat}, lng={lng}")
+        self.lats.append(lat)
+        self.lngs.append(lng)
+        self.eles.append(ele)
+        self.times.append(ts)
+
+    def __len__(self):
+        return len(self.lats)
+
+
+def detect_format(filename: Optional[str], head: bytes) -> str:
+    name = (filename or "").lower()
+    for ext, fmt in ((".gpx", "gpx"), (".geojson", "geojson"), (".json", "geojson"), (".fit", "fit")):
+        if name.endswith(ext):
+            return fmt
+    if len(head) >= 12 and head[8:12] == b".FIT":
+        return "fit"
+    stripped = head.lstrip()
+    if stripped.startswith(b"<"):
+        return "gpx"
+    if stripped.startswith(b"{"):
+        return "geojson"
+    raise ValueError("could not detect track format, send format=gpx|geojson|fit")
+
+
+def read_track(stream: IO[bytes], fmt: str, max_points: int) -> Track:
+    track = Track(max_points)
+    if fmt == "gpx":
+        points = _iter_gpx(stream, track)
+    elif fmt == "geojson":
+        points = _iter_geojson(stream, track)
+    elif fmt == "fit":
+        points = _iter_fit(stream)
+    else:
+        raise ValueError("format must be gpx, geojson or fit")
+    try:
+        for point in points:
+            track.append(point)
+    except ParseError as err:
+        raise ValueError(f"invalid GPX: {err}") from None
+    except Exception as err:
+        if ijson is not None and isinstance(err, ijson.JSONError):
+            raise ValueError(f"invalid GeoJSON: {err}") from None
+        raise
+    if len(track) < 2:
+        raise ValueError("track must have at least 2 points")
+    return track
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _parse_time(value: Optional[str]) -> float:
+    if not value:
+        return NAN
+    try:
+        return datetime.fromisoformat(value.strip().replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return NAN
+
+
+def _iter_gpx(stream: IO[bytes], track: Track) -> Iterator[TrackPoint]:
+    parents = []
+    for event, elem in iterparse(stream, events=("start", "end")):
+        tag = _local(elem.tag)
+        if event == "start":
+            parents.append(elem)
+            continue
+        parents.pop()
+        if tag in ("trkpt", "rtept"):
+            try:
+                lat = float(elem.get("lat"))
+                lng = float(elem.get("lon"))
+            except (TypeError, ValueError):
+                raise ValueError("invalid GPX point") from None
+            ele, ts = NAN, NAN
+            for child in elem:
+                child_tag = _local(child.tag)
+                if child_tag == "ele" and child.text:
+                    ele = float(child.text)
+                elif child_tag == "time":
+                    ts = _parse_time(child.text)
+            yield lat, lng, ele, ts
+            # descarta o elemento ja lido: memoria constante no tamanho do arquivo
+            elem.clear()
+            if parents:
+                parents[-1].remove(elem)
+        elif tag == "name" and track.name is None and parents and _local(parents[-1].tag) in ("trk", "rte", "metadata"):
+            track.name = (elem.text or "").strip() or None
+        elif tag in ("trkseg", "trk", "rte") and parents:
+            parents[-1].remove(elem)
+
+
+def _iter_geojson(stream: IO[bytes], track: Track) -> Iterator[TrackPoint]:
+    if ijson is None:
+        # sem ijson o documento e carregado inteiro (limitado por MAX_CONTENT_LENGTH)
+        yield from _walk_geojson(json.load(stream), track)
+        return
+    position = None
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        if prefix.endswith("properties.name") and event == "string" and track.name is None:
+            track.name = value
+        if "coordinates" not in prefix.split("."):
+            continue
+        if event == "start_array":
+            position = []
+        elif event == "number" and position is not None:
+            position.append(float(value))
+        elif event == "end_array":
+            if position and len(position) >= 2:
+                yield position[1], position[0], position[2] if len(position) > 2 else NAN, NAN
+            position = None
+
+
+def _walk_geojson(node, track: Track) -> Iterator[TrackPoint]:
+    kind = node.get("type") if isinstance(node, dict) else None
+    if kind == "FeatureCollection":
+        for feature in node.get("features") or []:
+            yield from _walk_geojson(feature, track)
+    elif kind == "Feature":
+        if track.name is None:
+            track.name = (node.get("properties") or {}).get("name")
+        yield from _walk_geojson(node.get("geometry") or {}, track)
+    elif kind == "LineString":
+        for pos in _list(node.get("coordinates")):
+            yield _position(pos)
+    elif kind == "MultiLineString":
+        for line in _list(node.get("coordinates")):
+            for pos in _list(line):
+                yield _position(pos)
+
+
+def _list(value) -> list:
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        raise ValueError("invalid GeoJSON: coordinates must be arrays")
+    return value
+
+
+def _position(pos) -> TrackPoint:
+    """`[lng, lat(, ele)]` -> TrackPoint; qualquer outra coisa e GeoJSON invalido."""
+    if not isinstance(pos, list) or len(pos) < 2:
+        raise ValueError("invalid GeoJSON: position must be [lng, lat]")
+    try:
+        lng, lat = float(pos[0]), float(pos[1])
+        ele = float(pos[2]) if len(pos) > 2 and pos[2] is not None else NAN
+    except (TypeError, ValueError):
+        raise ValueError("invalid GeoJSON: position must be [lng, lat]") from None
+    return lat, lng, ele, NAN
+
+
+def _iter_fit(stream: IO[bytes]) -> Iterator[TrackPoint]:
+    if fitparse is None:
+        raise ValueError("FIT import requires the fitparse package")
+    for record in fitparse.FitFile(stream).get_messages("record"):
+        values = record.get_values()
+        lat, lng = values.get("position_lat"), values.get("position_long")
+        if lat is None or lng is None:
+            continue
+        ele = values.get("enhanced_altitude", values.get("altitude"))
+        ts = values.get("timestamp")
+        yield (
+            lat * _SEMICIRCLE,
+            lng * _SEMICIRCLE,
+            float(ele) if ele is not None else NAN,
+            ts.timestamp() if ts is not None else NAN,
+        )
@@ -16,10 +16,16 @@ class Route(db.Model):
     duration_seconds = db.Column(db.Integer, nullable=True)  # tempo estimado em segundos
     geometry = db.Column(db.JSON, nullable=True)  # coordenadas da polyline
     steps = db.Column(db.JSON, nullable=True)  # instruções turn-by-turn
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
     traffic_score = db.Column(db.Float, nullable=True)  # menor = melhor
     elevation_gain = db.Column(db.Float, nullable=True)  # metros acumulados
+    elevation_loss = db.Column(db.Float, nullable=True)
+    # bounding box da geometria, calculada no backend
+    bbox_min_lat = db.Column(db.Float, nullable=True)
+    bbox_min_lng = db.Column(db.Float, nullable=True)
+    bbox_max_lat = db.Column(db.Float, nullable=True)
+    bbox_max_lng = db.Column(db.Float, nullable=True)
 
 
 class SavedRoute(db.Model):
@@ -51,3 +57,35 @@ class RouteWaypoint(db.Model):
     longitude = db.Column(db.Float, nullable=False)
     seq = db.Column(db.Integer, nullable=False, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class RouteSignature(db.Model):
+    # MinHash da sequencia de celulas geohash da geometria (ver similarity.py)
+    __tablename__ = "route_signatures"
+
+    route_id = db.Column(db.Integer, db.ForeignKey("routes.id"), primary_key=True)
+    signature = db.Column(db.LargeBinary, nullable=False)  # uint32[NUM_PERM]
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class RouteLshBucket(db.Model):
+    # uma linha por banda LSH; rotas parecidas caem no mesmo (band, bucket)
+    __tablename__ = "route_lsh_buckets"
+
+    band = db.Column(db.SmallInteger, primary_key=True)
+    bucket = db.Column(db.BigInteger, primary_key=True)
+    route_id = db.Column(db.Integer, db.ForeignKey("routes.id"), primary_key=True, index=True)
+
+
+class RouteSegment(db.Model):
+    # trechos curtos da geometria com bbox: indice espacial de "rotas que passam por aqui" (ver segments.py)
+    __tablename__ = "route_segments"
+
+    id = db.Column(db.Integer, primary_key=True)
+    route_id = db.Column(db.Integer, db.ForeignKey("routes.id"), nullable=False, index=True)
+    geohash = db.Column(db.String(12), nullable=False, index=True)  # centro do trecho
+    min_lat = db.Column(db.Float, nullable=False)
+    min_lng = db.Column(db.Float, nullable=False)
+    max_lat = db.Column(db.Float, nullable=False)
+    max_lng = db.Column(db.Float, nullable=False)
+    points = db.Column(db.LargeBinary, nullable=False)  # float32[n, 2] de [lng, lat]
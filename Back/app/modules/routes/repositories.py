@@ -1,24 +1,126 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
 from ...extensions import db
-from .models import Route, SavedRoute, RouteShare, RouteWaypoint
+from ...common.fields import select_fields
+from .models import Route, SavedRoute, RouteShare, RouteWaypoint, RouteSignature, RouteLshBucket, RouteSegment
 
 
 class RouteRepository:
-    def list_recent(self, limit: int = 50) -> List[Route]:
-        return Route.query.order_by(Route.created_at.desc()).limit(limit).all()
+    def list_recent(self, limit: int = 50, fields: Optional[List[str]] = None) -> List[Route]:
+        return select_fields(Route, fields).order_by(Route.created_at.desc()).limit(limit).all()
+
+    def list_in_bbox(
+        self, cells: List[str], bbox: Tuple[float, float, float, float], limit: int = 50, fields: Optional[List[str]] = None
+    ) -> List[Route]:
+        """Rotas com algum trecho cruzando o retangulo (min_lat, min_lng, max_lat, max_lng), mais recentes primeiro."""
+        route_ids = self._segments_query(cells, bbox, RouteSegment.route_id)
+        return (
+            select_fields(Route, fields)
+            .filter(Route.id.in_(route_ids))
+            .order_by(Route.created_at.desc())
+            .limit(limit)
+            .all()
+        )
+
+    def segments_in_bbox(self, cells: List[str], bbox: Tuple[float, float, float, float]) -> List[Tuple[int, bytes]]:
+        rows = self._segments_query(cells, bbox, RouteSegment.route_id, RouteSegment.points).all()
+        return [(row.route_id, row.points) for row in rows]
+
+    def _segments_query(self, cells: List[str], bbox: Tuple[float, float, float, float], *columns):
+        min_lat, min_lng, max_lat, max_lng = bbox
+        # prefixo como faixa (>= cell e < cell~): usa o indice de geohash tambem no SQLite, ao contrario de LIKE
+        prefixes = db.or_(*[db.and_(RouteSegment.geohash >= cell, RouteSegment.geohash < cell + "~") for cell in cells])
+        return db.session.query(*columns).filter(
+            prefixes,
+            RouteSegment.min_lat <= max_lat,
+            RouteSegment.max_lat >= min_lat,
+            RouteSegment.min_lng <= max_lng,
+            RouteSegment.max_lng >= min_lng,
+        )
+
+    def replace_segments(self, route_id: int, rows: List[dict]):
+        """Troca os trechos indexados da rota; o commit fica com o chamador."""
+        db.session.execute(db.delete(RouteSegment).where(RouteSegment.route_id == route_id))
+        if rows:
+            db.session.execute(db.insert(RouteSegment), [{"route_id": route_id, **row} for row in rows])
 
     def create(self, **kwargs) -> Route:
+        """Insere a rota com flush (para ter o id); o commit fica com o chamador."""
         route = Route(**kwargs)
         db.session.add(route)
-        db.session.commit()
+        db.session.flush()
         return route
 
     def get_by_id(self, route_id: int) -> Route | None:
         return Route.query.get(route_id)
 
-    def search_by_name(self, query: str, limit: int = 15) -> List[Route]:
+    def get_many(self, route_ids: Sequence[int]) -> Dict[int, Route]:
+        if not route_ids:
+            return {}
+        return {route.id: route for route in Route.query.filter(Route.id.in_(route_ids)).all()}
+
+    def list_with_geometry(
+        self,
+        after_id: int,
+        limit: int,
+        only_missing_elevation: bool = False,
+        only_missing_signature: bool = False,
+        only_missing_segments: bool = False,
+    ) -> List[Route]:
+        query = Route.query.filter(Route.id > after_id, Route.geometry.isnot(None))
+        if only_missing_elevation:
+            query = query.filter(Route.elevation_gain.is_(None))
+        if only_missing_signature:
+            query = query.filter(~db.exists().where(RouteSignature.route_id == Route.id))
+        if only_missing_segments:
+            query = query.filter(~db.exists().where(RouteSegment.route_id == Route.id))
+        return query.order_by(Route.id.asc()).limit(limit).all()
+
+    def save_signature(self, route_id: int, signature: bytes, band_keys: Sequence[int]):
+        """Grava (ou troca) a assinatura e os buckets LSH da rota; o commit fica com o chamador."""
+        db.session.execute(db.delete(RouteLshBucket).where(RouteLshBucket.route_id == route_id))
+        db.session.merge(RouteSignature(route_id=route_id, signature=signature, updated_at=datetime.utcnow()))
+        db.session.execute(
+            db.insert(RouteLshBucket),
+            [{"band": band, "bucket": int(key), "route_id": route_id} for band, key in enumerate(band_keys)],
+        )
+
+    def lsh_candidates(
+        self, band_keys: Sequence[int], exclude_id: Optional[int] = None, limit: int = 100
+    ) -> List[Tuple[int, bytes]]:
+        """Rotas que colidem em ao menos uma banda, mais colisoes primeiro, com a assinatura.
+
+        Cada (band, bucket) e uma busca na chave primaria: o custo depende do
+        tamanho dos buckets, nao do total de rotas.
+        """
+        # OR de igualdades (em vez de tuple IN): vira um lookup por banda na PK tanto no Postgres quanto no SQLite
+        match = db.or_(
+            *[db.and_(RouteLshBucket.band == band, RouteLshBucket.bucket == int(key)) for band, key in enumerate(band_keys)]
+        )
+        hits = (
+            db.session.query(RouteLshBucket.route_id, db.func.count().label("hits"))
+            .filter(match)
+            .group_by(RouteLshBucket.route_id)
+        )
+        if exclude_id is not None:
+            hits = hits.filter(RouteLshBucket.route_id != exclude_id)
+        hits = hits.order_by(db.desc("hits")).limit(limit).subquery()
+        rows = (
+            db.session.query(RouteSignature.route_id, RouteSignature.signature)
+            .join(hits, hits.c.route_id == RouteSignature.route_id)
+            .order_by(hits.c.hits.desc())
+            .all()
+        )
+        return [(row.route_id, row.signature) for row in rows]
+
+    def get_signature(self, route_id: int) -> Optional[bytes]:
+        row = db.session.get(RouteSignature, route_id)
+        return row.signature if row else None
+
+    def search_by_name(self, query: str, limit: int = 15, fields: Optional[List[str]] = None) -> List[Route]:
         return (
-            Route.query.filter(Route.name.ilike(f"%{query}%"))
+            select_fields(Route, fields)
+            .filter(Route.name.ilike(f"%{query}%"))
             .order_by(Route.created_at.desc())
             .limit(limit)
             .all()
@@ -36,6 +138,15 @@ class RouteRepository:
     def list_saved(self, user_id: int) -> List[SavedRoute]:
         return SavedRoute.query.filter_by(user_id=user_id).order_by(SavedRoute.created_at.desc()).all()
 
+    def list_saved_routes(self, user_id: int, limit: Optional[int] = None) -> List[Route]:
+        # rotas salvas num unico JOIN (em vez de um get por SavedRoute)
+        query = (
+            Route.query.join(SavedRoute, SavedRoute.route_id == Route.id)
+            .filter(SavedRoute.user_id == user_id)
+            .order_by(SavedRoute.created_at.desc())
+        )
+        return query.limit(limit).all() if limit else query.all()
+
     def list_shared_recent(self, limit: int = 20) -> List[RouteShare]:
         return RouteShare.query.order_by(RouteShare.created_at.desc()).limit(limit).all()
 
@@ -47,19 +158,61 @@ class RouteRepository:
 
     def replace_waypoints(self, route_id: int, waypoints: List[dict]) -> List[RouteWaypoint]:
         RouteWaypoint.query.filter_by(route_id=route_id).delete()
-        objs: List[RouteWaypoint] = []
+        rows = [
+            {"route_id": route_id, "name": wp.get("name"), "latitude": wp["latitude"], "longitude": wp["longitude"], "seq": idx}
+            for idx, wp in enumerate(waypoints)
+        ]
+        db.session.execute(db.insert(RouteWaypoint), rows)  # executemany
+        db.session.commit()
+        return self.list_waypoints(route_id)
+
+    def diff_waypoints(self, route_id: int, waypoints: List[dict]) -> dict:
+        """Aplica a lista nova como diff: casa por id (ou seq), grava so o que mudou, em lote."""
+        existing = {
+            row.id: row
+            for row in db.session.query(
+                RouteWaypoint.id, RouteWaypoint.seq, RouteWaypoint.name, RouteWaypoint.latitude, RouteWaypoint.longitude
+            ).filter(RouteWaypoint.route_id == route_id)
+        }
+        by_seq = {row.seq: row.id for row in existing.values()}
+        matched = set()
+        inserts, updates = [], []
         for idx, wp in enumerate(waypoints):
-            obj = RouteWaypoint(
-                route_id=route_id,
-                name=wp.get("name"),
-                latitude=wp["latitude"],
-                longitude=wp["longitude"],
-                seq=idx,
-            )
-            db.session.add(obj)
-            objs.append(obj)
+            wp_id = wp.get("id")
+            if wp_id not in existing or wp_id in matched:
+                wp_id = by_seq.get(wp["seq"]) if wp.get("seq") is not None else None
+                if wp_id in matched:
+                    wp_id = None
+            values = {"name": wp.get("name"), "latitude": wp["latitude"], "longitude": wp["longitude"], "seq": idx}
+            if wp_id is None:
+                inserts.append({"route_id": route_id, **values})
+                continue
+            matched.add(wp_id)
+            current = existing[wp_id]
+            if any(getattr(current, key) != value for key, value in values.items()):
+                updates.append({"id": wp_id, **values})
+        deletes = [wp_id for wp_id in existing if wp_id not in matched]
+
+        if deletes:
+            db.session.execute(db.delete(RouteWaypoint).where(RouteWaypoint.id.in_(deletes)))
+        if updates:
+            db.session.execute(db.update(RouteWaypoint), updates)  # UPDATE por chave primaria, executemany
+        if inserts:
+            db.session.execute(db.insert(RouteWaypoint), inserts)
+        db.session.commit()
+        return {"inserted": len(inserts), "updated": len(updates), "deleted": len(deletes)}
+
+    def move_waypoint(self, route_id: int, waypoint_id: int, values: dict) -> Optional[RouteWaypoint]:
+        result = db.session.execute(
+            db.update(RouteWaypoint)
+            .where(RouteWaypoint.id == waypoint_id, RouteWaypoint.route_id == route_id)
+            .values(**values)
+        )
+        if not result.rowcount:
+            db.session.rollback()
+            return None
         db.session.commit()
-        return objs
+        return db.session.get(RouteWaypoint, waypoint_id)
 
     def list_waypoints(self, route_id: int) -> List[RouteWaypoint]:
         return RouteWaypoint.query.filter_by(route_id=route_id).order_by(RouteWaypoint.seq.asc()).all()
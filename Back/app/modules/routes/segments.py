@@ -0,0 +1,71 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from flask import current_app
+
+from ...common import tracks
+from ...common.geo import EARTH_RADIUS_M
+
+# geohash do centro de cada trecho; consultas usam prefixos dele (precisao <= 7)
+SEGMENT_PRECISION = 7
+DENSIFY_M = 50.0  # nenhum par de pontos guardado fica mais longe que isso
+
+
+def build_segments(coords: Optional[np.ndarray]) -> List[dict]:
+    """Quebra a geometria [lng, lat] em trechos de ~`ROUTE_SEGMENT_LENGTH_M` com bbox e pontos empacotados."""
+    if coords is None:
+        return []
+    lats, lngs = tracks.densify(coords[:, 1], coords[:, 0], DENSIFY_M)
+    cumulative = np.concatenate(([0.0], np.cumsum(tracks.segment_lengths_m(lats, lngs))))
+    # cada segmento (i, i+1) vai para o trecho do seu ponto inicial; trechos vizinhos compartilham o ponto de corte
+    chunk = (cumulative[:-1] // current_app.config["ROUTE_SEGMENT_LENGTH_M"]).astype(np.int64)
+    starts = np.flatnonzero(np.concatenate(([True], chunk[1:] != chunk[:-1])))
+    ends = np.append(starts[1:], len(chunk))  # exclusivo, em indices de segmento
+    centers_lat, centers_lng, rows = [], [], []
+    for start, end in zip(starts, ends):
+        seg_lats, seg_lngs = lats[start:end + 1], lngs[start:end + 1]
+        min_lat, min_lng, max_lat, max_lng = tracks.bbox(seg_lats, seg_lngs)
+        centers_lat.append((min_lat + max_lat) / 2)
+        centers_lng.append((min_lng + max_lng) / 2)
+        rows.append(
+            {
+                "min_lat": min_lat,
+                "min_lng": min_lng,
+                "max_lat": max_lat,
+                "max_lng": max_lng,
+                # float32 (~0.5 m de erro) basta para a distancia e corta o tamanho pela metade
+                "points": np.column_stack((seg_lngs, seg_lats)).astype("<f4").tobytes(),
+            }
+        )
+    codes = tracks.geohash_codes(np.array(centers_lat), np.array(centers_lng), SEGMENT_PRECISION)
+    for row, code in zip(rows, tracks.geohash_strings(codes, SEGMENT_PRECISION)):
+        row["geohash"] = code
+    return rows
+
+
+def nearest_by_route(lat: float, lng: float, rows: Sequence[Tuple[int, bytes]]) -> Dict[int, float]:
+    """Menor distancia (m) do ponto a cada rota, considerando so os trechos recebidos."""
+    if not rows:
+        return {}
+    # todos os trechos numa chamada vetorizada; pares que ligam um trecho ao seguinte sao descartados
+    points = np.concatenate([np.frombuffer(data, dtype="<f4") for _, data in rows]).reshape(-1, 2).astype(np.float64)
+    counts = np.array([len(data) // 8 for _, data in rows])
+    distances = tracks.distance_to_segments_m(lat, lng, points[:, 1], points[:, 0])
+    distances[np.cumsum(counts)[:-1] - 1] = np.inf
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    per_segment = np.minimum.reduceat(distances, starts)
+    route_ids, inverse = np.unique(np.array([route_id for route_id, _ in rows]), return_inverse=True)
+    best = np.full(len(route_ids), np.inf)
+    np.minimum.at(best, inverse, per_segment)
+    return dict(zip(route_ids.tolist(), best.tolist()))
+
+
+def reach_m(radius_m: float) -> float:
+    """Distancia maxima entre o ponto consultado e o centro de um trecho que pode estar dentro do raio."""
+    return radius_m + current_app.config["ROUTE_SEGMENT_LENGTH_M"] + DENSIFY_M
+
+
+def degrees(meters: float, lat: float):
+    """(dlat, dlng) aproximados para `meters` na latitude dada."""
+    dlat = np.degrees(meters / EARTH_RADIUS_M)
+    return float(dlat), float(dlat / max(np.cos(np.radians(lat)), 0.1))
@@ -1,28 +1,78 @@
-from typing import List, Optional
+from typing import IO, List, Optional, Tuple
+
+import numpy as np
+from flask import current_app
+
+from ...common import tracks
+from ...common.geo import bbox_cells, parse_lat_lng
+from ...extensions import db
+from .elevation import elevation_columns, sample_profile
+from . import segments, similarity
+from .cache import invalidate_route
+from .importers import read_track
 from .repositories import RouteRepository
 from .models import Route
 from ..incidents.models import Incident
-from ..feed.services import FeedService
 from ..incidents.repositories import IncidentRepository
+from ..outbox.services import OutboxService
+from ..traffic.services import TrafficService
+
+SHARE_POINTS = 5
+RANK_COLUMNS = ("start_lat", "start_lng", "end_lat", "end_lng", "traffic_score", "elevation_gain")
 
 
 class RouteService:
     def __init__(self, repo: RouteRepository | None = None):
         self.repo = repo or RouteRepository()
-        self.feed = FeedService()
+        self.outbox = OutboxService()
         self.incident_repo = IncidentRepository()
+        self.traffic = TrafficService()
 
-    def list_routes(self) -> List[Route]:
-        return self.repo.list_recent()
+    def list_routes(
+        self, fields: Optional[List[str]] = None, bbox: Optional[Tuple[float, float, float, float]] = None
+    ) -> List[Route]:
+        if bbox is None:
+            return self.repo.list_recent(fields=fields)
+        min_lat, min_lng, max_lat, max_lng = bbox
+        # o geohash guardado e o centro do trecho: amplia o retangulo pelo tamanho de um trecho
+        dlat, dlng = segments.degrees(segments.reach_m(0), (min_lat + max_lat) / 2)
+        cells = bbox_cells(min_lat - dlat, min_lng - dlng, max_lat + dlat, max_lng + dlng, segments.SEGMENT_PRECISION)
+        return self.repo.list_in_bbox(cells, bbox, limit=50, fields=fields)
 
-    def search_routes(self, query: str) -> List[Route]:
+    def routes_near(self, lat: float, lng: float, radius_m: float = 300, limit: int = 20) -> List[Tuple[Route, float]]:
+        """Rotas cuja geometria passa a ate `radius_m` do ponto, da mais proxima para a mais distante."""
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            raise ValueError("invalid lat/lng")
+        radius_m = max(10.0, min(radius_m, 5000.0))
+        limit = max(1, min(limit, 100))
+        dlat, dlng = segments.degrees(radius_m, lat)
+        box = (lat - dlat, lng - dlng, lat + dlat, lng + dlng)
+        reach_lat, reach_lng = segments.degrees(segments.reach_m(radius_m), lat)
+        cells = bbox_cells(lat - reach_lat, lng - reach_lng, lat + reach_lat, lng + reach_lng, segments.SEGMENT_PRECISION)
+        best = segments.nearest_by_route(lat, lng, self.repo.segments_in_bbox(cells, box))
+        nearest = sorted(((rid, d) for rid, d in best.items() if d <= radius_m), key=lambda item: item[1])[:limit]
+        routes = self.repo.get_many([route_id for route_id, _ in nearest])
+        return [(routes[route_id], distance) for route_id, distance in nearest if route_id in routes]
+
+    def search_routes(self, query: str, fields: Optional[List[str]] = None) -> List[Route]:
         if not query:
-            return self.repo.list_recent(limit=15)
-        return self.repo.search_by_name(query, limit=15)
+            return self.repo.list_recent(limit=15, fields=fields)
+        return self.repo.search_by_name(query, limit=15, fields=fields)
 
-    def rank_routes(self, avoid_incidents: bool = False, low_traffic: bool = False, low_elevation: bool = False) -> List[Route]:
-        routes = self.repo.list_recent(limit=50)
-        incidents = self.incident_repo.list_recent(limit=200) if avoid_incidents else []
+    def rank_routes(
+        self,
+        avoid_incidents: bool = False,
+        low_traffic: bool = False,
+        low_elevation: bool = False,
+        fields: Optional[List[str]] = None,
+    ) -> List[Route]:
+        if fields:
+            # colunas usadas no score entram no SELECT mesmo se nao pedidas
+            fields = list(dict.fromkeys([*fields, *RANK_COLUMNS]))
+        routes = self.repo.list_recent(limit=50, fields=fields)
+        incidents = (
+            self.incident_repo.list_recent(limit=200, fields=["id", "latitude", "longitude"]) if avoid_incidents else []
+        )
 
         def _score(route: Route) -> float:
             score = 0.0
@@ -46,6 +96,7 @@ class RouteService:
         return sorted(routes, key=_score)
 
     def create_route(self, payload: dict, user_id: Optional[int]) -> Route:
+        """Cria a rota; `route.duplicates` lista [(route_id, similaridade)] de rotas quase iguais ja salvas."""
         required = ("name", "start_lat", "start_lng", "end_lat", "end_lng")
         if not all(k in payload and payload[k] is not None for k in required):
             raise ValueError("name, start_lat, start_lng, end_lat, end_lng are required")
@@ -55,6 +106,9 @@ class RouteService:
         if "totalDistance" in payload and not distance_km:
             distance_km = payload["totalDistance"] / 1000.0  # Convert meters to km
         
+        coords = tracks.coords_array(payload.get("geometry"))
+        signed = similarity.route_signature(coords)
+        duplicates = self._duplicates(signed)
         route = self.repo.create(
             name=payload["name"],
             description=payload.get("description"),
@@ -67,9 +121,158 @@ class RouteService:
             geometry=payload.get("geometry"),  # Array of coordinates
             steps=payload.get("steps"),  # Array of turn-by-turn instructions
             user_id=user_id,
+            **_bbox_columns(coords),
+            **elevation_columns(coords),
+            traffic_score=self.traffic.score_coords(coords),
+        )
+        self._index_route(route, coords, signed, duplicates)
+        return route
+
+    def import_track(self, stream: IO[bytes], fmt: str, name: Optional[str], user_id: Optional[int]) -> Route:
+        """Cria uma rota a partir de um GPX/GeoJSON/FIT lido em streaming."""
+        track = read_track(stream, fmt, current_app.config["ROUTE_IMPORT_MAX_POINTS"])
+        lats = np.frombuffer(track.lats, dtype=np.float64)
+        lngs = np.frombuffer(track.lngs, dtype=np.float64)
+        times = np.frombuffer(track.times, dtype=np.float64)
+
+        distance_m = float(tracks.segment_lengths_m(lats, lngs).sum())
+        timed = times[~np.isnan(times)]
+        duration = int(timed.max() - timed.min()) if len(timed) >= 2 else None
+
+        coords = np.column_stack((lngs, lats))
+        keep = tracks.simplify(lats, lngs, current_app.config["ROUTE_IMPORT_SIMPLIFY_M"])
+        geometry = np.column_stack((lngs[keep], lats[keep])).round(6).tolist()
+
+        signed = similarity.route_signature(coords)
+        duplicates = self._duplicates(signed)
+        route = self.repo.create(
+            name=(name or track.name or "Rota importada")[:255],
+            start_lat=float(lats[0]),
+            start_lng=float(lngs[0]),
+            end_lat=float(lats[-1]),
+            end_lng=float(lngs[-1]),
+            distance_km=round(distance_m / 1000.0, 3),
+            duration_seconds=duration,
+            geometry=geometry,
+            user_id=user_id,
+            **_bbox_columns(coords),
+            **elevation_columns(coords),
+            traffic_score=self.traffic.score_coords(coords),
         )
+        self._index_route(route, coords, signed, duplicates)
         return route
 
+    def _duplicates(self, signed) -> List[Tuple[int, float]]:
+        if signed is None:
+            return []
+        return self._similar(*signed, min_similarity=current_app.config["ROUTE_DUPLICATE_THRESHOLD"], limit=5)
+
+    def _index_route(self, route: Route, coords: Optional[np.ndarray], signed, duplicates: List[Tuple[int, float]]):
+        # rota, assinatura LSH e trechos espaciais no mesmo commit: nao fica rota sem indice
+        if coords is not None:
+            if signed is not None:
+                self.repo.save_signature(route.id, similarity.to_bytes(signed[0]), signed[1])
+            self.repo.replace_segments(route.id, segments.build_segments(coords))
+        db.session.commit()
+        route.duplicates = duplicates
+
+    def _similar(
+        self, sig: np.ndarray, keys: np.ndarray, min_similarity: float, limit: int, exclude_id: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        # LSH so traz candidatos; a similaridade estimada pela assinatura inteira decide
+        scored = []
+        for route_id, data in self.repo.lsh_candidates(keys, exclude_id=exclude_id):
+            score = similarity.similarity(sig, similarity.from_bytes(data))
+            if score >= min_similarity:
+                scored.append((route_id, round(score, 3)))
+        scored.sort(key=lambda item: -item[1])
+        return scored[:limit]
+
+    def similar_routes(self, route_id: int, limit: int = 10, min_similarity: float = 0.5) -> List[Tuple[Route, float]]:
+        route = self.repo.get_by_id(route_id)
+        if not route:
+            raise LookupError("route not found")
+        stored = self.repo.get_signature(route_id)
+        if stored is not None:
+            sig = similarity.from_bytes(stored)
+            keys = similarity.band_keys(sig)
+        else:
+            signed = similarity.route_signature(tracks.coords_array(route.geometry))
+            if signed is None:
+                raise ValueError("route has no geometry")
+            sig, keys = signed
+        scored = self._similar(sig, keys, min_similarity=min_similarity, limit=limit, exclude_id=route_id)
+        routes = self.repo.get_many([route_id for route_id, _ in scored])
+        return [(routes[route_id], score) for route_id, score in scored if route_id in routes]
+
+    def backfill_signatures(self, only_missing: bool = True, batch_size: int = 500) -> int:
+        """Calcula assinaturas MinHash/buckets LSH das rotas com geometria, um commit por lote."""
+        updated = 0
+        last_id = 0
+        while True:
+            batch = self.repo.list_with_geometry(after_id=last_id, limit=batch_size, only_missing_signature=only_missing)
+            if not batch:
+                return updated
+            for route in batch:
+                signed = similarity.route_signature(tracks.coords_array(route.geometry))
+                if signed is not None:
+                    self.repo.save_signature(route.id, similarity.to_bytes(signed[0]), signed[1])
+                    updated += 1
+            last_id = batch[-1].id
+            db.session.commit()
+            for route in batch:
+                invalidate_route(route.id)
+
+    def backfill_segments(self, only_missing: bool = True, batch_size: int = 500) -> int:
+        """Indexa os trechos (bbox) das rotas com geometria, um commit por lote."""
+        updated = 0
+        last_id = 0
+        while True:
+            batch = self.repo.list_with_geometry(after_id=last_id, limit=batch_size, only_missing_segments=only_missing)
+            if not batch:
+                return updated
+            for route in batch:
+                rows = segments.build_segments(tracks.coords_array(route.geometry))
+                self.repo.replace_segments(route.id, rows)
+                updated += bool(rows)
+            last_id = batch[-1].id
+            db.session.commit()
+            for route in batch:
+                invalidate_route(route.id)
+
+    def elevation_profile(self, route_id: int) -> dict:
+        route = self.repo.get_by_id(route_id)
+        if not route:
+            raise LookupError("route not found")
+        profile = sample_profile(tracks.coords_array(route.geometry))
+        if profile is None:
+            raise LookupError("no elevation data for this route")
+        stations, elevations = profile
+        return {
+            "elevation_gain": route.elevation_gain,
+            "elevation_loss": route.elevation_loss,
+            "distance_m": stations.round(1).tolist(),
+            "elevation_m": [None if np.isnan(e) else round(float(e), 1) for e in elevations],
+        }
+
+    def backfill_elevation(self, only_missing: bool = True, batch_size: int = 200) -> int:
+        """Recalcula ganho/perda das rotas com geometria, em lotes por id (um commit por lote)."""
+        updated = 0
+        last_id = 0
+        while True:
+            batch = self.repo.list_with_geometry(after_id=last_id, limit=batch_size, only_missing_elevation=only_missing)
+            if not batch:
+                return updated
+            for route in batch:
+                columns = elevation_columns(tracks.coords_array(route.geometry))
+                for key, value in columns.items():
+                    setattr(route, key, value)
+                updated += bool(columns)
+            last_id = batch[-1].id
+            db.session.commit()
+            for route in batch:
+                invalidate_route(route.id)
+
     def add_incident_to_route(self, route_id: int, payload: dict) -> Incident:
         route = self.repo.get_by_id(route_id)
         if not route:
@@ -85,8 +288,6 @@ class RouteService:
             severity=payload.get("severity", "info"),
             user_id=payload.get("user_id"),
         )
-        from ...extensions import db
-
         db.session.add(incident)
         db.session.commit()
         return incident
@@ -97,32 +298,85 @@ class RouteService:
             raise LookupError("route not found")
         return self.repo.save_for_user(user_id, route_id, save)
 
-    def list_saved(self, user_id: int):
-        saved = self.repo.list_saved(user_id)
-        return [self.repo.get_by_id(s.route_id) for s in saved if self.repo.get_by_id(s.route_id)]
+    def list_saved(self, user_id: int, limit: Optional[int] = None) -> List[Route]:
+        return self.repo.list_saved_routes(user_id, limit=limit)
 
     def share_route(self, route_id: int, user_id: int, note: Optional[str]):
         route = self.repo.get_by_id(route_id)
         if not route:
             raise LookupError("route not found")
+        # post no feed sai pelo outbox, no mesmo commit do share
+        self.outbox.enqueue("route.shared", {"route_id": route_id, "route_name": route.name, "user_id": user_id})
+        self.outbox.enqueue("points.award", {"user_id": user_id, "amount": SHARE_POINTS, "reason": "route.shared"})
         share = self.repo.share(route_id, user_id, note)
-        # opcional: criar post no feed
-        self.feed.create_post({"content": f"Rota compartilhada: {route.name}"}, user_id=user_id)
         return share
 
-    def set_waypoints(self, route_id: int, waypoints: List[dict]):
+    def set_waypoints(self, route_id: int, waypoints: List[dict], mode: str = "replace"):
+        """Grava a lista de waypoints; `mode=diff` reaproveita os ids e so escreve o que mudou.
+
+        Retorna (waypoints, changes); `changes` e None no modo replace.
+        """
+        if mode not in ("replace", "diff"):
+            raise ValueError("mode must be replace or diff")
         route = self.repo.get_by_id(route_id)
         if not route:
             raise LookupError("route not found")
-        if not waypoints:
+        if not waypoints or not isinstance(waypoints, list):
             raise ValueError("waypoints required")
-        for wp in waypoints:
-            if "latitude" not in wp or "longitude" not in wp:
-                raise ValueError("latitude and longitude required for waypoints")
-        return self.repo.replace_waypoints(route_id, waypoints)
+        waypoints = [_clean_waypoint(wp) for wp in waypoints]
+        if mode == "replace":
+            saved = self.repo.replace_waypoints(route_id, waypoints)
+            invalidate_route(route_id)
+            return saved, None
+        changes = self.repo.diff_waypoints(route_id, waypoints)
+        invalidate_route(route_id)
+        return self.repo.list_waypoints(route_id), changes
+
+    def move_waypoint(self, route_id: int, waypoint_id: int, data: dict):
+        values = {key: data[key] for key in ("name", "latitude", "longitude") if key in data}
+        if not values:
+            raise ValueError("name, latitude or longitude required")
+        if "latitude" in values or "longitude" in values:
+            # so um dos dois: o outro continua valendo, mas o valor enviado e validado igual
+            lat, lng = parse_lat_lng(values.get("latitude", 0), values.get("longitude", 0))
+            if "latitude" in values:
+                values["latitude"] = lat
+            if "longitude" in values:
+                values["longitude"] = lng
+        if values.get("name") is not None and not isinstance(values["name"], str):
+            raise ValueError("name must be a string")
+        waypoint = self.repo.move_waypoint(route_id, waypoint_id, values)
+        if not waypoint:
+            raise LookupError("waypoint not found")
+        invalidate_route(route_id)
+        return waypoint
 
     def list_waypoints(self, route_id: int):
         route = self.repo.get_by_id(route_id)
         if not route:
             raise LookupError("route not found")
         return self.repo.list_waypoints(route_id)
+
+
+def _bbox_columns(coords: Optional[np.ndarray]) -> dict:
+    if coords is None:
+        return {}
+    min_lat, min_lng, max_lat, max_lng = tracks.bbox(coords[:, 1], coords[:, 0])
+    return {"bbox_min_lat": min_lat, "bbox_min_lng": min_lng, "bbox_max_lat": max_lat, "bbox_max_lng": max_lng}
+
+
+def _clean_waypoint(wp) -> dict:
+    # valida antes de qualquer escrita: valor invalido vira 400, nao erro do banco
+    if not isinstance(wp, dict):
+        raise ValueError("each waypoint must be an object")
+    if "latitude" not in wp or "longitude" not in wp:
+        raise ValueError("latitude and longitude required for waypoints")
+    lat, lng = parse_lat_lng(wp["latitude"], wp["longitude"])
+    for key in ("id", "seq"):
+        value = wp.get(key)
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool)):
+            raise ValueError(f"waypoint {key} must be an integer")
+    name = wp.get("name")
+    if name is not None and not isinstance(name, str):
+        raise ValueError("waypoint name must be a string")
+    return {"id": wp.get("id"), "seq": wp.get("seq"), "name": name, "latitude": lat, "longitude": lng}
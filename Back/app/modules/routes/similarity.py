@@ -0,0 +1,70 @@
+from typing import Optional, Tuple
+
+import numpy as np
+from flask import current_app
+
+from ...common import tracks
+
+# 64 hashes em 16 bandas de 4: pares com Jaccard ~0.5 ja tem ~50% de chance de colidir
+# numa banda, e acima de 0.8 quase sempre colidem. Mudar isso exige recalcular as assinaturas.
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+_rng = np.random.default_rng(0x5EED)
+_MUL = _rng.integers(1, 2**63, NUM_PERM, dtype=np.uint64) | np.uint64(1)  # impares
+_ADD = _rng.integers(0, 2**63, NUM_PERM, dtype=np.uint64)
+_BAND_MUL = _rng.integers(1, 2**63, ROWS, dtype=np.uint64) | np.uint64(1)
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+def shingles(coords: Optional[np.ndarray]) -> Optional[np.ndarray]:
+    """Pares de celulas geohash consecutivas ao longo da geometria [lng, lat] (conjunto, uint64)."""
+    if coords is None:
+        return None
+    config = current_app.config
+    lats, lngs, _ = tracks.resample(coords[:, 1], coords[:, 0], config["ROUTE_SIMILARITY_SPACING_M"])
+    cells = tracks.geohash_codes(lats, lngs, config["ROUTE_SIMILARITY_PRECISION"]).astype(np.uint64)
+    # sequencia de celulas sem repeticoes seguidas; o par guarda a direcao do trajeto
+    cells = cells[np.concatenate(([True], cells[1:] != cells[:-1]))]
+    if len(cells) == 1:
+        return cells
+    with np.errstate(over="ignore"):
+        pairs = (cells[:-1] * _MIX) ^ cells[1:]
+    return np.unique(pairs)
+
+
+def signature(values: np.ndarray) -> np.ndarray:
+    """MinHash (uint32[NUM_PERM]) com hashing multiply-shift de 64 bits."""
+    with np.errstate(over="ignore"):
+        hashed = (values[:, None] * _MUL + _ADD) >> np.uint64(32)
+    return hashed.min(axis=0).astype(np.uint32)
+
+
+def band_keys(sig: np.ndarray) -> np.ndarray:
+    """Uma chave int64 por banda (o mesmo valor em bandas diferentes nao colide por causa do indice)."""
+    rows = sig.reshape(BANDS, ROWS).astype(np.uint64)
+    with np.errstate(over="ignore"):
+        keys = (rows * _BAND_MUL).sum(axis=1) ^ (np.arange(BANDS, dtype=np.uint64) * _MIX)
+    return keys.view(np.int64)
+
+
+def route_signature(coords: Optional[np.ndarray]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    values = shingles(coords)
+    if values is None:
+        return None
+    sig = signature(values)
+    return sig, band_keys(sig)
+
+
+def similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """Estimativa do Jaccard entre os conjuntos de celulas das duas rotas."""
+    return float(np.mean(sig_a == sig_b))
+
+
+def to_bytes(sig: np.ndarray) -> bytes:
+    return sig.astype("<u4").tobytes()
+
+
+def from_bytes(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<u4")
@@ -1,5 +1,7 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from ...common.fields import parse_fields, pick
+from .models import SOSAlert
 from .services import SOSService
 
 sos_bp = Blueprint("sos", __name__)
@@ -8,8 +10,12 @@ service = SOSService()
 
 @sos_bp.get("/sos")
 def list_sos():
-    alerts = service.list_alerts()
-    return jsonify([_serialize_alert(a) for a in alerts])
+    try:
+        fields = parse_fields(SOSAlert, request.args.get("fields"))
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    alerts = service.list_alerts(fields=fields)
+    return jsonify([_serialize_alert(a, fields) for a in alerts])
 
 
 @sos_bp.post("/sos")
@@ -37,7 +43,9 @@ def update_sos(alert_id: int):
     return jsonify(_serialize_alert(alert))
 
 
-def _serialize_alert(alert):
+def _serialize_alert(alert, fields=None):
+    if fields:
+        return pick(alert, fields)
     return {
         "id": alert.id,
         "latitude": alert.latitude,
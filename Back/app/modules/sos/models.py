@@ -11,5 +11,6 @@ class SOSAlert(db.Model):
     status = db.Column(db.String(50), default="open")  # open, ack, resolved
     type = db.Column(db.String(50), nullable=True) # pneu, saude, acidente
     message = db.Column(db.String(255), nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # chave de particao mensal no Postgres (PK la e (id, created_at)); ver modules/partitions
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
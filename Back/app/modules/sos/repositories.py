@@ -1,11 +1,12 @@
-from typing import List
+from typing import List, Optional
 from ...extensions import db
+from ...common.fields import select_fields
 from .models import SOSAlert
 
 
 class SOSRepository:
-    def list_recent(self, limit: int = 50) -> List[SOSAlert]:
-        return SOSAlert.query.order_by(SOSAlert.created_at.desc()).limit(limit).all()
+    def list_recent(self, limit: int = 50, fields: Optional[List[str]] = None) -> List[SOSAlert]:
+        return select_fields(SOSAlert, fields).order_by(SOSAlert.created_at.desc()).limit(limit).all()
 
     def create(self, **kwargs) -> SOSAlert:
         alert = SOSAlert(**kwargs)
@@ -7,8 +7,8 @@ class SOSService:
     def __init__(self, repo: SOSRepository | None = None):
         self.repo = repo or SOSRepository()
 
-    def list_alerts(self) -> List[SOSAlert]:
-        return self.repo.list_recent()
+    def list_alerts(self, fields: Optional[List[str]] = None) -> List[SOSAlert]:
+        return self.repo.list_recent(fields=fields)
 
     def create_alert(self, payload: dict, user_id: Optional[int]) -> SOSAlert:
         required = ("latitude", "longitude")
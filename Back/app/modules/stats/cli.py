@@ -0,0 +1,19 @@
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from .services import DATASETS, StatsService
+
+stats_cli = AppGroup("stats", help="Compactacao de incidentes/SOS antigos em rollups.")
+
+
+@stats_cli.command("compact")
+@click.argument("dataset", type=click.Choice([*DATASETS, "all"]), default="all")
+@click.option("--older-than-days", type=int, default=None, help="Padrao: COMPACT_INCIDENTS_AFTER_DAYS / COMPACT_SOS_AFTER_DAYS.")
+@click.option("--batch-size", default=5000, show_default=True, help="Linhas por lote/commit.")
+@click.option("--archive-dir", default=None, help="Grava as linhas brutas em NDJSON gzip antes de apagar (padrao: COMPACTION_ARCHIVE_DIR).")
+def compact(dataset: str, older_than_days, batch_size: int, archive_dir):
+    archive_dir = archive_dir or current_app.config["COMPACTION_ARCHIVE_DIR"]
+    service = StatsService()
+    for name in DATASETS if dataset == "all" else (dataset,):
+        result = service.compact(name, older_than_days=older_than_days, batch_size=batch_size, archive_dir=archive_dir)
+        click.echo(f"{name}: compacted {result['rows']} rows into {result['groups']} rollup groups")
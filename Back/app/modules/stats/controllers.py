@@ -0,0 +1,29 @@
+from flask import Blueprint, jsonify, request
+from ...common.geo import parse_bbox
+from .services import StatsService, parse_day
+
+stats_bp = Blueprint("stats", __name__)
+service = StatsService()
+
+
+@stats_bp.get("/stats/incidents")
+def incident_stats():
+    return _summary("incidents")
+
+
+@stats_bp.get("/stats/sos")
+def sos_stats():
+    return _summary("sos_alerts")
+
+
+def _summary(dataset: str):
+    try:
+        summary = service.summary(
+            dataset,
+            since=parse_day(request.args.get("since"), "since"),
+            until=parse_day(request.args.get("until"), "until"),
+            bbox=parse_bbox(request.args.get("bbox")),
+        )
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    return jsonify(summary)
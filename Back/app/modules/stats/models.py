@@ -0,0 +1,23 @@
+from ...extensions import db
+
+
+class IncidentRollup(db.Model):
+    # incidentes compactados: contagem por dia x celula geohash x tipo x severidade
+    __tablename__ = "incident_rollups"
+
+    day = db.Column(db.Date, primary_key=True)
+    cell = db.Column(db.String(12), primary_key=True)
+    type = db.Column(db.String(50), primary_key=True)  # "" quando o incidente nao tinha tipo
+    severity = db.Column(db.String(50), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class SOSRollup(db.Model):
+    # alertas SOS resolvidos compactados: contagem por dia x celula x tipo x status
+    __tablename__ = "sos_rollups"
+
+    day = db.Column(db.Date, primary_key=True)
+    cell = db.Column(db.String(12), primary_key=True)
+    type = db.Column(db.String(50), primary_key=True)
+    status = db.Column(db.String(50), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
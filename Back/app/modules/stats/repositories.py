@@ -0,0 +1,74 @@
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+
+from ...extensions import db
+from ...common.sql import dialect_insert
+from ..incidents.models import Incident
+from ..sos.models import SOSAlert
+from .models import IncidentRollup, SOSRollup
+
+# dataset -> (tabela viva, rollup, coluna de categoria alem do tipo)
+SOURCES = {
+    "incidents": (Incident, IncidentRollup, "severity"),
+    "sos_alerts": (SOSAlert, SOSRollup, "status"),
+}
+
+
+class StatsRepository:
+    def compactable(self, dataset: str, before: datetime, after_id: int, limit: int) -> List[dict]:
+        """Linhas inteiras (para o arquivo) anteriores a `before`, em ordem de id."""
+        table = SOURCES[dataset][0].__table__
+        stmt = db.select(table).where(table.c.created_at < before, table.c.id > after_id)
+        if dataset == "sos_alerts":
+            # alertas abertos/em atendimento nunca sao compactados
+            stmt = stmt.where(table.c.status == "resolved")
+        return [dict(row) for row in db.session.execute(stmt.order_by(table.c.id.asc()).limit(limit)).mappings()]
+
+    def add_to_rollup(self, dataset: str, rows: List[dict]):
+        """Soma as contagens no rollup (INSERT ... ON CONFLICT DO UPDATE count = count + excluded.count)."""
+        _, rollup, _ = SOURCES[dataset]
+        stmt = dialect_insert(rollup)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[c.name for c in rollup.__table__.primary_key.columns],
+            set_={"count": rollup.__table__.c.count + stmt.excluded["count"]},
+        )
+        db.session.execute(stmt, rows)
+
+    def delete_live(self, dataset: str, ids: List[int]):
+        live, _, _ = SOURCES[dataset]
+        db.session.execute(db.delete(live).where(live.id.in_(ids)))
+
+    def rollup_counts(
+        self, dataset: str, since: Optional[date], until: Optional[date], cells: Optional[List[str]]
+    ) -> List[Tuple]:
+        """(dia, tipo, categoria, celula, contagem) do rollup; `cells` filtra por prefixo geohash."""
+        _, rollup, category = SOURCES[dataset]
+        column = getattr(rollup, category)
+        query = db.session.query(rollup.day, rollup.type, column, rollup.cell, db.func.sum(rollup.count))
+        if since is not None:
+            query = query.filter(rollup.day >= since)
+        if until is not None:
+            query = query.filter(rollup.day <= until)
+        if cells is not None:
+            query = query.filter(db.or_(*[db.and_(rollup.cell >= cell, rollup.cell < cell + "~") for cell in cells]))
+        return query.group_by(rollup.day, rollup.type, column, rollup.cell).all()
+
+    def live_counts(
+        self,
+        dataset: str,
+        since: Optional[date],
+        until: Optional[date],
+        bbox: Optional[Tuple[float, float, float, float]],
+    ) -> List[Tuple]:
+        live, _, category = SOURCES[dataset]
+        day = db.func.date(live.created_at)
+        column = getattr(live, category)
+        query = db.session.query(day, live.type, column, db.func.count(live.id))
+        if since is not None:
+            query = query.filter(live.created_at >= since)
+        if until is not None:
+            query = query.filter(live.created_at < until + timedelta(days=1))
+        if bbox is not None:
+            min_lat, min_lng, max_lat, max_lng = bbox
+            query = query.filter(live.latitude.between(min_lat, max_lat), live.longitude.between(min_lng, max_lng))
+        return query.group_by(day, live.type, column).all()
@@ -0,0 +1,140 @@
+import gzip
+import json
+import os
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from flask import current_app
+
+from ...common import tracks
+from ...common.geo import bbox_cells, geohash_bounds
+from ...extensions import db
+from .repositories import SOURCES, StatsRepository
+
+DATASETS = tuple(SOURCES)
+
+
+def parse_day(raw: Optional[str], name: str) -> Optional[date]:
+    if not raw:
+        return None
+    try:
+        return date.fromisoformat(raw[:10])
+    except ValueError:
+        raise ValueError(f"{name} must be a date (YYYY-MM-DD)") from None
+
+
+class StatsService:
+    def __init__(self, repo: StatsRepository | None = None):
+        self.repo = repo or StatsRepository()
+
+    def compact(
+        self,
+        dataset: str,
+        older_than_days: Optional[int] = None,
+        batch_size: int = 5000,
+        archive_dir: Optional[str] = None,
+        now: Optional[datetime] = None,
+    ) -> Dict[str, int]:
+        """Move linhas antigas para o rollup diario por celula e apaga as linhas vivas.
+
+        Cada lote soma no rollup e apaga as linhas no mesmo commit, entao rodar de
+        novo (ou depois de uma falha) nao conta nada duas vezes. Com `archive_dir`
+        as linhas brutas vao antes para um NDJSON gzip por execucao.
+        """
+        if dataset not in SOURCES:
+            raise LookupError(f"unknown dataset: {dataset}")
+        config = current_app.config
+        if older_than_days is None:
+            older_than_days = config["COMPACT_INCIDENTS_AFTER_DAYS" if dataset == "incidents" else "COMPACT_SOS_AFTER_DAYS"]
+        now = now or datetime.utcnow()
+        before = now - timedelta(days=older_than_days)
+        precision = config["STATS_CELL_PRECISION"]
+        category = SOURCES[dataset][2]
+
+        archive = None
+        if archive_dir:
+            os.makedirs(archive_dir, exist_ok=True)
+            archive = gzip.open(os.path.join(archive_dir, f"{dataset}-{now:%Y%m%dT%H%M%S}.ndjson.gz"), "wt")
+        compacted, groups = 0, 0
+        last_id = 0
+        try:
+            while True:
+                rows = self.repo.compactable(dataset, before, after_id=last_id, limit=batch_size)
+                if not rows:
+                    break
+                if archive is not None:
+                    for row in rows:
+                        archive.write(json.dumps(row, default=_json_default, separators=(",", ":")) + "\n")
+                    archive.flush()
+                lats = np.array([row["latitude"] for row in rows], dtype=np.float64)
+                lngs = np.array([row["longitude"] for row in rows], dtype=np.float64)
+                cells = tracks.geohash_strings(tracks.geohash_codes(lats, lngs, precision), precision)
+                counts = Counter(
+                    (row["created_at"].date(), cell, row["type"] or "", row[category] or "")
+                    for row, cell in zip(rows, cells)
+                )
+                self.repo.add_to_rollup(
+                    dataset,
+                    [
+                        {"day": day, "cell": cell, "type": kind, category: value, "count": count}
+                        for (day, cell, kind, value), count in counts.items()
+                    ],
+                )
+                self.repo.delete_live(dataset, [row["id"] for row in rows])
+                db.session.commit()
+                compacted += len(rows)
+                groups += len(counts)
+                last_id = rows[-1]["id"]
+        finally:
+            if archive is not None:
+                archive.close()
+        return {"rows": compacted, "groups": groups}
+
+    def summary(
+        self,
+        dataset: str,
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+    ) -> dict:
+        """Contagens por dia/tipo/categoria: rollups (historico) + linhas ainda vivas."""
+        if since and until and since > until:
+            raise ValueError("since must be before until")
+        category = SOURCES[dataset][2]
+        cells = None
+        if bbox is not None:
+            # prefixos grossos no SQL; o corte fino (centro da celula dentro do bbox) e feito aqui,
+            # entao o filtro no historico tem a resolucao de STATS_CELL_PRECISION
+            cells = bbox_cells(*bbox, max_precision=current_app.config["STATS_CELL_PRECISION"])
+        rows = [
+            (day, kind, value, count)
+            for day, kind, value, cell, count in self.repo.rollup_counts(dataset, since, until, cells)
+            if bbox is None or _center_in(cell, bbox)
+        ]
+        rows.extend(self.repo.live_counts(dataset, since, until, bbox))
+        by_day, by_type, by_category = Counter(), Counter(), Counter()
+        for day, kind, value, count in rows:
+            count = int(count or 0)
+            by_day[str(day)[:10]] += count
+            by_type[kind or "unknown"] += count
+            by_category[value or "unknown"] += count
+        return {
+            "total": sum(by_day.values()),
+            "by_day": dict(sorted(by_day.items())),
+            "by_type": dict(by_type.most_common()),
+            f"by_{category}": dict(by_category.most_common()),
+        }
+
+
+def _center_in(cell: str, bbox: Tuple[float, float, float, float]) -> bool:
+    min_lat, max_lat, min_lng, max_lng = geohash_bounds(cell)
+    lat, lng = (min_lat + max_lat) / 2, (min_lng + max_lng) / 2
+    return bbox[0] <= lat <= bbox[2] and bbox[1] <= lng <= bbox[3]
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"not serializable: {type(value).__name__}")
@@ -0,0 +1,21 @@
+import time
+
+import click
+from flask.cli import AppGroup
+from .services import IMPORT_FORMATS, SupportPointService
+
+support_points_cli = AppGroup("support-points", help="Pontos de apoio.")
+
+
+@support_points_cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "fmt", type=click.Choice(IMPORT_FORMATS), default=None, help="Padrao: pela extensao.")
+@click.option("--batch-size", default=5000, show_default=True)
+def import_points(path: str, fmt: str, batch_size: int):
+    fmt = fmt or ("pbf" if path.endswith(".pbf") else "geojson")
+    started = time.monotonic()
+    try:
+        result = SupportPointService().import_file(path, fmt, batch_size=batch_size)
+    except ValueError as err:
+        raise click.ClickException(str(err))
+    click.echo(f"upserted {result['imported']} support points in {time.monotonic() - started:.1f}s {result['by_type']}")
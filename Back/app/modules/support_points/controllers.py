@@ -1,4 +1,11 @@
+import os
+import tempfile
+
 from flask import Blueprint, jsonify, request
+from ...common.auth import admin_required
+from ...common.fields import parse_fields, pick
+from .importers import iter_geojson
+from .models import SupportPoint
 from .services import SupportPointService
 
 support_points_bp = Blueprint("support_points", __name__)
@@ -6,8 +13,12 @@ service = SupportPointService()
 
 @support_points_bp.get("/support-points")
 def list_points():
-    points = service.list_points()
-    return jsonify([_serialize_point(p) for p in points])
+    try:
+        fields = parse_fields(SupportPoint, request.args.get("fields"))
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    points = service.list_points(fields=fields)
+    return jsonify([_serialize_point(p, fields) for p in points])
 
 @support_points_bp.post("/support-points")
 def create_point():
@@ -18,7 +29,33 @@ def create_point():
         return jsonify({"error": str(err)}), 400
     return jsonify(_serialize_point(point)), 201
 
-def _serialize_point(p):
+@support_points_bp.post("/support-points/import")
+@admin_required
+def import_points():
+    upload = request.files.get("file")
+    if upload is None:
+        return jsonify({"error": "file is required"}), 400
+    fmt = request.form.get("format") or ("pbf" if (upload.filename or "").endswith(".pbf") else "geojson")
+    try:
+        if fmt == "pbf":
+            # osmium le de um caminho no disco
+            with tempfile.NamedTemporaryFile(suffix=".osm.pbf", delete=False) as tmp:
+                upload.save(tmp)
+            try:
+                result = service.import_file(tmp.name, fmt)
+            finally:
+                os.unlink(tmp.name)
+        elif fmt == "geojson":
+            result = service.import_rows(iter_geojson(upload.stream))
+        else:
+            raise ValueError("format must be geojson or pbf")
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    return jsonify(result)
+
+def _serialize_point(p, fields=None):
+    if fields:
+        return pick(p, fields)
     return {
         "id": p.id,
         "name": p.name,
@@ -26,5 +63,6 @@ def _serialize_point(p):
         "description": p.description,
         "latitude": p.latitude,
         "longitude": p.longitude,
+        "external_id": p.external_id,
         "created_at": p.created_at.isoformat()
     }
@@ -0,0 +1,130 @@
+import json
+from typing import IO, Callable, Iterator, Optional, Tuple
+
+from ...common.geo import parse_lat_lng
+
+try:  # opcional: GeoJSON em streaming (pip install ijson)
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None
+
+try:  # opcional: extratos .osm.pbf (pip install osmium)
+    import osmium
+except ImportError:  # pragma: no cover
+    osmium = None
+
+
+def classify(tags: dict) -> Optional[str]:
+    """Tags OSM -> `SupportPoint.type` (None = ignorar)."""
+    amenity = tags.get("amenity")
+    if amenity == "bicycle_repair_station":
+        return "oficina"
+    if amenity in ("drinking_water", "water_point") or (amenity == "fountain" and tags.get("drinking_water") == "yes"):
+        return "agua"
+    if amenity == "bicycle_parking":
+        return "bicicletario"
+    if tags.get("shop") == "bicycle" or tags.get("craft") == "bicycle":
+        # so conserto, sem venda: oficina
+        if tags.get("service:bicycle:repair") == "yes" and tags.get("service:bicycle:retail") == "no":
+            return "oficina"
+        return "loja"
+    return None
+
+
+def to_row(external_id: str, tags: dict, lat: float, lng: float) -> Optional[dict]:
+    kind = classify(tags)
+    if kind is None:
+        return None
+    return {
+        "external_id": external_id[:64],
+        "name": tags["name"][:255] if tags.get("name") else None,
+        "type": kind,
+        "description": tags.get("description") or tags.get("opening_hours"),
+        "latitude": lat,
+        "longitude": lng,
+    }
+
+
+def iter_geojson(stream: IO[bytes]) -> Iterator[dict]:
+    """Features de um extrato GeoJSON (osmium export, Overpass, ...) ja mapeadas para linhas.
+
+    JSON malformado vira ValueError (400 na API); feature sem id ou com geometria
+    degenerada e ignorada.
+    """
+    try:
+        if ijson is not None:
+            features = ijson.items(stream, "features.item", use_float=True)
+        else:
+            document = json.load(stream)
+            features = document.get("features") or [] if isinstance(document, dict) else []
+        for feature in features:
+            if not isinstance(feature, dict):
+                continue
+            props = feature.get("properties") if isinstance(feature.get("properties"), dict) else {}
+            tags = props.get("tags") if isinstance(props.get("tags"), dict) else props
+            external_id = feature.get("id") or props.get("@id") or props.get("osm_id") or props.get("id")
+            point = _representative_point(feature.get("geometry"))
+            if external_id is None or point is None:
+                continue
+            row = to_row(f"osm:{external_id}", tags, point[0], point[1])
+            if row is not None:
+                yield row
+    except Exception as err:
+        if isinstance(err, ValueError) or (ijson is not None and isinstance(err, ijson.JSONError)):
+            raise ValueError(f"invalid GeoJSON: {err}") from None
+        raise
+
+
+def read_pbf(path: str, sink: Callable[[dict], None]):
+    """Le nodes e ways de um .osm.pbf chamando `sink(linha)` para cada ponto reconhecido."""
+    if osmium is None:
+        raise ValueError("PBF import requires the osmium package")
+
+    class _Handler(osmium.SimpleHandler):
+        def node(self, n):
+            if n.tags and n.location.valid():
+                row = to_row(f"osm:node/{n.id}", dict(n.tags), n.location.lat, n.location.lon)
+                if row is not None:
+                    sink(row)
+
+        def way(self, w):
+            if not w.tags:
+                return
+            tags = dict(w.tags)
+            if classify(tags) is None:
+                return
+            locs = [(nd.lat, nd.lon) for nd in w.nodes if nd.location.valid()]
+            if locs:
+                lat = sum(p[0] for p in locs) / len(locs)
+                lng = sum(p[1] for p in locs) / len(locs)
+                sink(to_row(f"osm:way/{w.id}", tags, lat, lng))
+
+    # locations=True guarda as coordenadas dos nodes para resolver as ways
+    _Handler().apply_file(path, locations=True)
+
+
+def _representative_point(geometry) -> Optional[Tuple[float, float]]:
+    """(lat, lng) do ponto ou da media dos vertices; None para geometria vazia ou invalida."""
+    if not isinstance(geometry, dict):
+        return None
+    kind, coords = geometry.get("type"), geometry.get("coordinates")
+    if not coords:
+        return None
+    try:
+        if kind == "Point":
+            ring = [coords]
+        elif kind == "Polygon":
+            ring = coords[0]
+        elif kind == "LineString":
+            ring = coords
+        elif kind == "MultiPolygon":
+            ring = coords[0][0]
+        else:
+            return None
+        if not ring:
+            return None
+        lng = sum(float(p[0]) for p in ring) / len(ring)
+        lat = sum(float(p[1]) for p in ring) / len(ring)
+        return parse_lat_lng(lat, lng)
+    except (TypeError, ValueError, IndexError, KeyError):
+        return None
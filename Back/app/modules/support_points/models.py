@@ -10,4 +10,5 @@ class SupportPoint(db.Model):
     description = db.Column(db.Text, nullable=True)
     latitude = db.Column(db.Float, nullable=False)
     longitude = db.Column(db.Float, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    external_id = db.Column(db.String(64), nullable=True, unique=True)  # ex.: osm:node/123, para re-importar
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
@@ -1,5 +1,9 @@
 from .models import SupportPoint
 from ...extensions import db
+from ...common.fields import select_fields
+from ...common.sql import dialect_insert
+
+_UPSERT_COLUMNS = ("name", "type", "description", "latitude", "longitude")
 
 class SupportPointRepository:
     def create(self, **kwargs):
@@ -8,5 +12,14 @@ class SupportPointRepository:
         db.session.commit()
         return sp
 
-    def list_all(self):
-        return SupportPoint.query.all()
+    def list_all(self, fields=None):
+        return select_fields(SupportPoint, fields).all()
+
+    def upsert_many(self, rows):
+        # um INSERT ... ON CONFLICT (external_id) DO UPDATE por lote (executemany)
+        stmt = dialect_insert(SupportPoint)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SupportPoint.external_id],
+            set_={c: stmt.excluded[c] for c in _UPSERT_COLUMNS},
+        )
+        db.session.execute(stmt, rows)
@@ -1,5 +1,12 @@
+from collections import Counter
+from typing import Iterable
+
+from ...extensions import db
+from .importers import iter_geojson, read_pbf
 from .repositories import SupportPointRepository
 
+IMPORT_FORMATS = ("geojson", "pbf")
+
 class SupportPointService:
     def __init__(self):
         self.repo = SupportPointRepository()
@@ -18,5 +25,50 @@ class SupportPointService:
             longitude=payload.get("longitude")
         )
 
-    def list_points(self):
-        return self.repo.list_all()
+    def list_points(self, fields=None):
+        return self.repo.list_all(fields=fields)
+
+    def import_file(self, path: str, fmt: str, batch_size: int = 5000) -> dict:
+        """Importa um extrato OSM (.osm.pbf) ou GeoJSON, com upsert em lotes pelo external_id."""
+        if fmt not in IMPORT_FORMATS:
+            raise ValueError("format must be geojson or pbf")
+        batcher = _UpsertBatcher(self.repo, batch_size)
+        if fmt == "pbf":
+            read_pbf(path, batcher.add)
+        else:
+            with open(path, "rb") as stream:
+                for row in iter_geojson(stream):
+                    batcher.add(row)
+        return batcher.finish()
+
+    def import_rows(self, rows: Iterable[dict], batch_size: int = 5000) -> dict:
+        batcher = _UpsertBatcher(self.repo, batch_size)
+        for row in rows:
+            batcher.add(row)
+        return batcher.finish()
+
+
+class _UpsertBatcher:
+    def __init__(self, repo: SupportPointRepository, batch_size: int):
+        self.repo = repo
+        self.batch_size = batch_size
+        self.pending = {}  # external_id -> linha; o mesmo id duas vezes no lote quebraria o ON CONFLICT
+        self.by_type = Counter()
+
+    def add(self, row: dict):
+        self.pending[row["external_id"]] = row
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        rows = list(self.pending.values())
+        self.repo.upsert_many(rows)
+        db.session.commit()
+        self.by_type.update(r["type"] for r in rows)
+        self.pending = {}
+
+    def finish(self) -> dict:
+        self.flush()
+        return {"imported": sum(self.by_type.values()), "by_type": dict(self.by_type)}
@@ -0,0 +1,12 @@
+import click
+from flask.cli import AppGroup
+from .services import TrafficService
+
+traffic_cli = AppGroup("traffic", help="Agregacao de trafego por celula.")
+
+
+@traffic_cli.command("rollup")
+@click.option("--batch-size", default=50_000, show_default=True, help="Posicoes por lote/commit.")
+def rollup(batch_size: int):
+    result = TrafficService().rollup(batch_size=batch_size)
+    click.echo(f"aggregated {result['positions']} positions into {result['cells']} cells, rescored {result['routes']} routes")
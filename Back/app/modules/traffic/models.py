@@ -0,0 +1,22 @@
+from datetime import datetime
+from ...extensions import db
+
+
+class TrafficCell(db.Model):
+    # contadores por celula geohash x hora do dia, empacotados como arrays (ver services.CellCounters)
+    __tablename__ = "traffic_cells"
+
+    cell = db.Column(db.String(12), primary_key=True)
+    volume = db.Column(db.LargeBinary, nullable=False)  # uint32[24]: amostras por hora
+    speed_sum = db.Column(db.LargeBinary, nullable=False)  # float64[24]: soma das velocidades (m/s)
+    speed_samples = db.Column(db.LargeBinary, nullable=False)  # uint32[24]: amostras com velocidade
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class TrafficRollup(db.Model):
+    # marca d'agua do rollup incremental: ultimo id de event_positions ja agregado
+    __tablename__ = "traffic_rollups"
+
+    source = db.Column(db.String(50), primary_key=True)
+    last_id = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -0,0 +1,72 @@
+from datetime import datetime
+from typing import Dict, List, Tuple
+from ...extensions import db
+from ..events.models import EventPosition
+from ..routes.models import Route
+from .models import TrafficCell, TrafficRollup
+
+_IN_CHUNK = 500
+
+
+class TrafficRepository:
+    def lock_rollup(self, source: str) -> TrafficRollup:
+        # FOR UPDATE: dois rollups simultaneos nao contam as mesmas posicoes duas vezes
+        state = db.session.query(TrafficRollup).filter_by(source=source).with_for_update().first()
+        if state is None:
+            state = TrafficRollup(source=source, last_id=0)
+            db.session.add(state)
+            db.session.flush()
+        return state
+
+    def positions_after(self, last_id: int, limit: int, settled_before: datetime) -> List[Tuple]:
+        """Posicoes com id > last_id, cortadas antes da primeira gravada a partir de `settled_before`.
+
+        No Postgres ids sao reservados antes do commit: uma transacao lenta pode
+        tornar visivel um id menor depois de um maior ja agregado, e a marca
+        d'agua pularia a linha para sempre. So linhas mais velhas que o lag
+        entram, e o corte e no prefixo para a marca nunca passar de uma recente.
+        """
+        rows = (
+            db.session.query(
+                EventPosition.id,
+                EventPosition.latitude,
+                EventPosition.longitude,
+                EventPosition.speed,
+                EventPosition.recorded_at,
+                EventPosition.created_at,
+            )
+            .filter(EventPosition.id > last_id)
+            .order_by(EventPosition.id.asc())
+            .limit(limit)
+            .all()
+        )
+        for i, row in enumerate(rows):
+            if row[5] >= settled_before:
+                return rows[:i]
+        return rows
+
+    def get_cells(self, cells: List[str]) -> Dict[str, TrafficCell]:
+        found: Dict[str, TrafficCell] = {}
+        for start in range(0, len(cells), _IN_CHUNK):
+            chunk = cells[start:start + _IN_CHUNK]
+            found.update({c.cell: c for c in TrafficCell.query.filter(TrafficCell.cell.in_(chunk)).all()})
+        return found
+
+    def add_cell(self, cell: TrafficCell):
+        db.session.add(cell)
+
+    def routes_in_bbox(self, bounds: Tuple[float, float, float, float], after_id: int, limit: int) -> List[Route]:
+        min_lat, min_lng, max_lat, max_lng = bounds
+        overlaps = db.and_(
+            Route.bbox_max_lat >= min_lat,
+            Route.bbox_min_lat <= max_lat,
+            Route.bbox_max_lng >= min_lng,
+            Route.bbox_min_lng <= max_lng,
+        )
+        return (
+            Route.query.filter(Route.id > after_id, Route.geometry.isnot(None))
+            .filter(db.or_(Route.bbox_min_lat.is_(None), overlaps))
+            .order_by(Route.id.asc())
+            .limit(limit)
+            .all()
+        )
@@ -0,0 +1,158 @@
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+import numpy as np
+from flask import current_app
+
+from ...common import tracks
+from ...common.geo import geohash_bounds
+from ...extensions import db
+from ..routes.cache import invalidate_route
+from .models import TrafficCell
+from .repositories import TrafficRepository
+
+HOURS = 24
+SOURCE = "event_positions"
+
+
+class CellCounters:
+    """Contadores de uma celula como arrays numpy de 24 posicoes (uma por hora do dia)."""
+
+    def __init__(self, volume: np.ndarray, speed_sum: np.ndarray, speed_samples: np.ndarray):
+        self.volume = volume
+        self.speed_sum = speed_sum
+        self.speed_samples = speed_samples
+
+    @classmethod
+    def empty(cls) -> "CellCounters":
+        return cls(np.zeros(HOURS, np.uint32), np.zeros(HOURS, np.float64), np.zeros(HOURS, np.uint32))
+
+    @classmethod
+    def from_row(cls, row: TrafficCell) -> "CellCounters":
+        return cls(
+            np.frombuffer(row.volume, dtype="<u4").copy(),
+            np.frombuffer(row.speed_sum, dtype="<f8").copy(),
+            np.frombuffer(row.speed_samples, dtype="<u4").copy(),
+        )
+
+    def write_to(self, row: TrafficCell):
+        row.volume = self.volume.astype("<u4").tobytes()
+        row.speed_sum = self.speed_sum.astype("<f8").tobytes()
+        row.speed_samples = self.speed_samples.astype("<u4").tobytes()
+        row.updated_at = datetime.utcnow()
+
+    def congestion(self, free_flow_speed: float) -> np.ndarray:
+        """Indice por hora: log do volume, ampliado quando a velocidade media cai abaixo do fluxo livre."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_speed = self.speed_sum / self.speed_samples
+        slowdown = np.where(self.speed_samples > 0, np.clip(1 - mean_speed / free_flow_speed, 0, 1), 0.0)
+        return np.log1p(self.volume.astype(np.float64)) * (1 + slowdown)
+
+
+class TrafficService:
+    def __init__(self, repo: TrafficRepository | None = None):
+        self.repo = repo or TrafficRepository()
+
+    def rollup(self, batch_size: int = 50_000) -> dict:
+        """Agrega as posicoes novas (id acima da marca d'agua) nos contadores por celula/hora.
+
+        Cada lote e somado aos contadores e avanca a marca d'agua no mesmo commit,
+        entao uma execucao interrompida recomeca de onde parou sem contar duas vezes.
+        """
+        precision = current_app.config["TRAFFIC_CELL_PRECISION"]
+        offset = current_app.config["TRAFFIC_UTC_OFFSET_HOURS"]
+        settled_before = datetime.utcnow() - timedelta(seconds=current_app.config["TRAFFIC_ROLLUP_LAG_SECONDS"])
+        processed = 0
+        touched = set()
+        while True:
+            state = self.repo.lock_rollup(SOURCE)
+            rows = self.repo.positions_after(state.last_id, batch_size, settled_before)
+            if not rows:
+                db.session.commit()
+                break
+            lats = np.fromiter((r[1] for r in rows), np.float64, len(rows))
+            lngs = np.fromiter((r[2] for r in rows), np.float64, len(rows))
+            speeds = np.fromiter((np.nan if r[3] is None else r[3] for r in rows), np.float64, len(rows))
+            hours = np.fromiter(((r[4].hour + offset) % HOURS for r in rows), np.int64, len(rows))
+
+            codes, inverse = np.unique(tracks.geohash_codes(lats, lngs, precision), return_inverse=True)
+            volume = np.zeros((len(codes), HOURS), np.uint32)
+            np.add.at(volume, (inverse, hours), 1)
+            has_speed = ~np.isnan(speeds)
+            speed_sum = np.zeros((len(codes), HOURS), np.float64)
+            np.add.at(speed_sum, (inverse[has_speed], hours[has_speed]), speeds[has_speed])
+            speed_samples = np.zeros((len(codes), HOURS), np.uint32)
+            np.add.at(speed_samples, (inverse[has_speed], hours[has_speed]), 1)
+
+            cells = tracks.geohash_strings(codes, precision)
+            existing = self.repo.get_cells(cells)
+            for i, cell in enumerate(cells):
+                row = existing.get(cell)
+                if row is None:
+                    row = TrafficCell(cell=cell)
+                    self.repo.add_cell(row)
+                    counters = CellCounters.empty()
+                else:
+                    counters = CellCounters.from_row(row)
+                counters.volume += volume[i]
+                counters.speed_sum += speed_sum[i]
+                counters.speed_samples += speed_samples[i]
+                counters.write_to(row)
+
+            state.last_id = rows[-1][0]
+            state.updated_at = datetime.utcnow()
+            db.session.commit()
+            processed += len(rows)
+            touched.update(cells)
+        rescored = self.rescore_routes(touched) if touched else 0
+        return {"positions": processed, "cells": len(touched), "routes": rescored}
+
+    def score_coords(self, coords: Optional[np.ndarray], hour: Optional[int] = None) -> Optional[float]:
+        """Integra o indice de congestionamento ao longo da geometria ([lng, lat]); None sem dados."""
+        if coords is None:
+            return None
+        config = current_app.config
+        precision = config["TRAFFIC_CELL_PRECISION"]
+        lats, lngs, _ = tracks.resample(coords[:, 1], coords[:, 0], config["TRAFFIC_SAMPLE_SPACING_M"])
+        codes, inverse = np.unique(tracks.geohash_codes(lats, lngs, precision), return_inverse=True)
+        cells = tracks.geohash_strings(codes, precision)
+        rows = self.repo.get_cells(cells)
+        if not rows:
+            return None
+        index = np.zeros((len(cells), HOURS))
+        for i, cell in enumerate(cells):
+            if cell in rows:
+                index[i] = CellCounters.from_row(rows[cell]).congestion(config["TRAFFIC_FREE_FLOW_SPEED"])
+        # amostras equiespacadas: a media e a integral normalizada pelo comprimento
+        per_sample = index[inverse]
+        values = per_sample[:, hour] if hour is not None else per_sample.mean(axis=1)
+        return round(float(values.mean()), 3)
+
+    def rescore_routes(self, cells: Iterable[str], batch_size: int = 200) -> int:
+        bounds = _cells_extent(cells)
+        updated = 0
+        last_id = 0
+        while True:
+            batch = self.repo.routes_in_bbox(bounds, after_id=last_id, limit=batch_size)
+            if not batch:
+                return updated
+            rescored = []
+            for route in batch:
+                score = self.score_coords(tracks.coords_array(route.geometry))
+                if score is not None:
+                    route.traffic_score = score
+                    rescored.append(route.id)
+            updated += len(rescored)
+            last_id = batch[-1].id
+            db.session.commit()
+            for route_id in rescored:
+                invalidate_route(route_id)
+
+
+def _cells_extent(cells: Iterable[str]):
+    min_lat, min_lng, max_lat, max_lng = 90.0, 180.0, -90.0, -180.0
+    for cell in cells:
+        lat_lo, lat_hi, lng_lo, lng_hi = geohash_bounds(cell)
+        min_lat, min_lng = min(min_lat, lat_lo), min(min_lng, lng_lo)
+        max_lat, max_lng = max(max_lat, lat_hi), max(max_lng, lng_hi)
+    return min_lat, min_lng, max_lat, max_lng
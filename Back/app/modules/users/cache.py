@@ -0,0 +1,152 @@
+import json
+import logging
+import threading
+from typing import Dict, Iterable, Optional
+
+from ...common.cache import TTLCache
+
+try:  # opcional: pip install redis
+    import redis
+except ImportError:  # pragma: no cover
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+
+def serialize_profile(user) -> dict:
+    return {
+        "id": user.id,
+        "email": user.email,
+        "full_name": user.full_name,
+        "points": user.points,
+        "bio": user.bio,
+        "avatar_url": user.avatar_url,
+    }
+
+
+def author_of(profile: Optional[dict]) -> Optional[dict]:
+    # versao resumida para anexar em listas (feed, shares, incidentes)
+    if not profile:
+        return None
+    return {
+        "id": profile["id"],
+        "full_name": profile["full_name"],
+        "avatar_url": profile["avatar_url"],
+        "points": profile["points"],
+    }
+
+
+class RedisProfileBackend:
+    """Camada compartilhada best-effort: erro de Redis vira miss e o chamador cai no banco."""
+
+    def __init__(self, url: str, ttl: int, prefix: str = "bikesegura:user:"):
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get_many(self, ids) -> Dict[int, dict]:
+        if not ids:
+            return {}
+        try:
+            values = self.client.mget([f"{self.prefix}{i}" for i in ids])
+        except redis.RedisError as err:
+            logger.warning("user cache redis get failed: %s", err)
+            return {}
+        return {i: json.loads(v) for i, v in zip(ids, values) if v is not None}
+
+    def set_many(self, profiles: Dict[int, dict]):
+        if not profiles:
+            return
+        pipe = self.client.pipeline()
+        for user_id, profile in profiles.items():
+            pipe.set(f"{self.prefix}{user_id}", json.dumps(profile), ex=self.ttl)
+        try:
+            pipe.execute()
+        except redis.RedisError as err:
+            logger.warning("user cache redis set failed: %s", err)
+
+    def delete(self, user_id: int):
+        # se falhar, a entrada antiga expira pelo TTL compartilhado
+        try:
+            self.client.delete(f"{self.prefix}{user_id}")
+        except redis.RedisError as err:
+            logger.warning("user cache redis delete of %s failed: %s", user_id, err)
+
+
+class UserProfileCache:
+    """Perfis publicos por id: LRU local com TTL, backend compartilhado opcional (Redis) e banco.
+
+    Cada processo tem seu LRU; com varios workers a invalidacao local so vale no
+    processo que fez a escrita, por isso o TTL local e curto e o Redis (quando
+    configurado) e a fonte compartilhada.
+    """
+
+    def __init__(self, app=None):
+        self.local = TTLCache(maxsize=10_000, ttl=30)
+        self.shared: Optional[RedisProfileBackend] = None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("USER_CACHE_SIZE", 10_000)
+        app.config.setdefault("USER_CACHE_TTL", 30)
+        app.config.setdefault("USER_CACHE_REDIS_URL", None)
+        app.config.setdefault("USER_CACHE_SHARED_TTL", 300)
+        self.local = TTLCache(maxsize=app.config["USER_CACHE_SIZE"], ttl=app.config["USER_CACHE_TTL"])
+        url = app.config["USER_CACHE_REDIS_URL"]
+        if url:
+            if redis is None:
+                raise RuntimeError("USER_CACHE_REDIS_URL requires the redis package")
+            self.shared = RedisProfileBackend(url, ttl=app.config["USER_CACHE_SHARED_TTL"])
+
+    def get(self, user_id: int) -> Optional[dict]:
+        return self.get_many([user_id]).get(int(user_id))
+
+    def get_many(self, ids: Iterable[Optional[int]]) -> Dict[int, dict]:
+        wanted = list(dict.fromkeys(int(i) for i in ids if i is not None))
+        found: Dict[int, dict] = {}
+        missing = []
+        for user_id in wanted:
+            profile = self.local.get(user_id)
+            if profile is None:
+                missing.append(user_id)
+            else:
+                found[user_id] = profile
+        with self._lock:
+            self.hits += len(found)
+        if not missing:
+            return found
+
+        if self.shared is not None:
+            shared = self.shared.get_many(missing)
+            for user_id, profile in shared.items():
+                self.local.set(user_id, profile)
+            found.update(shared)
+            missing = [i for i in missing if i not in shared]
+
+        if missing:
+            with self._lock:
+                self.misses += len(missing)
+            from .models import User
+
+            loaded = {u.id: serialize_profile(u) for u in User.query.filter(User.id.in_(missing)).all()}
+            for user_id, profile in loaded.items():
+                self.local.set(user_id, profile)
+            if self.shared is not None:
+                self.shared.set_many(loaded)
+            found.update(loaded)
+        return found
+
+    def invalidate(self, user_id: int):
+        self.local.delete(int(user_id))
+        if self.shared is not None:
+            self.shared.delete(int(user_id))
+
+    def clear(self):
+        self.local.clear()
+
+
+user_cache = UserProfileCache()
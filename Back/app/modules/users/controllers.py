@@ -1,5 +1,9 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from ...common.auth import admin_required
+from ...common.hashing import HashingBusyError
+from ...extensions import password_hasher
+from .cache import serialize_profile
 from .services import UserService
 
 users_bp = Blueprint("users", __name__)
@@ -19,6 +23,8 @@ def register():
         access, refresh, user = service.register(email, full_name, password)
     except ValueError as err:
         return jsonify({"error": str(err)}), 409
+    except HashingBusyError as err:
+        return _busy(err)
 
     return (
         jsonify({"access_token": access, "refresh_token": refresh, "user": _serialize_user(user)}),
@@ -37,6 +43,8 @@ def login():
         access, refresh, user = service.login(email, password)
     except PermissionError as err:
         return jsonify({"error": str(err)}), 401
+    except HashingBusyError as err:
+        return _busy(err)
     return jsonify({"access_token": access, "refresh_token": refresh, "user": _serialize_user(user)})
 
 
@@ -44,18 +52,24 @@ def login():
 @jwt_required()
 def me():
     user_id = get_jwt_identity()
-    user = service.get_me(user_id)
-    if not user:
+    profile = service.get_profile(user_id)
+    if not profile:
         return jsonify({"error": "user not found"}), 404
-    return jsonify(_serialize_user(user))
+    return jsonify(profile)
+
+
+@users_bp.get("/hashing/stats")
+@admin_required
+def hashing_stats():
+    return jsonify(password_hasher.stats())
 
 
 @users_bp.get("/<int:user_id>")
 def public_profile(user_id: int):
-    user = service.get_me(user_id)
-    if not user:
+    profile = service.get_profile(user_id)
+    if not profile:
         return jsonify({"error": "user not found"}), 404
-    return jsonify(_serialize_user(user))
+    return jsonify(profile)
 
 
 @users_bp.patch("/me")
@@ -70,12 +84,11 @@ def update_profile():
     return jsonify(_serialize_user(user))
 
 
+def _busy(err):
+    response = jsonify({"error": str(err)})
+    response.headers["Retry-After"] = "1"
+    return response, 503
+
+
 def _serialize_user(user):
-    return {
-        "id": user.id,
-        "email": user.email,
-        "full_name": user.full_name,
-        "points": user.points,
-        "bio": user.bio,
-        "avatar_url": user.avatar_url,
-    }
+    return serialize_profile(user)
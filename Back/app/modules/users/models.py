@@ -1,6 +1,5 @@
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
-from ...extensions import db
+from ...extensions import db, password_hasher
 
 
 class User(db.Model):
@@ -11,12 +10,16 @@ class User(db.Model):
     full_name = db.Column(db.String(255), nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
     points = db.Column(db.Integer, default=0)
+    followers_count = db.Column(db.Integer, default=0)
     bio = db.Column(db.Text, nullable=True)
     avatar_url = db.Column(db.String(500), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     def set_password(self, password: str):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password: str) -> bool:
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
+
+    def password_needs_rehash(self) -> bool:
+        return password_hasher.needs_rehash(self.password_hash)
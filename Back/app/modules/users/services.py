@@ -2,6 +2,7 @@ from typing import Optional, Tuple
 from flask_jwt_extended import create_access_token, create_refresh_token
 from .repositories import UserRepository
 from .models import User
+from .cache import user_cache
 
 
 class UserService:
@@ -18,11 +19,23 @@ class UserService:
         user = self.repo.get_by_email(email)
         if not user or not user.check_password(password):
             raise PermissionError("invalid credentials")
+        if user.password_needs_rehash():
+            # algoritmo/custo mudou na config: regrava o hash com a senha em claro que acabou de ser validada
+            user.set_password(password)
+            from ...extensions import db
+
+            db.session.commit()
         return self._issue_tokens(user)
 
     def get_me(self, user_id: int) -> Optional[User]:
         return self.repo.get_by_id(user_id)
 
+    def get_profile(self, user_id: int) -> Optional[dict]:
+        return user_cache.get(user_id)
+
+    def get_profiles(self, user_ids) -> dict:
+        return user_cache.get_many(user_ids)
+
     def update_profile(self, user_id: int, payload: dict) -> User:
         user = self.repo.get_by_id(user_id)
         if not user:
@@ -36,6 +49,7 @@ class UserService:
         from ...extensions import db
 
         db.session.commit()
+        user_cache.invalidate(user.id)
         return user
 
     def _issue_tokens(self, user: User) -> Tuple[str, str, User]:
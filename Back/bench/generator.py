@@ -0,0 +1,313 @@
+"""Gera um dataset sintetico e deterministico (mesma seed = mesmos dados) para benchmarks.
+
+    DATABASE_URL=sqlite:////tmp/bench.db python -m bench.generator --scale 1.0 --seed 42
+
+Com `--scale 1` sao ~2M incidentes, 100k rotas com geometria, 20k usuarios e
+100k rotas salvas; use `--scale 0.05` para um dataset rapido de desenvolvimento.
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app import create_app
+from app.common import tracks
+from app.extensions import db
+from app.modules import load_models
+
+# centro de Sao Paulo; os pontos caem num raio de ~25 km
+CENTER_LAT, CENTER_LNG = -23.5505, -46.6333
+SPREAD_DEG = 0.22
+BATCH = 20_000
+
+BASE_SIZES = {
+    "users": 20_000,
+    "incidents": 2_000_000,
+    "routes": 100_000,
+    "saved_routes": 100_000,
+    "route_shares": 20_000,
+    "sos_alerts": 200_000,
+    "support_points": 20_000,
+    "feed_posts": 200_000,
+    "route_events": 2_000,
+}
+
+SEVERITIES = np.array(["info", "warning", "danger"])
+INCIDENT_TYPES = np.array(["buraco", "roubo", "infraestrutura", "alagamento", "transito"])
+SOS_TYPES = np.array(["pneu", "saude", "acidente"])
+SOS_STATUS = np.array(["open", "ack", "resolved"])
+SUPPORT_TYPES = np.array(["oficina", "agua", "loja", "bicicletario"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    sizes = {name: max(1, int(count * args.scale)) for name, count in BASE_SIZES.items()}
+    app = create_app()
+    with app.app_context():
+        load_models()
+        db.create_all()
+        Generator(np.random.default_rng(args.seed), sizes).run()
+
+
+class Generator:
+    def __init__(self, rng: np.random.Generator, sizes: dict):
+        self.rng = rng
+        self.sizes = sizes
+        self.now = datetime(2026, 10, 1)
+
+    def run(self):
+        from app.modules.users.models import User
+
+        # ordem respeita as FKs: usuarios e rotas antes de saves/shares
+        for name in (
+            "users",
+            "route_events",
+            "incidents",
+            "sos_alerts",
+            "support_points",
+            "feed_posts",
+            "routes",
+            "route_index",
+            "saved_routes",
+            "route_shares",
+        ):
+            started = time.monotonic()
+            getattr(self, f"_{name}")()
+            print(f"{name}: {self.sizes.get(name, '-')} rows in {time.monotonic() - started:.1f}s", flush=True)
+        print(f"done: {User.query.count()} users")
+
+    # -- helpers -------------------------------------------------------------
+
+    def _points(self, n: int):
+        lats = CENTER_LAT + self.rng.normal(0, SPREAD_DEG / 2, n)
+        lngs = CENTER_LNG + self.rng.normal(0, SPREAD_DEG / 2, n)
+        return lats.round(6), lngs.round(6)
+
+    def _timestamps(self, n: int, days: int = 365):
+        seconds = np.sort(self.rng.integers(0, days * 86400, n))
+        start = self.now - timedelta(days=days)
+        return [start + timedelta(seconds=int(s)) for s in seconds]
+
+    def _user_refs(self, n: int, nullable: float = 0.0):
+        ids = self.rng.integers(1, self.sizes["users"] + 1, n)
+        if nullable:
+            return [None if missing else int(i) for i, missing in zip(ids, self.rng.random(n) < nullable)]
+        return [int(i) for i in ids]
+
+    def _insert(self, model, rows):
+        for start in range(0, len(rows), BATCH):
+            db.session.execute(db.insert(model), rows[start:start + BATCH])
+            db.session.commit()
+
+    def _insert_columns(self, model, n: int, columns: dict):
+        """Insere em lotes a partir de colunas (listas/arrays de tamanho n)."""
+        names = list(columns)
+        for start in range(0, n, BATCH):
+            end = min(n, start + BATCH)
+            slices = [columns[name][start:end] for name in names]
+            rows = [dict(zip(names, values)) for values in zip(*slices)]
+            db.session.execute(db.insert(model), rows)
+            db.session.commit()
+
+    # -- tabelas -------------------------------------------------------------
+
+    def _users(self):
+        from app.modules.users.models import User
+
+        n = self.sizes["users"]
+        template = User(email="template@bench.local", full_name="template")
+        template.set_password("bench")  # um hash so, reaproveitado: hashear 20k senhas levaria minutos
+        self._insert_columns(
+            User,
+            n,
+            {
+                "email": [f"user{i}@bench.local" for i in range(1, n + 1)],
+                "full_name": [f"Ciclista {i}" for i in range(1, n + 1)],
+                "password_hash": [template.password_hash] * n,
+                "points": self.rng.integers(0, 5000, n).tolist(),
+                "followers_count": [0] * n,
+            },
+        )
+
+    def _route_events(self):
+        from app.modules.events.models import RouteEvent
+
+        n = self.sizes["route_events"]
+        lats, lngs = self._points(n)
+        end_lats, end_lngs = self._points(n)
+        self._insert_columns(
+            RouteEvent,
+            n,
+            {
+                "name": [f"Pedal {i}" for i in range(n)],
+                "start_date": self._timestamps(n),
+                "start_lat": lats.tolist(),
+                "start_lng": lngs.tolist(),
+                "end_lat": end_lats.tolist(),
+                "end_lng": end_lngs.tolist(),
+                "status": self.rng.choice(["scheduled", "active", "finished"], n).tolist(),
+                "user_id": self._user_refs(n),
+            },
+        )
+
+    def _incidents(self):
+        from app.modules.incidents.models import Incident
+
+        n = self.sizes["incidents"]
+        lats, lngs = self._points(n)
+        self._insert_columns(
+            Incident,
+            n,
+            {
+                "title": [f"Ocorrencia {i}" for i in range(n)],
+                "latitude": lats.tolist(),
+                "longitude": lngs.tolist(),
+                "severity": self.rng.choice(SEVERITIES, n, p=[0.6, 0.3, 0.1]).tolist(),
+                "type": self.rng.choice(INCIDENT_TYPES, n).tolist(),
+                "created_at": self._timestamps(n),
+                "user_id": self._user_refs(n, nullable=0.2),
+            },
+        )
+
+    def _sos_alerts(self):
+        from app.modules.sos.models import SOSAlert
+
+        n = self.sizes["sos_alerts"]
+        lats, lngs = self._points(n)
+        self._insert_columns(
+            SOSAlert,
+            n,
+            {
+                "latitude": lats.tolist(),
+                "longitude": lngs.tolist(),
+                "status": self.rng.choice(SOS_STATUS, n, p=[0.05, 0.05, 0.9]).tolist(),
+                "type": self.rng.choice(SOS_TYPES, n).tolist(),
+                "message": ["Preciso de ajuda"] * n,
+                "created_at": self._timestamps(n),
+                "user_id": self._user_refs(n),
+            },
+        )
+
+    def _support_points(self):
+        from app.modules.support_points.models import SupportPoint
+
+        n = self.sizes["support_points"]
+        lats, lngs = self._points(n)
+        self._insert_columns(
+            SupportPoint,
+            n,
+            {
+                "name": [f"Ponto {i}" for i in range(n)],
+                "type": self.rng.choice(SUPPORT_TYPES, n).tolist(),
+                "latitude": lats.tolist(),
+                "longitude": lngs.tolist(),
+                "external_id": [f"bench:{i}" for i in range(n)],
+            },
+        )
+
+    def _feed_posts(self):
+        from app.common.geo import geohash_encode
+        from app.modules.feed.models import FeedPost
+
+        n = self.sizes["feed_posts"]
+        lats, lngs = self._points(n)
+        self._insert_columns(
+            FeedPost,
+            n,
+            {
+                "content": [f"Pedal de hoje #{i}" for i in range(n)],
+                "created_at": self._timestamps(n, days=30),
+                "user_id": self._user_refs(n),
+                "latitude": lats.tolist(),
+                "longitude": lngs.tolist(),
+                "geohash": [geohash_encode(a, b) for a, b in zip(lats, lngs)],
+            },
+        )
+
+    def _routes(self):
+        from app.modules.routes.models import Route
+
+        n = self.sizes["routes"]
+        starts_lat, starts_lng = self._points(n)
+        created = self._timestamps(n)
+        users = self._user_refs(n, nullable=0.3)
+        rows = []
+        for i in range(n):
+            rows.append(self._route_row(float(starts_lat[i]), float(starts_lng[i]), created[i], users[i], i))
+            if len(rows) == BATCH:
+                self._insert(Route, rows)
+                rows = []
+        self._insert(Route, rows)
+
+    def _route_index(self):
+        # trechos espaciais e assinaturas LSH, pelo mesmo caminho do backfill
+        from app.modules.routes.services import RouteService
+
+        service = RouteService()
+        service.backfill_segments(batch_size=2000)
+        service.backfill_signatures(batch_size=2000)
+
+    def _route_row(self, lat: float, lng: float, created_at, user_id, i: int) -> dict:
+        # passeio aleatorio com direcao persistente: parece uma rota de verdade
+        points = int(self.rng.integers(20, 400))
+        heading = self.rng.uniform(0, 2 * np.pi) + np.cumsum(self.rng.normal(0, 0.25, points))
+        step = self.rng.uniform(0.0002, 0.0008, points)
+        lats = lat + np.concatenate(([0.0], np.cumsum(step * np.cos(heading))[:-1]))
+        lngs = lng + np.concatenate(([0.0], np.cumsum(step * np.sin(heading))[:-1]))
+        distance_m = float(tracks.segment_lengths_m(lats, lngs).sum())
+        min_lat, min_lng, max_lat, max_lng = tracks.bbox(lats, lngs)
+        return {
+            "name": f"Rota {i}",
+            "start_lat": float(lats[0]),
+            "start_lng": float(lngs[0]),
+            "end_lat": float(lats[-1]),
+            "end_lng": float(lngs[-1]),
+            "distance_km": round(distance_m / 1000, 3),
+            "duration_seconds": int(distance_m / 4.5),
+            "geometry": np.column_stack((lngs, lats)).round(6).tolist(),
+            "created_at": created_at,
+            "user_id": user_id,
+            "traffic_score": round(float(self.rng.gamma(2.0, 1.5)), 3),
+            "elevation_gain": round(float(self.rng.gamma(2.0, 40.0)), 1),
+            "bbox_min_lat": min_lat,
+            "bbox_min_lng": min_lng,
+            "bbox_max_lat": max_lat,
+            "bbox_max_lng": max_lng,
+        }
+
+    def _saved_routes(self):
+        from app.modules.routes.models import SavedRoute
+
+        n = self.sizes["saved_routes"]
+        # o usuario 1 (usado pelos endpoints de dev) sempre tem algumas rotas salvas
+        users = np.concatenate(([1] * min(n, 50), self.rng.integers(1, self.sizes["users"] + 1, max(0, n - 50))))
+        routes = self.rng.integers(1, self.sizes["routes"] + 1, n)
+        self._insert_columns(
+            SavedRoute,
+            n,
+            {"user_id": users.tolist(), "route_id": routes.tolist(), "created_at": self._timestamps(n)},
+        )
+
+    def _route_shares(self):
+        from app.modules.routes.models import RouteShare
+
+        n = self.sizes["route_shares"]
+        self._insert_columns(
+            RouteShare,
+            n,
+            {
+                "route_id": self.rng.integers(1, self.sizes["routes"] + 1, n).tolist(),
+                "user_id": self._user_refs(n),
+                "note": ["Recomendo"] * n,
+                "created_at": self._timestamps(n),
+            },
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Roda cenarios de carga e compara com a baseline.
+
+    DATABASE_URL=sqlite:////tmp/bench.db python -m bench.run                 # todos, em processo
+    python -m bench.run --scenario routes_rank --requests 2000 --concurrency 16
+    python -m bench.run --url http://localhost:8000                          # contra um servidor rodando
+    python -m bench.run --update-baseline                                    # grava a baseline
+
+Sai com codigo 1 se algum cenario regredir alem de `--tolerance` (p95 maior ou
+throughput menor) em relacao a `bench/baseline.json`.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import numpy as np
+
+from .scenarios import SCENARIOS, Scenario
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+class InProcessClient:
+    """Flask test client por thread: mede a app sem rede nem servidor."""
+
+    def __init__(self):
+        from app import create_app
+        from app.extensions import response_cache
+
+        self.app = create_app()
+        self.response_cache = response_cache
+        self._local = threading.local()
+
+    def request(self, scenario: Scenario, path: str, body) -> int:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        if scenario.cache == "cold":
+            self.response_cache.clear()
+        response = client.open(path, method=scenario.method, json=body)
+        response.close()
+        return response.status_code
+
+
+class HttpClient:
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+
+    def request(self, scenario: Scenario, path: str, body) -> int:
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=scenario.method)
+        if data is not None:
+            req.add_header("Content-Type", "application/json")
+        try:
+            with urllib.request.urlopen(req, timeout=30) as resp:
+                resp.read()
+                return resp.status
+        except urllib.error.HTTPError as err:
+            return err.code
+
+
+def run_scenario(client, scenario: Scenario, requests: int, concurrency: int, warmup: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    calls = [(scenario.path(rng), scenario.body(rng) if scenario.body else None) for _ in range(warmup + requests)]
+    for path, body in calls[:warmup]:
+        client.request(scenario, path, body)
+
+    latencies = np.zeros(requests)
+    errors = 0
+    lock = threading.Lock()
+
+    def one(i: int):
+        nonlocal errors
+        path, body = calls[warmup + i]
+        started = time.perf_counter()
+        status = client.request(scenario, path, body)
+        latencies[i] = time.perf_counter() - started
+        if status >= 400:
+            with lock:
+                errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - started
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "throughput_rps": round(requests / elapsed, 1),
+        "errors": errors,
+    }
+
+
+def compare(name: str, result: dict, baseline: dict, tolerance: float) -> List[str]:
+    base = baseline.get("scenarios", {}).get(name)
+    if not base:
+        return []
+    problems = []
+    if result["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+        problems.append(f"p95 {result['p95_ms']}ms > baseline {base['p95_ms']}ms")
+    if result["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+        problems.append(f"throughput {result['throughput_rps']} rps < baseline {base['throughput_rps']} rps")
+    if result["errors"] and not base.get("errors"):
+        problems.append(f"{result['errors']} errors")
+    return problems
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="Repetivel; padrao: todos.")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--url", help="Base URL de um servidor rodando (padrao: app em processo).")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Folga relativa antes de acusar regressao.")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--include-writes", action="store_true", help="Inclui cenarios que escrevem no banco.")
+    args = parser.parse_args(argv)
+
+    names = args.scenario or [n for n, s in SCENARIOS.items() if args.include_writes or "write" not in s.tags]
+    client = HttpClient(args.url) if args.url else InProcessClient()
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+
+    results, failures = {}, {}
+    print(f"{'scenario':<24}{'p50':>9}{'p95':>9}{'p99':>9}{'rps':>9}{'err':>6}")
+    for name in names:
+        result = run_scenario(client, SCENARIOS[name], args.requests, args.concurrency, args.warmup, args.seed)
+        results[name] = result
+        problems = compare(name, result, baseline, args.tolerance)
+        if problems:
+            failures[name] = problems
+        flag = "  REGRESSION: " + "; ".join(problems) if problems else ""
+        print(
+            f"{name:<24}{result['p50_ms']:>9}{result['p95_ms']:>9}{result['p99_ms']:>9}"
+            f"{result['throughput_rps']:>9}{result['errors']:>6}{flag}",
+            flush=True,
+        )
+
+    if args.update_baseline:
+        baseline.setdefault("scenarios", {}).update(results)
+        with open(args.baseline, "w") as fh:
+            json.dump(baseline, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Cenarios de carga: um endpoint quente cada, com parametros sorteados de forma reprodutivel."""
+import random
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: Callable[[random.Random], str]
+    body: Optional[Callable[[random.Random], dict]] = None
+    # "cold" limpa o cache de respostas antes de cada request (somente no modo em processo)
+    cache: str = "warm"
+    description: str = ""
+    tags: list = field(default_factory=list)
+
+
+def _rank_path(rng: random.Random) -> str:
+    flags = {name: rng.choice("01") for name in ("avoid_incidents", "low_traffic", "low_elevation")}
+    return "/api/v1/routes/rank?" + "&".join(f"{k}={v}" for k, v in flags.items())
+
+
+def _near_path(rng: random.Random) -> str:
+    lat, lng = -23.55 + rng.gauss(0, 0.05), -46.63 + rng.gauss(0, 0.05)
+    return f"/api/v1/routes/near?lat={lat:.5f}&lng={lng:.5f}&radius=300&fields=id,name"
+
+
+def _bbox_path(rng: random.Random) -> str:
+    lat, lng = -23.55 + rng.gauss(0, 0.05), -46.63 + rng.gauss(0, 0.05)
+    return f"/api/v1/routes?bbox={lng - 0.01:.5f},{lat - 0.01:.5f},{lng + 0.01:.5f},{lat + 0.01:.5f}&fields=id,name"
+
+
+def _incident_body(rng: random.Random) -> dict:
+    return {
+        "title": "Buraco (bench)",
+        "latitude": -23.55 + rng.uniform(-0.1, 0.1),
+        "longitude": -46.63 + rng.uniform(-0.1, 0.1),
+        "severity": rng.choice(["info", "warning", "danger"]),
+    }
+
+
+SCENARIOS = {
+    s.name: s
+    for s in [
+        Scenario("routes_rank", "GET", _rank_path, description="ranking com flags aleatorias"),
+        Scenario(
+            "routes_rank_fields",
+            "GET",
+            lambda rng: _rank_path(rng) + "&fields=id,name,distance_km",
+            description="ranking com projecao de colunas",
+        ),
+        Scenario("routes_near", "GET", _near_path, description="rotas que passam a ate 300 m de um ponto"),
+        Scenario("routes_bbox", "GET", _bbox_path, description="rotas que cruzam um viewport de ~2 km"),
+        Scenario("map_summary", "GET", lambda rng: "/bff/v1/map/summary", description="snapshot do mapa (cache quente)"),
+        Scenario(
+            "map_summary_cold",
+            "GET",
+            lambda rng: "/bff/v1/map/summary",
+            cache="cold",
+            description="snapshot do mapa sem cache",
+        ),
+        Scenario("incidents_list", "GET", lambda rng: "/api/v1/incidents", description="listagem de incidentes"),
+        Scenario(
+            "incidents_list_fields",
+            "GET",
+            lambda rng: "/api/v1/incidents?fields=id,latitude,longitude,severity",
+            description="listagem com projecao de colunas",
+        ),
+        Scenario("incidents_create", "POST", lambda rng: "/api/v1/incidents", body=_incident_body, tags=["write"]),
+    ]
+}
@@ -0,0 +1,103 @@
+"""Mede o cold start (import + create_app + primeiro request) e o custo de import por modulo.
+
+    python -m bench.startup                      # app como sobe num worker (LAZY_BLUEPRINTS=1)
+    python -m bench.startup --eager              # LAZY_BLUEPRINTS=0, para comparar
+    python -m bench.startup --cli "db current"   # um comando `flask ...` inteiro
+    python -m bench.startup --runs 7 --top 30
+
+Cada execucao roda num processo novo com `python -X importtime`; os tempos
+mostrados sao a mediana das execucoes. A tabela por pacote soma o tempo
+proprio (self) dos modulos, entao as linhas somam o total de imports.
+"""
+import argparse
+import json
+import os
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# roda no processo filho: imprime os tempos em JSON na ultima linha do stdout
+SNIPPET = """
+import json, time
+started = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+app = create_app()
+created = time.perf_counter()
+app.test_client().get("/health")
+first = time.perf_counter()
+print(json.dumps({"import": imported - started, "create_app": created - imported, "first_request": first - created}))
+"""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--eager", action="store_true", help="Registra blueprints/models no create_app.")
+    parser.add_argument("--cli", default=None, help='Mede `flask <comando>` (ex.: "db current").')
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ, LAZY_BLUEPRINTS="0" if args.eager else "1")
+    env.setdefault("FLASK_APP", "manage.py")
+    if args.cli:
+        command = [sys.executable, "-X", "importtime", "-m", "flask", *shlex.split(args.cli)]
+    else:
+        command = [sys.executable, "-X", "importtime", "-c", SNIPPET]
+
+    phases: Dict[str, List[float]] = defaultdict(list)
+    modules: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        result = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+        phases["total (processo)"].append(time.perf_counter() - started)
+        if result.returncode != 0:
+            sys.exit(result.stderr[-2000:])
+        if not args.cli:
+            for name, seconds in json.loads(result.stdout.strip().splitlines()[-1]).items():
+                phases[name].append(seconds)
+        for name, own, cumulative in parse_importtime(result.stderr):
+            modules[name].append((own, cumulative))
+
+    print(f"{'fase':<24}{'mediana':>10}")
+    for name, values in phases.items():
+        print(f"{name:<24}{statistics.median(values) * 1000:>8.0f}ms")
+
+    own = {name: statistics.median(v[0] for v in values) for name, values in modules.items()}
+    cumulative = {name: statistics.median(v[1] for v in values) for name, values in modules.items()}
+    by_package: Dict[str, float] = defaultdict(float)
+    for name, value in own.items():
+        by_package[name.split(".")[0]] += value
+
+    print(f"\nimports: {sum(own.values()) / 1000:.0f}ms em {len(own)} modulos")
+    _table("pacote (self somado)", sorted(by_package.items(), key=lambda item: -item[1])[: args.top])
+    app_modules = [(name, value) for name, value in cumulative.items() if name == "app" or name.startswith("app.")]
+    _table("modulo da app (cumulativo)", sorted(app_modules, key=lambda item: -item[1])[: args.top])
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """Linhas `import time: self [us] | cumulative | pacote` -> (modulo, self_us, cumulativo_us)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        if own.strip().isdigit():
+            rows.append((name.strip(), int(own), int(cumulative)))
+    return rows
+
+
+def _table(title: str, rows: List[Tuple[str, float]]):
+    print(f"\n{title:<48}{'ms':>8}")
+    for name, value in rows:
+        print(f"{name:<48}{value / 1000:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,13 @@
 import logging
+import re
 from logging.config import fileConfig
 
 from flask import current_app
 
 from alembic import context
 
+from app.modules import load_models
+
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
@@ -38,6 +41,8 @@ def get_engine_url():
 # target_metadata = mymodel.Base.metadata
 config.set_main_option('sqlalchemy.url', get_engine_url())
 target_db = current_app.extensions['migrate'].db
+# o create_app adia os models (LAZY_BLUEPRINTS); o autogenerate precisa de todos
+load_models()
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -45,6 +50,16 @@ target_db = current_app.extensions['migrate'].db
 # ... etc.
 
 
+# particoes mensais criadas por `flask partitions maintain` nao estao nos models
+PARTITION_TABLE = re.compile(r'^(incidents|sos_alerts)_(p\d{4}_\d{2}|default)$')
+
+
+def include_name(name, type_, parent_names):
+    if type_ == 'table':
+        return not PARTITION_TABLE.match(name)
+    return True
+
+
 def get_metadata():
     if hasattr(target_db, 'metadatas'):
         return target_db.metadatas[None]
@@ -93,6 +108,7 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_name", include_name)
 
     connectable = get_engine()
 
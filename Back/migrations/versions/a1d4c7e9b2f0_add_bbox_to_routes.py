@@ -0,0 +1,32 @@
+"""Add bbox to routes
+
+Revision ID: a1d4c7e9b2f0
+Revises: f3a9c5d1e6b8
+Create Date: 2026-10-19 14:32:10.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1d4c7e9b2f0'
+down_revision = 'f3a9c5d1e6b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('routes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('bbox_min_lat', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('bbox_min_lng', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('bbox_max_lat', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('bbox_max_lng', sa.Float(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('routes', schema=None) as batch_op:
+        batch_op.drop_column('bbox_max_lng')
+        batch_op.drop_column('bbox_max_lat')
+        batch_op.drop_column('bbox_min_lng')
+        batch_op.drop_column('bbox_min_lat')
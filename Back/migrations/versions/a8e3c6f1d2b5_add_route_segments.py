@@ -0,0 +1,42 @@
+"""Add route segments spatial index
+
+Revision ID: a8e3c6f1d2b5
+Revises: f7b2d4e9a1c6
+Create Date: 2026-10-19 19:02:44.108215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8e3c6f1d2b5'
+down_revision = 'f7b2d4e9a1c6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('route_segments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('route_id', sa.Integer(), nullable=False),
+    sa.Column('geohash', sa.String(length=12), nullable=False),
+    sa.Column('min_lat', sa.Float(), nullable=False),
+    sa.Column('min_lng', sa.Float(), nullable=False),
+    sa.Column('max_lat', sa.Float(), nullable=False),
+    sa.Column('max_lng', sa.Float(), nullable=False),
+    sa.Column('points', sa.LargeBinary(), nullable=False),
+    sa.ForeignKeyConstraint(['route_id'], ['routes.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('route_segments', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_route_segments_geohash'), ['geohash'], unique=False)
+        batch_op.create_index(batch_op.f('ix_route_segments_route_id'), ['route_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('route_segments', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_route_segments_route_id'))
+        batch_op.drop_index(batch_op.f('ix_route_segments_geohash'))
+
+    op.drop_table('route_segments')
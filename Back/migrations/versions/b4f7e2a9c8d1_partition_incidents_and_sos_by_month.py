@@ -0,0 +1,99 @@
+"""Partition incidents and sos_alerts by month
+
+Revision ID: b4f7e2a9c8d1
+Revises: a8e3c6f1d2b5
+Create Date: 2026-10-19 19:48:12.570931
+
+No Postgres as tabelas viram particionadas por RANGE (created_at), com uma
+particao por mes desde o registro mais antigo ate 3 meses a frente, mais uma
+particao default. Os dados sao copiados da tabela antiga numa transacao so:
+em bases grandes rode numa janela de manutencao. No SQLite (dev/bench) so
+created_at passa a ser NOT NULL.
+
+"""
+from datetime import date, datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4f7e2a9c8d1'
+down_revision = 'a8e3c6f1d2b5'
+branch_labels = None
+depends_on = None
+
+TABLES = ('incidents', 'sos_alerts')
+MONTHS_AHEAD = 3
+
+
+def _add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade():
+    bind = op.get_bind()
+    for table in TABLES:
+        op.execute(f"UPDATE {table} SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+    if bind.dialect.name != 'postgresql':
+        for table in TABLES:
+            with op.batch_alter_table(table, schema=None) as batch_op:
+                batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=False)
+        return
+
+    today = datetime.utcnow().date()
+    for table in TABLES:
+        old = f'{table}_unpartitioned'
+        op.execute(f'ALTER TABLE {table} RENAME TO {old}')
+        op.execute(f'ALTER TABLE {old} RENAME CONSTRAINT {table}_pkey TO {old}_pkey')
+        op.execute(f'ALTER INDEX ix_{table}_created_at RENAME TO ix_{old}_created_at')
+
+        op.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)')
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN created_at SET NOT NULL')
+        # a PK de uma tabela particionada precisa conter a chave de particao
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id, created_at)')
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_user_id_fkey FOREIGN KEY (user_id) REFERENCES users (id)')
+        op.execute(f'CREATE INDEX ix_{table}_created_at ON {table} (created_at)')
+        op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+
+        oldest = bind.execute(sa.text(f'SELECT min(created_at) FROM {old}')).scalar()
+        month = date((oldest or today).year, (oldest or today).month, 1)
+        last = _add_months(date(today.year, today.month, 1), MONTHS_AHEAD)
+        while month <= last:
+            end = _add_months(month, 1)
+            op.execute(
+                f"CREATE TABLE {table}_p{month.year:04d}_{month.month:02d} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+            )
+            month = end
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+        op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+        op.execute(f'DROP TABLE {old}')
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        for table in TABLES:
+            with op.batch_alter_table(table, schema=None) as batch_op:
+                batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=True)
+        return
+
+    # particoes ja arquivadas (schema archive) nao voltam
+    for table in TABLES:
+        old = f'{table}_partitioned'
+        op.execute(f'ALTER TABLE {table} RENAME TO {old}')
+        op.execute(f'ALTER TABLE {old} RENAME CONSTRAINT {table}_pkey TO {old}_pkey')
+        op.execute(f'ALTER INDEX ix_{table}_created_at RENAME TO ix_{old}_created_at')
+
+        op.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS)')
+        op.execute(f'ALTER TABLE {table} ALTER COLUMN created_at DROP NOT NULL')
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id)')
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_user_id_fkey FOREIGN KEY (user_id) REFERENCES users (id)')
+        op.execute(f'CREATE INDEX ix_{table}_created_at ON {table} (created_at)')
+        op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+
+        op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+        op.execute(f'DROP TABLE {old}')
@@ -0,0 +1,26 @@
+"""Add elevation loss to routes
+
+Revision ID: b6e1f4a8c3d2
+Revises: a1d4c7e9b2f0
+Create Date: 2026-10-19 15:08:41.502316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e1f4a8c3d2'
+down_revision = 'a1d4c7e9b2f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('routes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('elevation_loss', sa.Float(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('routes', schema=None) as batch_op:
+        batch_op.drop_column('elevation_loss')
@@ -0,0 +1,38 @@
+"""Add traffic cells and rollup watermark
+
+Revision ID: c2f8a6d4e1b7
+Revises: b6e1f4a8c3d2
+Create Date: 2026-10-19 15:47:22.931054
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2f8a6d4e1b7'
+down_revision = 'b6e1f4a8c3d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('traffic_cells',
+    sa.Column('cell', sa.String(length=12), nullable=False),
+    sa.Column('volume', sa.LargeBinary(), nullable=False),
+    sa.Column('speed_sum', sa.LargeBinary(), nullable=False),
+    sa.Column('speed_samples', sa.LargeBinary(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('cell')
+    )
+    op.create_table('traffic_rollups',
+    sa.Column('source', sa.String(length=50), nullable=False),
+    sa.Column('last_id', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('source')
+    )
+
+
+def downgrade():
+    op.drop_table('traffic_rollups')
+    op.drop_table('traffic_cells')
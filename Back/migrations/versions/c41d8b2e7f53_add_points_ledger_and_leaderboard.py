@@ -0,0 +1,66 @@
+"""Add points ledger and leaderboard scores
+
+Revision ID: c41d8b2e7f53
+Revises: a7c3e91f0b12
+Create Date: 2026-10-19 10:03:12.554901
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41d8b2e7f53'
+down_revision = 'a7c3e91f0b12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('points_ledger',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Integer(), nullable=False),
+    sa.Column('reason', sa.String(length=100), nullable=False),
+    sa.Column('event_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['event_id'], ['route_events.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('points_ledger', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_points_ledger_user_id'), ['user_id'], unique=False)
+
+    op.create_table('leaderboard_scores',
+    sa.Column('board', sa.String(length=50), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('board', 'user_id')
+    )
+    with op.batch_alter_table('leaderboard_scores', schema=None) as batch_op:
+        batch_op.create_index('ix_leaderboard_scores_board_score', ['board', 'score'], unique=False)
+
+    # pontos existentes viram o saldo inicial do ledger e do placar global
+    op.execute(
+        "INSERT INTO points_ledger (user_id, amount, reason, created_at) "
+        "SELECT id, points, 'migration.opening_balance', CURRENT_TIMESTAMP FROM users "
+        "WHERE points IS NOT NULL AND points <> 0"
+    )
+    op.execute(
+        "INSERT INTO leaderboard_scores (board, user_id, score, updated_at) "
+        "SELECT 'global', id, points, CURRENT_TIMESTAMP FROM users "
+        "WHERE points IS NOT NULL AND points <> 0"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('leaderboard_scores', schema=None) as batch_op:
+        batch_op.drop_index('ix_leaderboard_scores_board_score')
+
+    op.drop_table('leaderboard_scores')
+    with op.batch_alter_table('points_ledger', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_points_ledger_user_id'))
+
+    op.drop_table('points_ledger')
@@ -0,0 +1,40 @@
+"""Add incident and sos rollups
+
+Revision ID: c6d1a9f4e2b7
+Revises: b4f7e2a9c8d1
+Create Date: 2026-10-19 20:31:05.441873
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6d1a9f4e2b7'
+down_revision = 'b4f7e2a9c8d1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('incident_rollups',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('cell', sa.String(length=12), nullable=False),
+    sa.Column('type', sa.String(length=50), nullable=False),
+    sa.Column('severity', sa.String(length=50), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'cell', 'type', 'severity')
+    )
+    op.create_table('sos_rollups',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('cell', sa.String(length=12), nullable=False),
+    sa.Column('type', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('day', 'cell', 'type', 'status')
+    )
+
+
+def downgrade():
+    op.drop_table('sos_rollups')
+    op.drop_table('incident_rollups')
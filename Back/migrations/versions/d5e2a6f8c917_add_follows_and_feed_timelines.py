@@ -0,0 +1,58 @@
+"""Add follows and feed timelines
+
+Revision ID: d5e2a6f8c917
+Revises: c41d8b2e7f53
+Create Date: 2026-10-19 11:20:05.903417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5e2a6f8c917'
+down_revision = 'c41d8b2e7f53'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('follows',
+    sa.Column('follower_id', sa.Integer(), nullable=False),
+    sa.Column('followee_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['followee_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['follower_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('follower_id', 'followee_id')
+    )
+    with op.batch_alter_table('follows', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_follows_followee_id'), ['followee_id'], unique=False)
+
+    op.create_table('feed_timelines',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['post_id'], ['feed_posts.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'post_id')
+    )
+    with op.batch_alter_table('feed_posts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_feed_posts_created_at'), ['created_at'], unique=False)
+        batch_op.create_index('ix_feed_posts_user_id_id', ['user_id', 'id'], unique=False)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('followers_count', sa.Integer(), nullable=True, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('followers_count')
+
+    with op.batch_alter_table('feed_posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_feed_posts_user_id_id')
+        batch_op.drop_index(batch_op.f('ix_feed_posts_created_at'))
+
+    op.drop_table('feed_timelines')
+    with op.batch_alter_table('follows', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_follows_followee_id'))
+
+    op.drop_table('follows')
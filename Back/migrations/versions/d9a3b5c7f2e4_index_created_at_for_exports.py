@@ -0,0 +1,44 @@
+"""Index created_at for incremental exports
+
+Revision ID: d9a3b5c7f2e4
+Revises: e2b9d7c4a1f6
+Create Date: 2026-10-19 16:21:05.774310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9a3b5c7f2e4'
+down_revision = 'e2b9d7c4a1f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('incidents', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_incidents_created_at'), ['created_at'], unique=False)
+
+    with op.batch_alter_table('routes', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_routes_created_at'), ['created_at'], unique=False)
+
+    with op.batch_alter_table('sos_alerts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_sos_alerts_created_at'), ['created_at'], unique=False)
+
+    with op.batch_alter_table('support_points', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_support_points_created_at'), ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('support_points', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_support_points_created_at'))
+
+    with op.batch_alter_table('sos_alerts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_sos_alerts_created_at'))
+
+    with op.batch_alter_table('routes', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_routes_created_at'))
+
+    with op.batch_alter_table('incidents', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_incidents_created_at'))
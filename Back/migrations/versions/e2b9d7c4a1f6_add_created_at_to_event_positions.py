@@ -0,0 +1,27 @@
+"""Add created_at to event positions
+
+Revision ID: e2b9d7c4a1f6
+Revises: c2f8a6d4e1b7
+Create Date: 2026-10-19 23:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b9d7c4a1f6'
+down_revision = 'c2f8a6d4e1b7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # linhas antigas ganham a hora da migracao: ja estao bem mais velhas que o lag do rollup
+    with op.batch_alter_table('event_positions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('event_positions', schema=None) as batch_op:
+        batch_op.drop_column('created_at')
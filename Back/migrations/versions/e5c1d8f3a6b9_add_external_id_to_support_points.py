@@ -0,0 +1,28 @@
+"""Add external id to support points
+
+Revision ID: e5c1d8f3a6b9
+Revises: d9a3b5c7f2e4
+Create Date: 2026-10-19 16:58:37.204881
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5c1d8f3a6b9'
+down_revision = 'd9a3b5c7f2e4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('support_points', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('external_id', sa.String(length=64), nullable=True))
+        batch_op.create_unique_constraint('uq_support_points_external_id', ['external_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('support_points', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_support_points_external_id', type_='unique')
+        batch_op.drop_column('external_id')
@@ -0,0 +1,32 @@
+"""Add location to feed posts
+
+Revision ID: e8b7f0c3a214
+Revises: d5e2a6f8c917
+Create Date: 2026-10-19 12:41:33.270168
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8b7f0c3a214'
+down_revision = 'd5e2a6f8c917'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('feed_posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('latitude', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('longitude', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('geohash', sa.String(length=12), nullable=True))
+        batch_op.create_index('ix_feed_posts_geohash', ['geohash'], unique=False, postgresql_ops={'geohash': 'varchar_pattern_ops'})
+
+
+def downgrade():
+    with op.batch_alter_table('feed_posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_feed_posts_geohash')
+        batch_op.drop_column('geohash')
+        batch_op.drop_column('longitude')
+        batch_op.drop_column('latitude')
@@ -0,0 +1,42 @@
+"""Add event participants
+
+Revision ID: f1c8e3a7d5b2
+Revises: c6d1a9f4e2b7
+Create Date: 2026-10-19 23:12:40.518362
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c8e3a7d5b2'
+down_revision = 'c6d1a9f4e2b7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('event_participants',
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('joined_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['event_id'], ['route_events.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('event_id', 'user_id')
+    )
+    with op.batch_alter_table('event_participants', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_event_participants_user_id'), ['user_id'], unique=False)
+
+    # quem criou o evento ja participa
+    op.execute(
+        "INSERT INTO event_participants (event_id, user_id, joined_at) "
+        "SELECT id, user_id, created_at FROM route_events WHERE user_id IS NOT NULL"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('event_participants', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_event_participants_user_id'))
+
+    op.drop_table('event_participants')
@@ -0,0 +1,40 @@
+"""Add event positions
+
+Revision ID: f3a9c5d1e6b8
+Revises: e8b7f0c3a214
+Create Date: 2026-10-19 13:55:48.610422
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a9c5d1e6b8'
+down_revision = 'e8b7f0c3a214'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('event_positions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('latitude', sa.Float(), nullable=False),
+    sa.Column('longitude', sa.Float(), nullable=False),
+    sa.Column('speed', sa.Float(), nullable=True),
+    sa.Column('recorded_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['event_id'], ['route_events.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('event_positions', schema=None) as batch_op:
+        batch_op.create_index('ix_event_positions_event_user_recorded', ['event_id', 'user_id', 'recorded_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('event_positions', schema=None) as batch_op:
+        batch_op.drop_index('ix_event_positions_event_user_recorded')
+
+    op.drop_table('event_positions')
@@ -0,0 +1,44 @@
+"""Add route MinHash signatures and LSH buckets
+
+Revision ID: f7b2d4e9a1c6
+Revises: e5c1d8f3a6b9
+Create Date: 2026-10-19 18:21:05.417392
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7b2d4e9a1c6'
+down_revision = 'e5c1d8f3a6b9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('route_lsh_buckets',
+    sa.Column('band', sa.SmallInteger(), nullable=False),
+    sa.Column('bucket', sa.BigInteger(), nullable=False),
+    sa.Column('route_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['route_id'], ['routes.id'], ),
+    sa.PrimaryKeyConstraint('band', 'bucket', 'route_id')
+    )
+    with op.batch_alter_table('route_lsh_buckets', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_route_lsh_buckets_route_id'), ['route_id'], unique=False)
+
+    op.create_table('route_signatures',
+    sa.Column('route_id', sa.Integer(), nullable=False),
+    sa.Column('signature', sa.LargeBinary(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['route_id'], ['routes.id'], ),
+    sa.PrimaryKeyConstraint('route_id')
+    )
+
+
+def downgrade():
+    op.drop_table('route_signatures')
+    with op.batch_alter_table('route_lsh_buckets', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_route_lsh_buckets_route_id'))
+
+    op.drop_table('route_lsh_buckets')
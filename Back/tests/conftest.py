@@ -0,0 +1,42 @@
+import pytest
+
+from app import create_app
+from app.extensions import db, response_cache
+
+
+@pytest.fixture()
+def app(tmp_path):
+    app = create_app(
+        {
+            "TESTING": True,
+            "ADMISSION_ENABLED": False,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}",
+        }
+    )
+    with app.app_context():
+        from app.modules import load_models
+
+        load_models()
+        db.create_all()
+    response_cache.clear()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture()
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture()
+def register(client):
+    """Cria um usuario e devolve os headers com o token dele."""
+
+    def _register(email: str) -> dict:
+        response = client.post("/api/v1/auth/register", json={"email": email, "password": "segredo"})
+        assert response.status_code == 201, response.json
+        return {"Authorization": f"Bearer {response.json['access_token']}"}
+
+    return _register
@@ -0,0 +1,117 @@
+import threading
+import time
+
+import pytest
+
+from app.common.admission import CRITICAL, HIGH, LOW, NORMAL, PriorityLimiter, classify
+from app.extensions import admission
+
+
+@pytest.mark.parametrize(
+    "method, endpoint, expected",
+    [
+        ("POST", "sos.create_sos", CRITICAL),
+        ("POST", "incidents.create_incident", CRITICAL),
+        ("POST", "users.login", HIGH),
+        ("POST", "routes.create_route", HIGH),
+        ("GET", "routes.list_routes", NORMAL),
+        ("GET", "bff.home", LOW),
+        ("GET", "exports.export_dataset", LOW),
+    ],
+)
+def test_classify(method, endpoint, expected):
+    assert classify(method, endpoint) == expected
+
+
+def test_shares_shed_low_first():
+    limiter = PriorityLimiter(10)
+    assert all(limiter.acquire(LOW, 0) for _ in range(5))
+    assert not limiter.acquire(LOW, 0)  # LOW para em 50%
+    assert limiter.acquire(NORMAL, 0) and limiter.acquire(NORMAL, 0)
+    assert not limiter.acquire(NORMAL, 0)  # 75%
+    assert limiter.acquire(HIGH, 0) and limiter.acquire(HIGH, 0)
+    assert not limiter.acquire(HIGH, 0)  # 90%
+    assert limiter.acquire(CRITICAL, 0)  # os ultimos 10% sao do SOS
+    assert not limiter.acquire(CRITICAL, 0)
+    assert limiter.in_flight == 10
+
+
+def _queued(limiter, name, timeout):
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault("ok", limiter.acquire(name, timeout)))
+    thread.start()
+    deadline = time.monotonic() + 2
+    while not limiter._waiting[name] and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return thread, result
+
+
+def test_queue_serves_higher_priority_first():
+    limiter = PriorityLimiter(10)
+    for _ in range(10):
+        limiter.acquire(CRITICAL, 0)
+    normal, normal_result = _queued(limiter, NORMAL, 2)
+    high, high_result = _queued(limiter, HIGH, 2)
+    # com NORMAL na fila, um HIGH novo nao fura a fila nem um NORMAL novo passa na frente
+    assert not limiter.acquire(NORMAL, 0)
+
+    limiter.release()
+    limiter.release()  # 8 em andamento: cabe HIGH (ate 9), nao NORMAL (ate 7)
+    high.join(1)
+    assert high_result == {"ok": True}
+    assert normal.is_alive()
+
+    for _ in range(3):
+        limiter.release()  # 9 - 3 = 6: agora cabe o NORMAL
+    normal.join(1)
+    assert normal_result == {"ok": True}
+    assert limiter.in_flight == 7
+
+
+def test_waiter_times_out():
+    limiter = PriorityLimiter(10)
+    for _ in range(10):
+        limiter.acquire(CRITICAL, 0)
+    started = time.monotonic()
+    assert not limiter.acquire(HIGH, 0.05)
+    assert time.monotonic() - started >= 0.05
+    limiter.release()
+    limiter.release()
+    assert limiter.acquire(HIGH, 0)  # o waiter que desistiu nao ficou na frente nem com o slot
+    assert limiter.in_flight == 9
+
+
+@pytest.fixture()
+def admitted_app(app):
+    app.config.update(ADMISSION_ENABLED=True, ADMISSION_MAX_CONCURRENT=10)
+    admission.init_app(app)
+    return app
+
+
+def test_overload_sheds_low_with_503_but_admits_sos(admitted_app, client):
+    for _ in range(8):
+        admission.limiter.acquire(CRITICAL, 0)
+    try:
+        response = client.get("/api/v1/feed")
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "5"
+        assert admission.shed[LOW] >= 1
+        assert client.post("/api/v1/sos", json={"latitude": -23.55, "longitude": -46.63}).status_code == 201
+        assert client.get("/health").status_code == 200  # fora da admissao
+    finally:
+        for _ in range(8):
+            admission.limiter.release()
+    assert admission.limiter.in_flight == 0
+
+
+def test_streamed_export_releases_slot_before_body(admitted_app, client, register):
+    admitted_app.config["ADMIN_EMAILS"] = "admin@example.com"
+    headers = register("admin@example.com")
+    client.post("/api/v1/incidents", json={"title": "Buraco", "latitude": -23.55, "longitude": -46.63})
+
+    response = client.get("/api/v1/exports/incidents", headers=headers, buffered=False)
+    assert response.status_code == 200
+    assert admission.limiter.in_flight == 0  # corpo ainda nao foi lido
+    assert b"Buraco" in b"".join(response.response)
+    response.close()
+    assert admission.limiter.in_flight == 0
@@ -0,0 +1,39 @@
+import pytest
+
+from app import create_app
+
+
+@pytest.fixture()
+def make_app(tmp_path):
+    def _make(**overrides):
+        config = {"TESTING": True, "ADMISSION_ENABLED": False, "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'test.db'}"}
+        config.update(overrides)
+        return create_app(config)
+
+    return _make
+
+
+def test_metrics_requires_token(make_app):
+    client = make_app(METRICS_TOKEN="s3cret").test_client()
+    client.get("/health")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer errado"}).status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
+    assert 'route="/health"' in response.get_data(as_text=True)
+
+
+def test_metrics_not_exposed_without_token(make_app):
+    assert make_app(METRICS_TOKEN=None).test_client().get("/metrics").status_code == 404
+
+
+def test_profile_header_needs_configured_token(make_app, tmp_path):
+    profiles = tmp_path / "profiles"
+    client = make_app(PROFILE_ENABLED=True, PROFILE_TOKEN=None, PROFILE_DIR=str(profiles)).test_client()
+    assert "X-Profile-Id" not in client.get("/health", headers={"X-Profile": "1"}).headers
+    assert not profiles.exists()
+
+    client = make_app(PROFILE_ENABLED=True, PROFILE_TOKEN="p", PROFILE_DIR=str(profiles)).test_client()
+    assert "X-Profile-Id" not in client.get("/health", headers={"X-Profile": "errado"}).headers
+    response = client.get("/health", headers={"X-Profile": "p"})
+    assert (profiles / response.headers["X-Profile-Id"]).exists()
@@ -0,0 +1,61 @@
+import pytest
+
+from app.common.querybudget import QueryBudgetExceeded, query_budget
+
+SAVED_ROUTES = 6
+
+
+@pytest.fixture()
+def token(client):
+    # usuario 1: /routes/saved ainda usa user_id=1 fixo
+    response = client.post("/api/v1/auth/register", json={"email": "ciclista@example.com", "password": "segredo"})
+    assert response.status_code == 201, response.json
+    token = response.json["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    for i in range(SAVED_ROUTES):
+        geometry = [[-46.63 + i * 0.001 + j * 0.0005, -23.55 + j * 0.0005] for j in range(10)]
+        route = client.post(
+            "/api/v1/routes",
+            json={"name": f"Rota {i}", "start_lat": -23.55, "start_lng": -46.63, "end_lat": -23.54, "end_lng": -46.62, "geometry": geometry},
+            headers=headers,
+        )
+        assert route.status_code == 201, route.json
+        assert client.post(f"/api/v1/routes/{route.json['id']}/save", json={"save": True}, headers=headers).status_code == 200
+        if i % 2:
+            client.post(f"/api/v1/routes/{route.json['id']}/share", json={"note": "boa"}, headers=headers)
+    return token
+
+
+def test_saved_routes_within_budget(client, token):
+    response = client.get("/api/v1/routes/saved")
+    assert response.status_code == 200
+    assert len(response.json) == SAVED_ROUTES
+
+
+def test_bff_home_within_budget(client, token):
+    anonymous = client.get("/bff/v1/home")
+    assert anonymous.status_code == 200
+    logged = client.get("/bff/v1/home", headers={"Authorization": f"Bearer {token}"})
+    assert logged.status_code == 200
+    assert len(logged.json["saved_routes"]) == 5
+
+
+def test_n_plus_one_raises(app, token):
+    from app.modules.routes.models import Route, SavedRoute
+
+    with app.app_context():
+        saved = SavedRoute.query.filter_by(user_id=1).all()
+        with pytest.raises(QueryBudgetExceeded, match="possible N\\+1"):
+            with query_budget(SAVED_ROUTES + 1):
+                for row in saved:
+                    Route.query.filter_by(id=row.route_id).first()
+
+
+def test_over_budget_raises(app, token):
+    from app.modules.routes.models import Route
+
+    with app.app_context():
+        with pytest.raises(QueryBudgetExceeded, match="queries > budget 1"):
+            with query_budget(1, repeated_threshold=None):
+                Route.query.count()
+                Route.query.first()
@@ -0,0 +1,89 @@
+import pytest
+
+from app import create_app
+from app.extensions import db, replicas, response_cache
+
+INCIDENT = {"title": "Buraco", "latitude": -23.55, "longitude": -46.63}
+
+
+@pytest.fixture()
+def make_app(tmp_path):
+    apps = []
+
+    def _make(replica_url=None, **overrides):
+        # primario e replica sao dois SQLite: o que vai so para o primario nao aparece na "replica"
+        config = {
+            "TESTING": True,
+            "ADMISSION_ENABLED": False,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'primary.db'}",
+            "SQLALCHEMY_BINDS": {"replica_0": replica_url or f"sqlite:///{tmp_path / 'replica.db'}"},
+        }
+        config.update(overrides)
+        replicas._state.clear()
+        app = create_app(config)
+        with app.app_context():
+            from app.modules import load_models
+
+            load_models()
+            db.create_all(bind_key=None)
+            if replica_url is None:
+                db.metadata.create_all(db.engines["replica_0"])
+        response_cache.clear()
+        apps.append((app, replica_url is None))
+        return app
+
+    yield _make
+    for app, own_replica in apps:
+        with app.app_context():
+            db.session.remove()
+            db.drop_all(bind_key=None)
+            if own_replica:
+                db.metadata.drop_all(db.engines["replica_0"])
+    replicas._state.clear()
+    db.metadatas.pop("replica_0", None)  # o Flask-SQLAlchemy guarda um MetaData por bind em `db`, global
+
+
+def test_gets_read_from_replica(make_app):
+    app = make_app()
+    writer, reader = app.test_client(), app.test_client()
+    assert writer.post("/api/v1/incidents", json=INCIDENT).status_code == 201
+
+    response = reader.get("/api/v1/incidents")
+    assert response.headers["X-DB-Route"] == "replica_0"
+    assert response.json == []  # a "replica" nao recebeu o incidente
+
+
+def test_writer_is_pinned_to_primary(make_app):
+    app = make_app()
+    writer = app.test_client()
+    response = writer.post("/api/v1/incidents", json=INCIDENT)
+    assert response.headers["X-DB-Route"] == "primary"
+    assert "db_pin=" in response.headers["Set-Cookie"]
+
+    response = writer.get("/api/v1/incidents")
+    assert response.headers["X-DB-Route"] == "primary"
+    assert [i["title"] for i in response.json] == ["Buraco"]
+
+
+def test_failed_write_does_not_pin(make_app):
+    app = make_app()
+    client = app.test_client()
+    assert client.post("/api/v1/incidents", json={}).status_code == 400
+    assert client.get("/api/v1/incidents").headers["X-DB-Route"] == "replica_0"
+
+
+def test_lagging_replica_falls_back_to_primary(make_app):
+    app = make_app(DB_REPLICA_LAG_SQL="SELECT 99")
+    app.test_client().post("/api/v1/incidents", json=INCIDENT)
+    response = app.test_client().get("/api/v1/incidents")
+    assert response.headers["X-DB-Route"] == "primary"
+    assert len(response.json) == 1
+    with app.app_context():
+        assert replicas.status() == [{"replica": "replica_0", "healthy": False, "lag_seconds": 99.0}]
+
+
+def test_unreachable_replica_falls_back_to_primary(make_app, tmp_path):
+    app = make_app(replica_url=f"sqlite:///{tmp_path / 'nao-existe' / 'replica.db'}")
+    response = app.test_client().get("/api/v1/incidents")
+    assert response.status_code == 200
+    assert response.headers["X-DB-Route"] == "primary"
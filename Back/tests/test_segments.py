@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from app.common import tracks
+from app.modules.routes import segments
+
+# ~2 km para leste em Sao Paulo e uma rota longe dali (Rio)
+PAULISTA = [[-46.6600 + i * 0.002, -23.5600] for i in range(11)]
+RIO = [[-43.2100 + i * 0.002, -22.9000] for i in range(11)]
+METERS_PER_DEG_LAT = 111_195.0
+
+
+def test_build_segments_splits_by_length(app):
+    with app.app_context():
+        rows = segments.build_segments(np.array(PAULISTA))
+        length = app.config["ROUTE_SEGMENT_LENGTH_M"]
+    total = float(tracks.segment_lengths_m(np.array(PAULISTA)[:, 1], np.array(PAULISTA)[:, 0]).sum())
+    assert int(total // length) <= len(rows) <= int(np.ceil(total / length))
+    for row in rows:
+        points = np.frombuffer(row["points"], dtype="<f4").reshape(-1, 2).astype(np.float64)
+        assert float(tracks.segment_lengths_m(points[:, 1], points[:, 0]).sum()) <= length + segments.DENSIFY_M
+    assert all(len(row["geohash"]) == segments.SEGMENT_PRECISION for row in rows)
+    for prev, row in zip(rows, rows[1:]):
+        # trechos vizinhos compartilham o ponto de corte
+        assert np.frombuffer(prev["points"], dtype="<f4")[-2:].tolist() == np.frombuffer(row["points"], dtype="<f4")[:2].tolist()
+    assert segments.build_segments(None) == []
+
+
+def test_nearest_by_route(app):
+    with app.app_context():
+        rows = [(1, row["points"]) for row in segments.build_segments(np.array(PAULISTA))]
+        rows += [(2, row["points"]) for row in segments.build_segments(np.array(RIO))]
+    lat = -23.5600 + 100 / METERS_PER_DEG_LAT
+    best = segments.nearest_by_route(lat, -46.6500, rows)
+    assert best[1] == pytest.approx(100, abs=2)
+    assert best[2] > 300_000
+    assert segments.nearest_by_route(lat, -46.65, []) == {}
+
+
+@pytest.fixture()
+def route_ids(client):
+    ids = {}
+    for name, geometry in (("paulista", PAULISTA), ("rio", RIO)):
+        (start_lng, start_lat), (end_lng, end_lat) = geometry[0], geometry[-1]
+        response = client.post(
+            "/api/v1/routes",
+            json={"name": name, "start_lat": start_lat, "start_lng": start_lng, "end_lat": end_lat, "end_lng": end_lng, "geometry": geometry},
+        )
+        assert response.status_code == 201, response.json
+        ids[name] = response.json["id"]
+    return ids
+
+
+def test_routes_near(client, route_ids):
+    lat = -23.5600 + 100 / METERS_PER_DEG_LAT
+    near = client.get(f"/api/v1/routes/near?lat={lat}&lng=-46.6500&radius=300").json
+    assert [r["id"] for r in near] == [route_ids["paulista"]]
+    assert near[0]["distance_m"] == pytest.approx(100, abs=2)
+    assert client.get(f"/api/v1/routes/near?lat={lat}&lng=-46.6500&radius=50").json == []
+
+
+@pytest.mark.parametrize("query", ["lng=-46.65", "lat=nan&lng=-46.65", "lat=-23.5&lng=inf", "lat=95&lng=0"])
+def test_routes_near_rejects_bad_points(client, query):
+    assert client.get(f"/api/v1/routes/near?{query}").status_code == 400
+
+
+def test_bbox_filter(client, route_ids):
+    inside = client.get("/api/v1/routes?bbox=-46.655,-23.565,-46.645,-23.555").json
+    assert [r["id"] for r in inside] == [route_ids["paulista"]]
+    both = client.get("/api/v1/routes?bbox=-47,-24,-43,-22").json
+    assert {r["id"] for r in both} == set(route_ids.values())
+    assert client.get("/api/v1/routes?bbox=-46.0,-23.0,-45.9,-22.9").json == []
+
+
+@pytest.mark.parametrize(
+    "bbox",
+    ["nan,0,1,1", "inf,0,inf,1", "-inf,-90,180,90", "0,-91,1,1", "0,0,181,1", "1,0,0,1", "a,b,c,d", "0,0,1"],
+)
+def test_bbox_rejects_invalid_values(client, bbox):
+    response = client.get(f"/api/v1/routes?bbox={bbox}")
+    assert response.status_code == 400, response.json
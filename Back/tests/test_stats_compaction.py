@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.extensions import db
+from app.modules.incidents.models import Incident
+from app.modules.sos.models import SOSAlert
+from app.modules.stats.services import StatsService
+
+NOW = datetime(2026, 10, 19, 12, 0)
+# dois aglomerados bem dentro/fora do bbox consultado, para a resolucao da celula nao importar
+CENTRO = (-23.5505, -46.6333)
+RIO = (-22.9068, -43.1729)
+BBOX = (-24.0, -47.0, -23.0, -46.0)  # (min_lat, min_lng, max_lat, max_lng)
+
+
+@pytest.fixture()
+def seeded(app):
+    with app.app_context():
+        rows = []
+        for i in range(40):
+            lat, lng = CENTRO if i % 3 else RIO
+            created = NOW - timedelta(days=10 + i * 7, hours=i)
+            rows.append(
+                Incident(
+                    title=f"i{i}",
+                    latitude=lat + (i % 5) * 0.001,
+                    longitude=lng,
+                    severity=("info", "warning", "danger")[i % 3],
+                    type=("buraco", "roubo", None)[i % 3],
+                    created_at=created,
+                )
+            )
+            rows.append(
+                SOSAlert(
+                    latitude=lat,
+                    longitude=lng + (i % 4) * 0.001,
+                    status=("resolved", "resolved", "open")[i % 3],
+                    type=("pneu", "saude")[i % 2],
+                    created_at=created,
+                )
+            )
+        db.session.add_all(rows)
+        db.session.commit()
+    return app
+
+
+@pytest.mark.parametrize("dataset", ["incidents", "sos_alerts"])
+def test_compaction_keeps_summary_totals(seeded, dataset):
+    service = StatsService()
+    queries = [{}, {"bbox": BBOX}, {"since": (NOW - timedelta(days=120)).date(), "until": (NOW - timedelta(days=30)).date()}]
+    with seeded.app_context():
+        before = [service.summary(dataset, **query) for query in queries]
+        assert 0 < before[1]["total"] < before[0]["total"]
+        result = service.compact(dataset, older_than_days=60, batch_size=7, now=NOW)
+        assert result["rows"] > 0
+        assert [service.summary(dataset, **query) for query in queries] == before
+
+        # rodar de novo nao conta nada duas vezes
+        assert service.compact(dataset, older_than_days=60, batch_size=7, now=NOW)["rows"] == 0
+        assert [service.summary(dataset, **query) for query in queries] == before
+
+
+def test_open_sos_is_never_compacted(seeded):
+    with seeded.app_context():
+        open_before = SOSAlert.query.filter_by(status="open").count()
+        StatsService().compact("sos_alerts", older_than_days=0, now=NOW)
+        assert SOSAlert.query.count() == open_before
+
+
+@pytest.mark.parametrize("bbox", ["nan,0,1,1", "inf,0,inf,1", "0,-100,1,1"])
+def test_stats_rejects_invalid_bbox(client, bbox):
+    for path in ("/api/v1/stats/incidents", "/api/v1/stats/sos"):
+        assert client.get(f"{path}?bbox={bbox}").status_code == 400
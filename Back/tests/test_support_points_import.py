@@ -0,0 +1,92 @@
+import io
+import json
+
+import pytest
+
+from app.modules.support_points.importers import classify
+
+
+@pytest.mark.parametrize(
+    "tags, expected",
+    [
+        ({"amenity": "bicycle_repair_station"}, "oficina"),
+        ({"amenity": "drinking_water"}, "agua"),
+        ({"amenity": "fountain", "drinking_water": "yes"}, "agua"),
+        ({"amenity": "fountain"}, None),
+        ({"amenity": "bicycle_parking"}, "bicicletario"),
+        ({"shop": "bicycle"}, "loja"),
+        ({"shop": "bicycle", "service:bicycle:repair": "yes", "service:bicycle:retail": "no"}, "oficina"),
+        ({"highway": "cycleway"}, None),
+    ],
+)
+def test_classify(tags, expected):
+    assert classify(tags) == expected
+
+
+@pytest.fixture()
+def admin(app, register):
+    app.config["ADMIN_EMAILS"] = "admin@example.com"
+    return register("admin@example.com")
+
+
+def _upload(client, headers, document):
+    body = document if isinstance(document, bytes) else json.dumps(document).encode()
+    return client.post(
+        "/api/v1/support-points/import",
+        data={"file": (io.BytesIO(body), "extrato.geojson")},
+        headers=headers,
+        content_type="multipart/form-data",
+    )
+
+
+def _feature(osm_id, tags, geometry):
+    return {"type": "Feature", "id": osm_id, "properties": tags, "geometry": geometry}
+
+
+def test_import_upserts_by_external_id(client, admin):
+    square = [[[-46.63, -23.55], [-46.62, -23.55], [-46.62, -23.54], [-46.63, -23.54]]]
+    document = {
+        "type": "FeatureCollection",
+        "features": [
+            _feature("node/1", {"amenity": "drinking_water", "name": "Bebedouro"}, {"type": "Point", "coordinates": [-46.63, -23.55]}),
+            _feature("way/2", {"amenity": "bicycle_parking"}, {"type": "Polygon", "coordinates": square}),
+            _feature("node/3", {"highway": "cycleway"}, {"type": "Point", "coordinates": [-46.6, -23.5]}),
+        ],
+    }
+    response = _upload(client, admin, document)
+    assert response.status_code == 200, response.json
+    assert response.json == {"imported": 2, "by_type": {"agua": 1, "bicicletario": 1}}
+
+    document["features"][0]["properties"]["name"] = "Bebedouro da praca"
+    assert _upload(client, admin, document).status_code == 200
+    points = client.get("/api/v1/support-points").json
+    assert len(points) == 2
+    by_id = {p["external_id"]: p for p in points}
+    assert by_id["osm:node/1"]["name"] == "Bebedouro da praca"
+    assert by_id["osm:way/2"]["latitude"] == pytest.approx(-23.545)
+
+
+def test_import_skips_degenerate_geometries(client, admin):
+    document = {
+        "type": "FeatureCollection",
+        "features": [
+            _feature("way/1", {"amenity": "bicycle_parking"}, {"type": "Polygon", "coordinates": [[]]}),
+            _feature("way/2", {"amenity": "bicycle_parking"}, {"type": "LineString", "coordinates": [["a", "b"]]}),
+            _feature("node/3", {"amenity": "drinking_water"}, {"type": "Point", "coordinates": [-46.6, 123.0]}),
+            _feature("node/4", {"amenity": "drinking_water"}, None),
+            _feature("node/5", {"amenity": "drinking_water"}, {"type": "Point", "coordinates": [-46.6, -23.5]}),
+        ],
+    }
+    response = _upload(client, admin, document)
+    assert response.status_code == 200, response.json
+    assert response.json["imported"] == 1
+
+
+def test_import_rejects_malformed_json(client, admin):
+    response = _upload(client, admin, b'{"type": "FeatureCollection", "features": [{"id": ')
+    assert response.status_code == 400
+    assert "invalid GeoJSON" in response.json["error"]
+
+
+def test_import_requires_admin(client, register):
+    assert _upload(client, register("ciclista@example.com"), {"features": []}).status_code == 403
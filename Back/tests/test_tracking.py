@@ -0,0 +1,84 @@
+import time
+
+import pytest
+
+from app.modules.events import services as event_services
+from app.modules.events.tracking import live_tracker
+
+
+@pytest.fixture(autouse=True)
+def fresh_tracker(app):
+    # tracker e caches de status/participantes sao globais do processo; cada teste tem banco novo
+    event_services._event_status.clear()
+    event_services._participants.clear()
+    live_tracker._events.clear()
+    yield
+    live_tracker.flush()  # antes do drop_all, senao a thread de flush grava num banco sem tabelas
+    live_tracker._events.clear()
+
+
+@pytest.fixture()
+def event_id(client, register):
+    response = client.post(
+        "/api/v1/route-events",
+        json={"name": "Pedal", "start_date": "2026-10-19T08:00:00", "start_lat": -23.55, "start_lng": -46.63, "end_lat": -23.54, "end_lng": -46.62},
+        headers=register("organizador@example.com"),
+    )
+    assert response.status_code == 201, response.json
+    return response.json["id"]
+
+
+def _pings(n, start=None):
+    start = start or time.time() - n
+    return {"pings": [{"lat": -23.55 + i * 0.0001, "lng": -46.63, "ts": start + i} for i in range(n)]}
+
+
+def test_only_participants_can_send_positions(client, register, event_id):
+    rider = register("ciclista@example.com")
+    url = f"/api/v1/route-events/{event_id}/positions"
+
+    assert client.post(url, json=_pings(1), headers=rider).status_code == 403
+    assert client.post(f"/api/v1/route-events/{event_id}/participants", headers=rider).status_code == 201
+    response = client.post(url, json=_pings(3), headers=rider)
+    assert response.status_code == 202
+    assert response.json["accepted"] == 3
+
+    client.delete(f"/api/v1/route-events/{event_id}/participants", headers=rider)
+    assert client.post(url, json=_pings(1), headers=rider).status_code == 403
+
+
+def test_creator_is_participant(client, register, event_id):
+    login = client.post("/api/v1/auth/login", json={"email": "organizador@example.com", "password": "segredo"})
+    organizer = {"Authorization": f"Bearer {login.json['access_token']}"}
+    response = client.post(f"/api/v1/route-events/{event_id}/positions", json=_pings(2), headers=organizer)
+    assert response.status_code == 202
+
+
+def test_join_unknown_event_is_404(client, register):
+    assert client.post("/api/v1/route-events/999/participants", headers=register("a@example.com")).status_code == 404
+
+
+def test_trail_limit_is_at_least_one(client, register, event_id):
+    rider = register("ciclista@example.com")
+    client.post(f"/api/v1/route-events/{event_id}/participants", headers=rider)
+    client.post(f"/api/v1/route-events/{event_id}/positions", json=_pings(5), headers=rider)
+    user_id = client.get("/api/v1/auth/me", headers=rider).json["id"]
+
+    trail = client.get(f"/api/v1/route-events/{event_id}/positions/{user_id}/trail?limit=0").json
+    assert len(trail) == 1
+    assert len(client.get(f"/api/v1/route-events/{event_id}/positions/{user_id}/trail?limit=3").json) == 3
+    assert len(client.get(f"/api/v1/route-events/{event_id}/positions/{user_id}/trail").json) == 5
+
+
+def test_idle_events_are_evicted(client, register, event_id):
+    rider = register("ciclista@example.com")
+    client.post(f"/api/v1/route-events/{event_id}/participants", headers=rider)
+    client.post(f"/api/v1/route-events/{event_id}/positions", json=_pings(2), headers=rider)
+    state = live_tracker._events[event_id]
+    version = state.version
+
+    assert live_tracker.evict_idle(now=time.monotonic()) == 0
+    assert live_tracker.evict_idle(now=time.monotonic() + live_tracker.idle_ttl) == 1
+    assert event_id not in live_tracker._events
+    assert state.version == version + 1  # long-polls pendentes acordam
+    assert client.get(f"/api/v1/route-events/{event_id}/positions/latest").json["participants"] == []
@@ -0,0 +1,94 @@
+import pytest
+
+
+@pytest.fixture()
+def headers(register):
+    return register("ciclista@example.com")
+
+
+@pytest.fixture()
+def route_id(client, headers):
+    response = client.post(
+        "/api/v1/routes",
+        json={"name": "Rota", "start_lat": -23.55, "start_lng": -46.63, "end_lat": -23.54, "end_lng": -46.62},
+        headers=headers,
+    )
+    assert response.status_code == 201, response.json
+    return response.json["id"]
+
+
+def _wp(i, **extra):
+    return {"name": f"P{i}", "latitude": -23.55 + i * 0.001, "longitude": -46.63, **extra}
+
+
+@pytest.fixture()
+def waypoints(client, route_id):
+    response = client.post(f"/api/v1/routes/{route_id}/waypoints", json={"waypoints": [_wp(i) for i in range(3)]})
+    assert response.status_code == 200, response.json
+    return response.json
+
+
+def _changes(response):
+    return dict(item.split("=") for item in response.headers["X-Waypoint-Changes"].split(","))
+
+
+def test_diff_keeps_ids_and_writes_only_changes(client, route_id, waypoints):
+    first, second, _ = waypoints
+    body = {
+        "mode": "diff",
+        "waypoints": [
+            {**_wp(0), "id": first["id"]},
+            {**_wp(1), "id": second["id"], "name": "Mirante"},
+            _wp(5),
+        ],
+    }
+    response = client.post(f"/api/v1/routes/{route_id}/waypoints", json=body)
+    assert response.status_code == 200, response.json
+    assert _changes(response) == {"inserted": "1", "updated": "1", "deleted": "1"}
+    saved = response.json
+    assert [wp["id"] for wp in saved[:2]] == [first["id"], second["id"]]
+    assert [wp["name"] for wp in saved] == ["P0", "Mirante", "P5"]
+
+
+def test_diff_without_changes_writes_nothing(client, route_id, waypoints):
+    body = {"mode": "diff", "waypoints": [{**_wp(i), "id": wp["id"]} for i, wp in enumerate(waypoints)]}
+    response = client.post(f"/api/v1/routes/{route_id}/waypoints", json=body)
+    assert _changes(response) == {"inserted": "0", "updated": "0", "deleted": "0"}
+
+
+@pytest.mark.parametrize(
+    "waypoint",
+    [
+        {"id": [1], "latitude": -23.55, "longitude": -46.63},
+        {"id": True, "latitude": -23.55, "longitude": -46.63},
+        {"seq": {"a": 1}, "latitude": -23.55, "longitude": -46.63},
+        {"latitude": "abc", "longitude": -46.63},
+        {"latitude": 95, "longitude": -46.63},
+        {"latitude": -23.55},
+        "nao-e-objeto",
+    ],
+)
+def test_invalid_waypoints_are_400(client, route_id, waypoints, waypoint):
+    response = client.post(f"/api/v1/routes/{route_id}/waypoints?mode=diff", json={"waypoints": [waypoint]})
+    assert response.status_code == 400, response.json
+    assert len(client.get(f"/api/v1/routes/{route_id}/waypoints").json) == 3
+
+
+def test_patch_requires_jwt(client, route_id, waypoints):
+    url = f"/api/v1/routes/{route_id}/waypoints/{waypoints[0]['id']}"
+    assert client.patch(url, json={"latitude": -23.5}).status_code == 401
+
+
+@pytest.mark.parametrize("body", [{"latitude": "abc"}, {"longitude": 181}, {"latitude": None}, {"name": 3}, {}])
+def test_patch_rejects_invalid_values(client, headers, route_id, waypoints, body):
+    url = f"/api/v1/routes/{route_id}/waypoints/{waypoints[0]['id']}"
+    assert client.patch(url, json=body, headers=headers).status_code == 400
+
+
+def test_patch_moves_single_waypoint(client, headers, route_id, waypoints):
+    url = f"/api/v1/routes/{route_id}/waypoints/{waypoints[1]['id']}"
+    response = client.patch(url, json={"latitude": "-23.5"}, headers=headers)
+    assert response.status_code == 200, response.json
+    assert response.json["latitude"] == -23.5
+    assert response.json["longitude"] == waypoints[1]["longitude"]
+    assert client.patch(f"/api/v1/routes/{route_id}/waypoints/9999", json={"latitude": 1}, headers=headers).status_code == 404